@@ -0,0 +1,122 @@
+# data_processor/aggregates.py
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+from .shards import KIND_PLAN
+from .constants import (
+    WORKER_NAME, TOP_N, SUMMARY_NOUNS_PER_KEY,
+    IMPORT_MANIFEST_COLLECTION, IMPORT_SHARD_COLLECTION, NOUN_SUMMARY_COLLECTION,
+    DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_NOUNS, DB_FIELD_GENERATION,
+)
+
+# 집계 차원
+DIMENSION_YEAR = 'year'
+DIMENSION_MONTH = 'month'
+DIMENSION_TAG = 'tag'
+DIMENSION_FILE = 'file'
+
+_PERIOD_PATTERN = re.compile(r'^(\d{4})-(\d{2})')
+
+
+def _period_keys(value) -> Tuple[Optional[str], Optional[str]]:
+    """Date 값에서 ('YYYY', 'YYYY-MM') 키를 만듭니다. 날짜를 알 수 없으면 (None, None)."""
+    if isinstance(value, datetime):
+        return f"{value.year:04d}", f"{value.year:04d}-{value.month:02d}"
+    match = _PERIOD_PATTERN.match(str(value or ''))
+    if not match:
+        return None, None
+    return match.group(1), f"{match.group(1)}-{match.group(2)}"
+
+
+class NounAggregator:
+    """
+    적재 루프에서 만들어지는 문서의 명사 빈도를 연/월, 태그, 파일 단위 Counter에 누적합니다.
+    파일 하나의 적재가 끝나면 to_documents()로 NounSummary 컬렉션에 저장할 부분 집계 문서를 만듭니다.
+    """
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+        self._articles: Counter = Counter()
+
+    def add_documents(self, documents: Iterable[dict]):
+        for doc in documents:
+            nouns = doc.get(DB_FIELD_NOUNS) or []
+            year, month = _period_keys(doc.get(DB_FIELD_DATE))
+
+            keys = [(DIMENSION_FILE, '*')]
+            if year:
+                keys.append((DIMENSION_YEAR, year))
+                keys.append((DIMENSION_MONTH, month))
+            keys.extend((DIMENSION_TAG, tag) for tag in set(doc.get(DB_FIELD_TAGS) or []))
+
+            for key in keys:
+                self._counters[key].update(nouns)
+                self._articles[key] += 1
+
+    def to_documents(self, source_file: str, generation: str,
+                     nouns_per_key: int = SUMMARY_NOUNS_PER_KEY) -> List[dict]:
+        """
+        (차원, 키)마다 문서 하나를 만듭니다. nouns는 빈도순 [명사, 빈도] 목록이며 nouns_per_key개로 잘립니다.
+        잘린 경우 min_count(보관된 마지막 빈도)가 누락된 명사 빈도의 상한이 됩니다.
+        """
+        documents = []
+        for (dimension, key), counter in self._counters.items():
+            ranked = counter.most_common(nouns_per_key or None)
+            documents.append({
+                "worker_name": WORKER_NAME,
+                "source_file": source_file,
+                "dimension": dimension,
+                "key": source_file if dimension == DIMENSION_FILE else key,
+                "article_count": self._articles[(dimension, key)],
+                "noun_total": sum(counter.values()),
+                "distinct_nouns": len(counter),
+                "truncated": len(ranked) < len(counter),
+                "min_count": ranked[-1][1] if ranked else 0,
+                "nouns": [[noun, count] for noun, count in ranked],
+                DB_FIELD_GENERATION: generation,
+            })
+        return documents
+
+
+# ----------------------------------------------------------------------
+# 마스터용 병합 헬퍼 (부분 집계 문서 → 상위 N개 명사)
+# ----------------------------------------------------------------------
+
+def merge_noun_summaries(summary_documents: Iterable[dict], top_n: int = TOP_N) -> List[Tuple[str, int]]:
+    """여러 워커/파일의 부분 집계 문서를 합쳐 빈도 상위 top_n개 (명사, 빈도)를 반환합니다."""
+    total = Counter()
+    for doc in summary_documents:
+        for noun, count in doc.get("nouns", []):
+            total[noun] += count
+    return total.most_common(top_n)
+
+
+def published_generations(db) -> List[str]:
+    """
+    마스터가 읽을 회차 목록입니다. 워커별 매니페스트와 샤드 계획(published_generation)에 기록된, 적재가 끝난 회차만 포함합니다.
+    재적재 중에는 새 회차 문서와 이전 회차 문서가 함께 남아 있으므로, 부분 집계/문서를 읽을 때는 이 회차로 걸러야 합니다.
+    """
+    generations = {doc.get(DB_FIELD_GENERATION) for doc in
+                   db[IMPORT_MANIFEST_COLLECTION].find({}, {DB_FIELD_GENERATION: 1})}
+    generations.update(doc.get("published_generation") for doc in
+                       db[IMPORT_SHARD_COLLECTION].find({"kind": KIND_PLAN}, {"published_generation": 1}))
+    generations.discard(None)
+    return sorted(generations)
+
+
+def top_nouns(db, dimension: str, keys: List[str] = None, top_n: int = TOP_N,
+              generations: List[str] = None) -> List[Tuple[str, int]]:
+    """
+    NounSummary에서 차원(year/month/tag/file)과 키 목록에 해당하는 문서만 읽어 상위 명사를 계산합니다.
+    keys를 생략하면 해당 차원의 모든 키를 합칩니다. (예: dimension='file'이면 전체 데이터 기준)
+    generations를 생략하면 published_generations(db)로 공개된 회차만 읽어, 재적재 중인 파일을 두 번 세지 않습니다.
+    """
+    if generations is None:
+        generations = published_generations(db)
+    query = {"dimension": dimension, DB_FIELD_GENERATION: {"$in": list(generations)}}
+    if keys:
+        query["key"] = {"$in": list(keys)}
+    return merge_noun_summaries(db[NOUN_SUMMARY_COLLECTION].find(query, {"nouns": 1}), top_n)
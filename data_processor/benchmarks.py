@@ -0,0 +1,206 @@
+# data_processor/benchmarks.py
+#
+# 임포트 파이프라인 단계별 마이크로 벤치마크입니다.
+# 사용법: python -m data_processor.benchmarks builder data/2015.csv [--repeat 5]
+#         python -m data_processor.benchmarks taggers data/2014.csv [--backends textblob,perceptron,prefilter,heuristic]
+
+import argparse
+import json
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pandas as pd
+
+from .constants import (
+    CSV_FIELD_HEADING, CSV_FIELD_ARTICLES, CSV_FIELD_DATE, CSV_FIELD_TAGS, CSV_FIELD_URL,
+)
+from .importer import build_document_columns, detect_csv_encoding
+from .taggers import TAGGER_BACKENDS, get_tagger
+
+
+# ----------------------------------------------------------------------
+# 0. 합성 입력 데이터 (data/*.csv와 같은 컬럼 구성)
+# ----------------------------------------------------------------------
+
+_PROPER_NOUNS = [
+    'London', 'Google', 'Apple', 'Amazon', 'Microsoft', 'Seoul', 'Tokyo', 'Paris', 'Berlin', 'Facebook',
+    'Twitter', 'Tesla', 'Obama', 'Trump', 'Merkel', 'Brexit', 'Africa', 'Europe', 'Silicon Valley',
+    'New York', 'California', 'Bitcoin', 'Netflix', 'Samsung', 'Uber', 'NASA', 'Olympics', 'Medium',
+]
+_WORDS = [
+    'the', 'company', 'announced', 'new', 'product', 'market', 'growth', 'people', 'said', 'today',
+    'technology', 'data', 'report', 'after', 'before', 'users', 'design', 'story', 'startup', 'team',
+    'with', 'from', 'about', 'into', 'over', 'more', 'than', 'year', 'first', 'last', 'could', 'would',
+]
+_TAGS = ['Tech', 'Startup', 'Politics', 'Design', 'Business', 'Science', 'Culture', 'Sports', 'Health']
+
+
+def _synthetic_sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(_PROPER_NOUNS))
+    return words[0][:1].upper() + ' '.join(words)[1:] + '.'
+
+
+def synthetic_rows(rows: int, seed: int = 0, year: int = 2015, paragraphs: int = 4) -> pd.DataFrame:
+    """title/text/url/authors/timestamp/tags 컬럼을 가진 BBC 스타일 기사 DataFrame을 만듭니다."""
+    rng = random.Random(seed)
+    start = datetime(year, 1, 1, tzinfo=timezone.utc)
+    records = []
+    for i in range(rows):
+        text = '\n\n'.join(
+            ' '.join(_synthetic_sentence(rng) for _ in range(rng.randint(2, 5)))
+            for _ in range(rng.randint(1, paragraphs))
+        )
+        records.append({
+            CSV_FIELD_HEADING: _synthetic_sentence(rng)[:-1],
+            CSV_FIELD_ARTICLES: text,
+            CSV_FIELD_URL: f"https://medium.com/synthetic/article-{seed}-{i}",
+            'authors': f"['{rng.choice(_PROPER_NOUNS)} Writer']",
+            CSV_FIELD_DATE: str(start + timedelta(seconds=rng.randrange(365 * 24 * 3600))),
+            CSV_FIELD_TAGS: str(rng.sample(_TAGS, rng.randint(1, 3))),
+        })
+    return pd.DataFrame.from_records(records)
+
+
+def write_synthetic_csv(path: str, rows: int, seed: int = 0, sample_from: str = None) -> str:
+    """
+    합성 CSV를 만듭니다. sample_from을 주면 실제 CSV에서 행을 복원 추출(재현 가능한 seed)하여 rows개로 맞춥니다.
+    """
+    if sample_from:
+        source = pd.read_csv(sample_from, encoding=detect_csv_encoding(sample_from))
+        df = source.sample(n=rows, replace=len(source) < rows, random_state=seed)
+    else:
+        df = synthetic_rows(rows, seed)
+    df.to_csv(path, index=False, encoding='utf-8')
+    return path
+
+
+# ----------------------------------------------------------------------
+# 1. 문서 생성 단계: df.iterrows (기존) vs 컬럼 단위 (현재)
+# ----------------------------------------------------------------------
+
+def _legacy_iterrows_rows(df: pd.DataFrame) -> List[tuple]:
+    """이전 importer의 행 단위 루프를 그대로 재현합니다. (태깅 호출 제외)"""
+    rows = []
+    for index, row in df.iterrows():
+        title = str(row.get(CSV_FIELD_HEADING, ''))
+        content = str(row.get(CSV_FIELD_ARTICLES, ''))
+        link = str(row.get('link', ''))
+        date_data = str(row.get(CSV_FIELD_DATE, ''))
+        tags_data = str(row.get(CSV_FIELD_TAGS, ''))
+        parsed_tags = [tag.strip() for tag in tags_data.split(',') if tag.strip()]
+        full_text = f"{title} {content}"
+        rows.append((title, link, date_data, parsed_tags, full_text))
+    return rows
+
+
+def _best_rate(func, df: pd.DataFrame, repeat: int) -> float:
+    """repeat회 실행 중 가장 빠른 회차의 초당 처리 행 수를 반환합니다."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return len(df) / best if best > 0 else float('inf')
+
+
+def bench_document_builder(file_path: str, repeat: int = 5) -> dict:
+    """문서 생성 단계만 떼어 내어 기존 iterrows 루프와 컬럼 단위 빌더의 rows/sec를 비교합니다."""
+    df = pd.read_csv(file_path, encoding=detect_csv_encoding(file_path))
+    before = _best_rate(_legacy_iterrows_rows, df, repeat)
+    after = _best_rate(build_document_columns, df, repeat)
+    return {
+        "benchmark": "document_builder",
+        "file": file_path,
+        "rows": len(df),
+        "repeat": repeat,
+        "iterrows_rows_per_sec": round(before, 1),
+        "columnar_rows_per_sec": round(after, 1),
+        "speedup": round(after / before, 2) if before else None,
+    }
+
+
+# ----------------------------------------------------------------------
+# 2. 태거 백엔드: 정확도(기준 백엔드 대비)와 처리량 비교
+# ----------------------------------------------------------------------
+
+def _agreement(expected: List[List[str]], actual: List[List[str]]) -> dict:
+    """기사별 명사 다중집합을 비교하여 정밀도/재현율/F1과 완전 일치 비율을 계산합니다."""
+    true_positive = expected_total = actual_total = exact = 0
+    for want, got in zip(expected, actual):
+        want_counts, got_counts = Counter(want), Counter(got)
+        true_positive += sum((want_counts & got_counts).values())
+        expected_total += len(want)
+        actual_total += len(got)
+        exact += want_counts == got_counts
+
+    precision = true_positive / actual_total if actual_total else 1.0
+    recall = true_positive / expected_total if expected_total else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "exact_match_rate": round(exact / len(expected), 4) if expected else None,
+    }
+
+
+def bench_taggers(file_path: str, backends: List[str], baseline: str = 'textblob', limit: int = None) -> dict:
+    """
+    각 태거 백엔드로 파일의 (제목 + 본문)을 태깅하여 처리량(rows/sec)과 기준 백엔드(기본: 기존 TextBlob) 대비 정확도를 비교합니다.
+    모델 로드 시간은 warm_up으로 분리하여 처리량에 포함하지 않습니다.
+    """
+    df = pd.read_csv(file_path, encoding=detect_csv_encoding(file_path), nrows=limit)
+    texts = build_document_columns(df)["full_texts"]
+
+    outputs = {}
+    results = {"benchmark": "taggers", "file": file_path, "rows": len(texts), "baseline": baseline, "backends": {}}
+    for backend in [baseline] + [b for b in backends if b != baseline]:
+        tagger = get_tagger(backend)
+        load_start = time.perf_counter()
+        tagger.warm_up()
+        load_seconds = time.perf_counter() - load_start
+
+        start = time.perf_counter()
+        outputs[backend] = tagger.extract_batch(texts)
+        elapsed = time.perf_counter() - start
+
+        results["backends"][backend] = {
+            "load_seconds": round(load_seconds, 3),
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(len(texts) / elapsed, 1) if elapsed > 0 else None,
+            "nouns": sum(len(nouns) for nouns in outputs[backend]),
+            **_agreement(outputs[baseline], outputs[backend]),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="워커 임포트 파이프라인 마이크로 벤치마크")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    builder = sub.add_parser("builder", help="문서 생성 단계 (iterrows vs 컬럼 단위)")
+    builder.add_argument("file", nargs="?", default="data/2015.csv")
+    builder.add_argument("--repeat", type=int, default=5)
+
+    taggers = sub.add_parser("taggers", help="태거 백엔드 정확도/처리량 비교")
+    taggers.add_argument("file", nargs="?", default="data/2014.csv")
+    taggers.add_argument("--backends", default=",".join(TAGGER_BACKENDS))
+    taggers.add_argument("--baseline", default="textblob", choices=list(TAGGER_BACKENDS))
+    taggers.add_argument("--limit", type=int, default=None, help="앞에서부터 비교할 최대 행 수")
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "builder":
+        result = bench_document_builder(args.file, args.repeat)
+    elif args.benchmark == "taggers":
+        backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+        result = bench_taggers(args.file, backends, args.baseline, args.limit)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# data_processor/cancellation.py
+
+from typing import Optional
+import threading
+import time
+
+# 중단 사유
+STOP_CANCELLED = 'cancelled'      # POST /rebuild/cancel
+STOP_TIME_BUDGET = 'time_budget'  # max_seconds 초과
+STOP_ROW_BUDGET = 'row_budget'    # max_rows 이상 처리
+
+
+class CancelToken:
+    """
+    Rebuild 하나의 취소 요청과 시간/행 예산입니다. importer는 청크(배치) 사이마다 stop_reason()을 확인하고,
+    중단되면 그때까지 처리한 행을 커밋한 뒤 멈춥니다. 예산은 청크 단위로 확인하므로 최대 한 청크만큼 넘을 수 있습니다.
+    cancel()은 다른 스레드(요청 처리 스레드)에서 호출해도 됩니다.
+    """
+
+    def __init__(self, max_seconds: float = None, max_rows: int = None):
+        self.max_seconds = max_seconds or None
+        self.max_rows = max_rows or None
+        self.rows = 0
+        self.started_at = None
+        self._cancelled = threading.Event()
+        self._reason = None
+
+    def start(self):
+        """시간 예산의 기준 시각을 정합니다. (이미 시작했으면 그대로)"""
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def add_rows(self, rows: int):
+        self.rows += rows
+
+    def stop_reason(self) -> Optional[str]:
+        """멈춰야 하면 사유를, 아니면 None을 반환합니다. 한 번 멈추면 사유는 바뀌지 않습니다."""
+        if self._reason is None:
+            if self._cancelled.is_set():
+                self._reason = STOP_CANCELLED
+            elif (self.max_seconds is not None and self.started_at is not None and
+                  time.monotonic() - self.started_at >= self.max_seconds):
+                self._reason = STOP_TIME_BUDGET
+            elif self.max_rows is not None and self.rows >= self.max_rows:
+                self._reason = STOP_ROW_BUDGET
+        return self._reason
+
+    @property
+    def stopped(self) -> bool:
+        return self.stop_reason() is not None
+
+    def describe(self) -> dict:
+        return {
+            "max_seconds": self.max_seconds,
+            "max_rows": self.max_rows,
+            "rows": self.rows,
+            "seconds": round(time.monotonic() - self.started_at, 3) if self.started_at is not None else None,
+            "stop_reason": self._reason,
+        }
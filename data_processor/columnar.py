@@ -0,0 +1,283 @@
+# data_processor/columnar.py
+#
+# 입력 CSV의 열 단위 캐시입니다. 파일마다 한 번만 CSV를 파싱하여 importer가 쓰는 컬럼(title/text/url/timestamp/tags)을
+# Arrow의 문자열 배열과 같은 구조(UTF-8 바이트 + int64 오프셋)로 저장하고, 이후 적재는 메모리 맵으로 필요한 행만 읽습니다.
+#
+#   <COLUMNAR_CACHE_DIR>/<파일명>-<sha256 앞 16자>/
+#       meta.json                  원본 sha256, 감지한 인코딩, 행 수, 컬럼 목록
+#       <컬럼>.offsets.npy          행 i의 값 = data[offsets[i]:offsets[i + 1]]
+#       <컬럼>.data                 UTF-8 바이트
+#       record_ends.npy            행 i가 원본 CSV에서 끝나는 바이트 오프셋 (샤드 바이트 범위 → 행 범위 변환)
+#
+# 파일 내용(sha256)이 바뀌면 디렉터리 이름이 달라지므로 이전 캐시는 쓰이지 않고, 새 캐시를 만들 때 지웁니다.
+# 여러 워커(컨테이너)가 같은 캐시 디렉터리를 공유해도 되도록, 고유한 임시 디렉터리(<이름>.tmp-XXXX)에 만든 뒤
+# os.rename 한 번으로 공개하며, 이미 다른 워커가 공개했으면 그 캐시를 씁니다.
+
+from typing import Iterator, List, Optional, Tuple
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from .shards import record_boundaries
+from .constants import (
+    WORKER_NAME,
+    CSV_FIELD_HEADING, CSV_FIELD_ARTICLES, CSV_FIELD_DATE, CSV_FIELD_TAGS, CSV_FIELD_URL,
+    IMPORT_READ_CHUNK_ROWS, COLUMNAR_CACHE_DIR,
+)
+
+CACHE_FORMAT_VERSION = 1
+# importer(build_document_columns)가 읽는 컬럼만 저장합니다. (authors 등은 제외)
+CACHED_COLUMNS = (CSV_FIELD_HEADING, CSV_FIELD_ARTICLES, CSV_FIELD_URL, CSV_FIELD_DATE, CSV_FIELD_TAGS)
+# 만드는 중인 캐시의 임시 디렉터리 표시. 이보다 오래된 임시 디렉터리는 중단된 워커가 남긴 것으로 보고 지웁니다.
+TEMP_MARKER = '.tmp-'
+TEMP_MAX_AGE_SEC = 24 * 3600
+
+
+def _cache_path(cache_dir: str, source_file: str, sha256: str) -> str:
+    return os.path.join(cache_dir, f"{source_file}-{sha256[:16]}")
+
+
+def _column_file(path: str, column: str, suffix: str) -> str:
+    return os.path.join(path, f"{column}.{suffix}")
+
+
+class ColumnarCache:
+    """열 단위 캐시 하나. rows_for()로 읽을 행 범위를 정하고 open()으로 청크 DataFrame을 읽습니다."""
+
+    def __init__(self, path: str, meta: dict):
+        self.path = path
+        self.meta = meta
+        self.rows = meta["rows"]
+        self.encoding = meta["encoding"]
+        self.columns: List[str] = meta["columns"]
+        self.size = meta["size"]
+        record_ends = os.path.join(path, "record_ends.npy")
+        self.record_ends = np.load(record_ends, mmap_mode='r') if os.path.exists(record_ends) else None
+        self._offsets = {column: np.load(_column_file(path, column, "offsets.npy"), mmap_mode='r')
+                         for column in self.columns}
+        # 빈 파일은 메모리 맵을 만들 수 없으므로 빈 배열로 대신합니다.
+        self._data = {
+            column: (np.memmap(_column_file(path, column, "data"), dtype=np.uint8, mode='r')
+                     if os.path.getsize(_column_file(path, column, "data")) else np.zeros(0, dtype=np.uint8))
+            for column in self.columns
+        }
+
+    def rows_for(self, shard: dict = None) -> Optional[Tuple[int, int]]:
+        """
+        전체 파일(shard=None) 또는 샤드 바이트 범위에 해당하는 [시작 행, 끝 행)을 반환합니다.
+        행과 레코드 경계가 1:1로 대응하지 않는 파일(빈 줄 등)이면 샤드는 None으로, CSV에서 직접 읽어야 합니다.
+        """
+        if shard is None:
+            return 0, self.rows
+        if self.record_ends is None:
+            return None
+        return (int(np.searchsorted(self.record_ends, shard["start"], side='right')),
+                int(np.searchsorted(self.record_ends, shard["end"], side='right')))
+
+    def byte_offset(self, row: int) -> int:
+        """행 row 직전까지의 원본 CSV 바이트 위치 (진행률 표시용)."""
+        if row <= 0:
+            return self.meta["header_end"]
+        if self.record_ends is not None:
+            return int(self.record_ends[row - 1])
+        return self.meta["header_end"] + (self.size - self.meta["header_end"]) * row // max(self.rows, 1)
+
+    def _strings(self, column: str, start: int, end: int) -> List[str]:
+        offsets = self._offsets[column][start:end + 1]
+        base = int(offsets[0])
+        blob = bytes(self._data[column][base:int(offsets[-1])])
+        relative = (offsets - base).tolist()
+        return [blob[a:b].decode('utf-8') for a, b in zip(relative, relative[1:])]
+
+    def read_rows(self, start: int, end: int) -> pd.DataFrame:
+        return pd.DataFrame({column: self._strings(column, start, end) for column in self.columns},
+                            index=pd.RangeIndex(start, end))
+
+    def open(self, start: int, end: int, chunksize: int = IMPORT_READ_CHUNK_ROWS) -> "ColumnarReader":
+        return ColumnarReader(self, start, end, chunksize)
+
+
+class ColumnarReader:
+    """
+    pd.read_csv(chunksize=...)처럼 청크 DataFrame을 차례로 돌려주는 이터레이터입니다.
+    tell()은 원본 CSV 기준으로 읽은 바이트 수를 돌려주어 기존 진행률 표시를 그대로 쓸 수 있습니다.
+    """
+
+    def __init__(self, cache: ColumnarCache, start: int, end: int, chunksize: int):
+        self.cache = cache
+        self.start = self.position = start
+        self.end = end
+        self.chunksize = max(1, chunksize)
+        self.bytes_total = cache.byte_offset(end) - cache.byte_offset(start)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        return self
+
+    def __next__(self) -> pd.DataFrame:
+        if self.position >= self.end:
+            raise StopIteration
+        stop = min(self.position + self.chunksize, self.end)
+        df = self.cache.read_rows(self.position, stop)
+        self.position = stop
+        return df
+
+    def tell(self) -> int:
+        return self.cache.byte_offset(self.position) - self.cache.byte_offset(self.start)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def _load(path: str, sha256: str) -> Optional[ColumnarCache]:
+    try:
+        with open(os.path.join(path, "meta.json"), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_FORMAT_VERSION or meta.get("sha256") != sha256:
+        return None
+    return ColumnarCache(path, meta)
+
+
+def build_columnar_cache(file_path: str, sha256: str, encoding: str, path: str) -> ColumnarCache:
+    """
+    CSV를 청크 단위로 한 번 파싱하여 캐시 디렉터리를 만듭니다. (메모리 사용량은 청크 크기로 제한)
+    고유한 임시 디렉터리에 모두 쓴 뒤 이름을 바꾸므로, 중간에 중단되어도 불완전한 캐시가 쓰이지 않습니다.
+    """
+    header = pd.read_csv(file_path, encoding=encoding, nrows=0).columns
+    columns = [column for column in CACHED_COLUMNS if column in header]
+    temp_path = tempfile.mkdtemp(prefix=f"{os.path.basename(path)}{TEMP_MARKER}", dir=os.path.dirname(path))
+    try:
+        meta = _write_columns(file_path, sha256, encoding, columns, temp_path)
+        return _publish(temp_path, path, sha256, meta)
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+
+def _write_columns(file_path: str, sha256: str, encoding: str, columns: List[str], temp_path: str) -> dict:
+    """컬럼 파일, 레코드 경계, meta.json을 temp_path에 쓰고 meta를 반환합니다."""
+    offsets = {column: [0] for column in columns}
+    handles = {column: open(_column_file(temp_path, column, "data"), 'wb') for column in columns}
+    rows = 0
+    try:
+        for df in pd.read_csv(file_path, encoding=encoding, usecols=columns, chunksize=IMPORT_READ_CHUNK_ROWS):
+            for column in columns:
+                # importer(_column_as_str)와 같은 규칙(빈 값은 '')으로 문자열화하여 캐시 경로와 CSV 경로의 결과를 같게 유지
+                for value in df[column].fillna('').astype(str).tolist():
+                    data = value.encode('utf-8')
+                    handles[column].write(data)
+                    offsets[column].append(offsets[column][-1] + len(data))
+            rows += len(df)
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    for column in columns:
+        np.save(_column_file(temp_path, column, "offsets.npy"), np.asarray(offsets[column], dtype=np.int64))
+
+    with open(file_path, 'rb') as handle:
+        ends = list(record_boundaries(handle))
+    header_end = ends[0] if ends else 0
+    # 빈 줄처럼 pandas가 건너뛰는 레코드가 있으면 행 ↔ 바이트 대응을 저장하지 않습니다. (샤드는 CSV에서 읽음)
+    if len(ends) - 1 == rows:
+        np.save(os.path.join(temp_path, "record_ends.npy"), np.asarray(ends[1:], dtype=np.int64))
+
+    meta = {
+        "version": CACHE_FORMAT_VERSION,
+        "source_file": os.path.basename(file_path),
+        "sha256": sha256,
+        "size": os.path.getsize(file_path),
+        "encoding": encoding,
+        "rows": rows,
+        "columns": columns,
+        "header_end": header_end,
+        "created_at": time.time(),
+    }
+    with open(os.path.join(temp_path, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return meta
+
+
+def _discard(path: str):
+    """쓸 수 없는 캐시 디렉터리를 고유한 임시 이름으로 옮긴 뒤 지웁니다. (다른 워커가 먼저 옮겼으면 무시)"""
+    trash = f"{path}{TEMP_MARKER}{uuid.uuid4().hex}"
+    try:
+        os.rename(path, trash)
+    except FileNotFoundError:
+        return
+    shutil.rmtree(trash, ignore_errors=True)
+
+
+def _publish(temp_path: str, path: str, sha256: str, meta: dict) -> ColumnarCache:
+    """
+    임시 디렉터리를 os.rename 한 번으로 공개합니다. 대상이 이미 있으면 다른 워커가 먼저 만든 것이므로 그 캐시를 쓰고,
+    이전 형식처럼 쓸 수 없는 캐시가 남아 있는 경우에만 치운 뒤 한 번 더 공개합니다.
+    """
+    for _ in range(2):
+        try:
+            os.rename(temp_path, path)
+            return ColumnarCache(path, meta)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+        cache = _load(path, sha256)
+        if cache is not None:
+            return cache
+        _discard(path)
+    raise OSError(f"열 단위 캐시를 공개할 수 없습니다: {path}")
+
+
+def _remove_stale(cache_dir: str, source_file: str, keep: str):
+    """
+    같은 파일의 이전 내용 캐시를 지웁니다. 다른 워커가 만드는 중인 임시 디렉터리는 건드리지 않으며,
+    TEMP_MAX_AGE_SEC보다 오래된 임시 디렉터리(중단된 워커가 남긴 것)만 지웁니다.
+    """
+    prefix = f"{source_file}-"
+    for name in os.listdir(cache_dir):
+        candidate = os.path.join(cache_dir, name)
+        if not name.startswith(prefix) or candidate == keep or not os.path.isdir(candidate):
+            continue
+        if TEMP_MARKER in name:
+            try:
+                if os.path.getmtime(candidate) > time.time() - TEMP_MAX_AGE_SEC:
+                    continue
+            except OSError:
+                continue
+        shutil.rmtree(candidate, ignore_errors=True)
+
+
+def open_columnar_cache(file_path: str, sha256: str, encoding_detector, encoding: str = None,
+                        cache_dir: str = COLUMNAR_CACHE_DIR) -> Optional[ColumnarCache]:
+    """
+    파일 내용(sha256)에 맞는 열 단위 캐시를 열고, 없으면 만듭니다. (이전 내용의 캐시는 지움)
+    encoding을 모르면 encoding_detector(file_path)로 한 번 감지하여 캐시에 기록합니다.
+    cache_dir가 비어 있거나 캐시를 만들 수 없으면 None을 반환하며, 이때 importer는 CSV를 직접 읽습니다.
+    """
+    if not cache_dir or not sha256:
+        return None
+    source_file = os.path.basename(file_path)
+    path = _cache_path(cache_dir, source_file, sha256)
+    try:
+        cache = _load(path, sha256)
+        if cache is not None:
+            return cache
+
+        started = time.perf_counter()
+        os.makedirs(cache_dir, exist_ok=True)
+        cache = build_columnar_cache(file_path, sha256, encoding or encoding_detector(file_path), path)
+        _remove_stale(cache_dir, source_file, path)
+        print(f"[{WORKER_NAME}] 📦 열 단위 캐시 생성: {source_file} ({cache.rows}행, "
+              f"{time.perf_counter() - started:.2f}s)")
+        return cache
+    except Exception as e:
+        print(f"[{WORKER_NAME}] ⚠️ 열 단위 캐시를 사용할 수 없어 CSV를 직접 읽습니다 ({source_file}): {e}")
+        return None
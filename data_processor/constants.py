@@ -18,12 +18,34 @@ MONGO_URI = (
     "?authSource=admin"
 )
 
+# 프로세스 전역 공유 클라이언트(커넥션 풀) 설정
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '20'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '2'))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000'))
+# 쓰기 확인 수준: '1', '0', 'majority' 등 / 저널 기록까지 기다릴지 여부
+MONGO_WRITE_CONCERN = os.environ.get('MONGO_WRITE_CONCERN', '1')
+MONGO_WRITE_JOURNAL = os.environ.get('MONGO_WRITE_JOURNAL', '0') == '1'
+# 전송 압축 (서버와 협상하여 앞에서부터 사용, 설치되지 않은 압축기는 자동 제외)
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', 'zstd,zlib')
+MONGO_ZLIB_LEVEL = int(os.environ.get('MONGO_ZLIB_LEVEL', '1'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000'))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0'))  # 0이면 제한 없음
+# 마지막 ping 성공 후 이 시간(초) 안에는 상태 확인을 생략하고 연결을 재사용합니다.
+MONGO_PING_INTERVAL_SEC = float(os.environ.get('MONGO_PING_INTERVAL_SEC', '30'))
+
 # ----------------------------------------------------------------------
 # 2. 분산 워커 및 파일 설정
 # ----------------------------------------------------------------------
 RECORD_NOUNS_COLLECTION = "ImFiles"
+IMPORT_MANIFEST_COLLECTION = "ImportManifest"  # 파일별 적재 이력 (크기, 수정 시각, 해시, 문서 수)
+NOUN_SUMMARY_COLLECTION = "NounSummary"  # 워커가 미리 집계한 명사 빈도 (연/월, 태그, 파일 단위)
+IMPORT_CHECKPOINT_COLLECTION = "ImportCheckpoints"  # 적재 중인 파일의 마지막 저장 행 (중단 후 이어서 적재)
+NOUN_VOCAB_COLLECTION = "NounVocab"  # 명사 → 정수 ID 사전 (NOUN_STORAGE_MODE가 'pairs'/'packed'일 때)
 FILE_FOLDER_PATH = "data"
 TOP_N = 50
+# 집계 문서 하나(차원 + 키)에 보관하는 상위 명사 수. 마스터의 TOP_N 병합 오차를 줄이도록 넉넉히 둡니다. (0이면 전부 보관)
+SUMMARY_NOUNS_PER_KEY = int(os.environ.get('SUMMARY_NOUNS_PER_KEY', TOP_N * 20))
 
 # A. 🌟 WORKER_CHUNK_FILES (마스터/워커 모두 가지고 있는 리스트)
 WORKER_CHUNK_FILES = {
@@ -56,6 +78,11 @@ DB_FIELD_TAGS = 'Tags'
 DB_FIELD_ARTICLES = 'Articles'
 DB_FIELD_NOUNS = 'nouns'
 DB_FIELD_RECORD_ID = 'RecordID'
+DB_FIELD_GENERATION = 'import_generation'  # 문서가 만들어진 적재 회차 (파일 단위 교체, 마스터는 공개된 회차만 읽음)
+DB_FIELD_NOUN_ENCODING = 'noun_encoding'  # nouns 필드의 저장 형식 ('pairs'/'packed', 문자열 목록이면 없음)
+DB_FIELD_CONTENT_HASH = 'content_hash'  # 기사 텍스트(제목 + 본문) 지문 (중복 기사 판별, data_processor/dedup.py)
+DB_FIELD_SIMHASH = 'simhash'            # 유사 중복 판별용 64비트 SimHash (IMPORT_DEDUP='near'일 때)
+DB_FIELD_DUPLICATE_OF = 'duplicate_of'  # 중복 기사이면 같은 파일 회차(공용 큐 방식이면 샤드) 안의 원본 문서 _id
 
 # ----------------------------------------------------------------------
 # 4. CSV 컬럼명 정의 (CSV 파일의 실제 헤더 이름)
@@ -65,6 +92,7 @@ CSV_FIELD_HEADING = 'title'
 CSV_FIELD_ARTICLES = 'text'
 CSV_FIELD_DATE = 'timestamp'
 CSV_FIELD_TAGS = 'tags'
+CSV_FIELD_URL = 'url'
 # CSV에 record_id가 없으므로 임시 이름으로 정의하고 importer에서 index를 사용합니다.
 CSV_FIELD_RECORD_ID = 'record_id_col_if_exists'
 
@@ -91,4 +119,120 @@ EXCLUDE_NOUNS = {
     'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten',
     'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
     'i', 'we', 'you', 'he', 'she', 'it', 'they', 'us', 'him', 'her', 'them'
-}
\ No newline at end of file
+}
+
+# ----------------------------------------------------------------------
+# 7. 고유 명사 추출 병렬 처리 설정
+# ----------------------------------------------------------------------
+def _available_cpus() -> int:
+    """컨테이너 cpuset 제한을 반영한 사용 가능 CPU 수를 반환합니다."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# 'process': 프로세스 풀에서 청크 단위 병렬 태깅 / 'serial': 기존 단일 코어 경로 (비교용)
+NOUN_EXTRACT_MODE = os.environ.get('NOUN_EXTRACT_MODE', 'process')
+NOUN_EXTRACT_WORKERS = int(os.environ.get('NOUN_EXTRACT_WORKERS', _available_cpus()))
+# 한 번에 워커 프로세스로 보내는 기사 수 (너무 작으면 IPC 비용, 너무 크면 부하 불균형)
+NOUN_EXTRACT_CHUNK_SIZE = int(os.environ.get('NOUN_EXTRACT_CHUNK_SIZE', '64'))
+# 품사 태깅 백엔드 (data_processor/taggers.py)
+#  - 'textblob'  : 기사마다 TextBlob 생성 (기존 방식, 비교 기준, 기본값)
+#  - 'perceptron': TextBlob과 같은 NLTK 모델을 미리 로드해 문장 단위로 일괄 태깅
+#                  (실제 코퍼스에서 textblob과 결과를 비교한 뒤 기본값으로 바꿉니다: benchmarks taggers)
+#  - 'prefilter' : perceptron + 고유 명사 후보가 없는 문장은 태깅 생략
+#  - 'heuristic' : 태깅 없이 대문자 표기 규칙만 사용 (가장 빠름, 정확도 낮음)
+NOUN_TAGGER_BACKEND = os.environ.get('NOUN_TAGGER_BACKEND', 'textblob')
+
+# ----------------------------------------------------------------------
+# 8. 스트리밍 적재 설정 (메모리 사용량을 파일 크기와 무관하게 유지)
+# ----------------------------------------------------------------------
+# CSV를 한 번에 읽어 들이는 행 수
+IMPORT_READ_CHUNK_ROWS = int(os.environ.get('IMPORT_READ_CHUNK_ROWS', '1000'))
+# ImFiles에 한 번에 insert_many 하는 문서 수
+IMPORT_WRITE_BATCH_SIZE = int(os.environ.get('IMPORT_WRITE_BATCH_SIZE', '500'))
+# CSV 인코딩 후보 (앞에서부터 시도)
+CSV_ENCODINGS = ('utf-8', 'cp949')
+# 읽기 → 태깅 → 쓰기 스테이지 사이 큐 크기 (청크/배치 단위). 0이면 겹치지 않고 차례로 실행합니다.
+IMPORT_PIPELINE_QUEUE_DEPTH = int(os.environ.get('IMPORT_PIPELINE_QUEUE_DEPTH', '2'))
+# ImFiles/NounSummary 조회용 인덱스(Date, Tags 등)를 만드는 시점 (data_processor/indexes.py)
+#  - 'after' : 적재가 끝난 뒤 없는 인덱스만 생성 (첫 적재 중에는 인덱스 갱신 비용 없이 저장)
+#  - 'before': 적재 전에 생성
+#  - 'off'   : 만들지 않음 (DBA가 별도로 관리)
+# 회차 교체/체크포인트 복구에 쓰는 (worker_name, source_file, 회차) 인덱스는 항상 적재 전에 만듭니다.
+IMPORT_INDEX_BUILD = os.environ.get('IMPORT_INDEX_BUILD', 'after')
+
+# ----------------------------------------------------------------------
+# 9. 고유 명사 추출 결과 캐시 (데이터 볼륨 아래 SQLite 파일)
+# ----------------------------------------------------------------------
+NOUN_CACHE_ENABLED = os.environ.get('NOUN_CACHE_ENABLED', '1') == '1'
+NOUN_CACHE_PATH = os.environ.get('NOUN_CACHE_PATH', os.path.join(FILE_FOLDER_PATH, '.cache', 'noun_cache.sqlite3'))
+# 최대 보관 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+NOUN_CACHE_MAX_ENTRIES = int(os.environ.get('NOUN_CACHE_MAX_ENTRIES', '500000'))
+
+# ----------------------------------------------------------------------
+# 10. 비동기 Rebuild 작업 설정
+# ----------------------------------------------------------------------
+# 메모리에 보관하는 완료된 작업 이력 수 (GET /jobs)
+REBUILD_JOB_HISTORY = int(os.environ.get('REBUILD_JOB_HISTORY', '20'))
+# 요청 본문에 max_seconds/max_rows가 없을 때 쓰는 기본 예산 (0이면 제한 없음)
+# 예산을 넘으면 처리한 행까지 커밋하고 멈추며, 남은 행/샤드는 다음 Rebuild(또는 다른 워커)가 이어서 처리합니다.
+REBUILD_MAX_SECONDS = float(os.environ.get('REBUILD_MAX_SECONDS', '0'))
+REBUILD_MAX_ROWS = int(os.environ.get('REBUILD_MAX_ROWS', '0'))
+
+# ----------------------------------------------------------------------
+# 11. 샤드 큐 기반 동적 작업 분배 (data_processor/shards.py)
+# ----------------------------------------------------------------------
+# 'shared': 모든 워커가 입력 파일을 바이트 범위 샤드로 나눈 공용 큐(Mongo)에서 샤드를 가져가 처리
+# 'static': 기존처럼 WORKER_CHUNK_FILES에 고정 할당된 파일만 처리
+IMPORT_ASSIGNMENT = os.environ.get('IMPORT_ASSIGNMENT', 'shared')
+IMPORT_SHARD_COLLECTION = "ImportShards"  # 파일별 샤드 계획과 샤드 임대(lease) 상태
+# 공용 큐에 올릴 전체 입력 파일 (기본: WORKER_CHUNK_FILES의 모든 파일, 콤마로 구분하여 덮어쓰기)
+IMPORT_INPUT_FILES = [
+    path.strip() for path in os.environ.get('IMPORT_INPUT_FILES', '').split(',') if path.strip()
+] or sorted({path for paths in WORKER_CHUNK_FILES.values() for path in paths})
+# 샤드 하나의 목표 크기 (레코드 경계에서 자르므로 실제 크기는 조금 더 큼)
+IMPORT_SHARD_BYTES = int(os.environ.get('IMPORT_SHARD_BYTES', str(4 * 1024 * 1024)))
+# 임대 유지 시간. 이 시간 안에 갱신하지 않은 워커(중단된 컨테이너)의 샤드는 다른 워커가 다시 가져갑니다.
+# 만료 판단에 각 워커의 시계를 쓰므로 컨테이너 간 시간이 동기화되어 있어야 합니다.
+IMPORT_SHARD_LEASE_SEC = float(os.environ.get('IMPORT_SHARD_LEASE_SEC', '300'))
+# 샤드 하나를 최대 몇 번까지 시도할지 (초과하면 failed 상태로 남김)
+IMPORT_SHARD_MAX_ATTEMPTS = int(os.environ.get('IMPORT_SHARD_MAX_ATTEMPTS', '3'))
+
+# ----------------------------------------------------------------------
+# 12. ImFiles 명사 저장 형식 (data_processor/vocab.py)
+# ----------------------------------------------------------------------
+# 'list'  : 기사마다 명사 문자열 목록을 그대로 저장 (기존 형식, 마스터 호환)
+# 'pairs' : 공용 명사 사전(NounVocab)의 ID로 바꾸어 [[ID, 빈도], ...]로 저장
+# 'packed': (ID, 빈도) 쌍을 uint32 바이너리로 저장 (가장 작음)
+# 'pairs'/'packed' 문서는 vocab.decode_documents()로 문자열 목록을 다시 얻을 수 있습니다.
+NOUN_STORAGE_MODE = os.environ.get('NOUN_STORAGE_MODE', 'list')
+
+# ----------------------------------------------------------------------
+# 13. 입력 CSV 열 단위 캐시 (data_processor/columnar.py, 데이터 볼륨 아래)
+# ----------------------------------------------------------------------
+# 파일 내용(sha256)마다 한 번만 CSV를 파싱하여 필요한 컬럼을 메모리 맵 배열로 저장하고, 이후 적재는 캐시에서 읽습니다.
+COLUMNAR_CACHE_ENABLED = os.environ.get('COLUMNAR_CACHE_ENABLED', '1') == '1'
+COLUMNAR_CACHE_DIR = os.environ.get('COLUMNAR_CACHE_DIR', os.path.join(FILE_FOLDER_PATH, '.cache', 'columnar'))
+
+# ----------------------------------------------------------------------
+# 14. 서버 시작 시 예열 (worker_app/warmup.py, GET /healthz)
+# ----------------------------------------------------------------------
+# 서버 프로세스가 뜰 때 백그라운드 스레드에서 태거(모델/코퍼스)를 읽고 Mongo 커넥션 풀을 미리 엽니다.
+# 끄면('0') 예열 없이 바로 준비 상태가 되고, 첫 Rebuild에서 모델을 읽습니다.
+WORKER_WARMUP = os.environ.get('WORKER_WARMUP', '1') == '1'
+
+# ----------------------------------------------------------------------
+# 15. 중복 기사 판별 (data_processor/dedup.py, 태깅 전에 실행)
+# ----------------------------------------------------------------------
+# 'off'  : 모든 기사를 따로 태깅하고 저장 (이전 동작)
+# 'exact': 공백만 정리한 (제목 + 본문)이 같은 기사는 태깅하지 않고 먼저 나온 기사의 명사를 재사용
+# 'near' : 'exact'에 더해 SimHash가 비슷한(해밍 거리 IMPORT_DEDUP_NEAR_DISTANCE 이하) 기사도 중복으로 처리
+IMPORT_DEDUP = os.environ.get('IMPORT_DEDUP', 'exact')
+# 중복 기사 문서 처리: 'link'는 저장하되 duplicate_of에 원본 _id를 기록, 'skip'은 중복 문서를 저장하지 않음
+# 연결/생략은 같은 파일 회차(공용 큐 방식이면 샤드) 안에서만 하며, 다른 파일에서 본 같은 기사는 명사만 재사용해 원본으로 저장합니다.
+IMPORT_DEDUP_ACTION = os.environ.get('IMPORT_DEDUP_ACTION', 'link')
+IMPORT_DEDUP_NEAR_DISTANCE = int(os.environ.get('IMPORT_DEDUP_NEAR_DISTANCE', '3'))
+# 한 번의 Rebuild 동안 기억하는 기사 지문 수 (초과 시 오래된 것부터 잊음)
+IMPORT_DEDUP_MAX_ENTRIES = int(os.environ.get('IMPORT_DEDUP_MAX_ENTRIES', '200000'))
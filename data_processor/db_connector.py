@@ -1,28 +1,130 @@
 # data_processor/db_connector.py (수정)
 
 from pymongo import MongoClient
-from .constants import MONGO_URI, WORKER_NAME
+from .constants import (
+    MONGO_URI, WORKER_NAME,
+    MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WRITE_CONCERN, MONGO_WRITE_JOURNAL,
+    MONGO_COMPRESSORS, MONGO_ZLIB_LEVEL,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_CONNECT_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_PING_INTERVAL_SEC,
+)
+from .metrics import record_error
+import atexit
+import importlib.util
+import os
 import sys
+import threading
+import time
+
+# 🌟 프로세스 전역 공유 클라이언트 🌟
+# MongoClient는 스레드 안전하며 내부 커넥션 풀을 가지므로 한 프로세스에서 하나만 만들어 재사용합니다.
+# fork 이후의 자식 프로세스는 부모의 소켓을 공유하면 안 되므로(데드락/손상 위험) PID가 바뀌면 새로 만듭니다.
+_client = None
+_client_pid = None
+_last_ping = 0.0
+_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """자식 프로세스에서는 부모의 클라이언트를 닫지 않고 참조만 버립니다."""
+    global _client, _client_pid, _last_ping, _lock
+    _client = None
+    _client_pid = None
+    _last_ping = 0.0
+    _lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _available_compressors() -> list:
+    """설정된 압축기 중 현재 환경에서 사용할 수 있는 것만 반환합니다."""
+    optional_modules = {'zstd': 'zstandard', 'snappy': 'snappy'}
+    compressors = []
+    for name in (c.strip() for c in MONGO_COMPRESSORS.split(',')):
+        if not name:
+            continue
+        module = optional_modules.get(name)
+        if module and importlib.util.find_spec(module) is None:
+            continue
+        compressors.append(name)
+    return compressors
+
+
+def _client_options() -> dict:
+    write_concern = int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "w": write_concern,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS or None,
+        "retryWrites": True,
+    }
+    if MONGO_WRITE_JOURNAL:
+        options["journal"] = True
+    compressors = _available_compressors()
+    if compressors:
+        options["compressors"] = ','.join(compressors)
+        if 'zlib' in compressors:
+            options["zlibCompressionLevel"] = MONGO_ZLIB_LEVEL
+    return options
 
-# 🌟 전역 변수 _mongo_client 제거 (데드락 방지) 🌟
-# _mongo_client = None
 
 def get_mongodb_client():
-    """MongoDB 클라이언트 인스턴스를 반환합니다. (매번 새 연결 시도)"""
-    try:
-        # 매번 새로운 연결을 시도하여 스레드 간 충돌 방지
-        client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=5000)
-        client.admin.command('ping')
-        print(f"[{WORKER_NAME}] MongoDB 연결 성공.")
-        return client
-    except Exception as e:
-        print(f"[{WORKER_NAME}] ❌ MongoDB 연결 오류 발생: {e}", file=sys.stderr)
-        return None
+    """
+    MongoDB 공유 클라이언트 인스턴스를 반환합니다.
+    처음 호출 시(또는 fork 이후) 연결을 만들고, 이후에는 따뜻한 커넥션 풀을 재사용합니다.
+    ping은 MONGO_PING_INTERVAL_SEC 간격으로만 수행하며, 서버에 연결할 수 없으면 None을 반환합니다.
+    """
+    global _client, _client_pid, _last_ping
+
+    with _lock:
+        try:
+            if _client is None or _client_pid != os.getpid():
+                _client = MongoClient(MONGO_URI, **_client_options())
+                _client_pid = os.getpid()
+                _last_ping = 0.0
+
+            if not _last_ping or time.monotonic() - _last_ping >= MONGO_PING_INTERVAL_SEC:
+                _client.admin.command('ping')
+                if not _last_ping:
+                    print(f"[{WORKER_NAME}] MongoDB 연결 성공. (pool={MONGO_MAX_POOL_SIZE}, "
+                          f"compressors={_client_options().get('compressors', 'none')})")
+                _last_ping = time.monotonic()
+            return _client
+        except Exception as e:
+            # 클라이언트는 유지하여 서버가 복구되면 내부 재연결로 다시 사용합니다.
+            _last_ping = 0.0
+            record_error("mongo_connection")
+            print(f"[{WORKER_NAME}] ❌ MongoDB 연결 오류 발생: {e}", file=sys.stderr)
+            return None
 
 
 def close_mongodb_client(client):
-    """특정 MongoDB 연결을 종료합니다. (인스턴스를 인자로 받음)"""
-    # 🌟 인스턴스를 인자로 받아 처리 🌟
-    if client:
+    """
+    작업이 끝났을 때 호출합니다. 공유 클라이언트는 다음 작업에서 재사용하도록 닫지 않고,
+    공유 클라이언트가 아닌 인스턴스만 종료합니다.
+    """
+    if client is not None and client is not _client:
         client.close()
-        print(f"[{WORKER_NAME}] MongoDB 연결 해제.")
\ No newline at end of file
+        print(f"[{WORKER_NAME}] MongoDB 연결 해제.")
+
+
+def shutdown_mongodb_client():
+    """프로세스 종료 시 공유 클라이언트와 커넥션 풀을 정리합니다."""
+    global _client, _client_pid, _last_ping
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+            print(f"[{WORKER_NAME}] MongoDB 연결 해제.")
+        _client = None
+        _client_pid = None
+        _last_ping = 0.0
+
+
+atexit.register(shutdown_mongodb_client)
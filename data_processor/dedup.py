@@ -0,0 +1,261 @@
+# data_processor/dedup.py
+#
+# 태깅 전에 중복 기사를 찾는 단계입니다. 같은 기사가 날짜나 파일을 바꿔 다시 실린 경우, 처음 나온 기사만 태깅하고
+# 나머지는 그 명사를 재사용합니다. 지문은 한 번의 Rebuild 동안 워커 프로세스 안에서만 기억합니다.
+#
+#   exact: 공백을 정리한 (제목 + 본문)의 blake2b 해시가 같으면 중복
+#   near : 단어 3-gram SimHash(64비트)의 해밍 거리가 near_distance 이하이면 중복 (거리 + 1개 구간으로 나누어 후보 조회)
+#
+# 원본 연결(duplicate_of)과 중복 문서 생략(skip)은 같은 적재 범위(scope: 파일의 회차, 공용 큐 방식이면 샤드) 안에서만 합니다.
+# 다른 파일의 원본에 연결하면 그 파일이 새 회차로 다시 적재될 때 연결이 끊기고, 어느 행이 원본인지가 변경 없이 건너뛴 파일이나
+# 샤드를 가져간 워커에 따라 달라지기 때문입니다. 범위 밖에서 본 같은 기사(exact)는 명사만 재사용하고 이 범위의 원본으로 저장하므로,
+# 같은 입력은 항상 같은 문서가 됩니다.
+
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+import re
+
+import numpy as np
+
+from .constants import (
+    DB_FIELD_NOUNS, DB_FIELD_CONTENT_HASH, DB_FIELD_SIMHASH, DB_FIELD_DUPLICATE_OF,
+    IMPORT_DEDUP, IMPORT_DEDUP_ACTION, IMPORT_DEDUP_NEAR_DISTANCE, IMPORT_DEDUP_MAX_ENTRIES,
+)
+from .metrics import DUPLICATE_ARTICLES_TOTAL
+
+DEDUP_OFF = 'off'
+DEDUP_EXACT = 'exact'
+DEDUP_NEAR = 'near'
+DEDUP_MODES = (DEDUP_OFF, DEDUP_EXACT, DEDUP_NEAR)
+ACTION_LINK = 'link'
+ACTION_SKIP = 'skip'
+DEDUP_ACTIONS = (ACTION_LINK, ACTION_SKIP)
+
+_TOKEN = re.compile(r"\w+")
+_SHINGLE_SIZE = 3
+# 단어가 이보다 적은 기사(제목만 있는 기사 등)는 SimHash가 불안정하므로 exact로만 비교합니다.
+_NEAR_MIN_TOKENS = 20
+
+
+def content_hash(text: str) -> str:
+    """공백(줄바꿈 포함)을 한 칸으로 정리한 텍스트의 128비트 해시 (16진수)."""
+    return blake2b(' '.join(text.split()).encode('utf-8'), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1 << 17)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 마무리 함수 (uint64 배열, 비트를 고르게 섞음)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xbf58476d1ce4e5b9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94d049bb133111eb)
+    return values ^ (values >> np.uint64(31))
+
+
+def simhash(text: str) -> Optional[int]:
+    """소문자 단어 3-gram 집합의 64비트 SimHash. 단어가 _NEAR_MIN_TOKENS보다 적으면 None입니다."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < _NEAR_MIN_TOKENS:
+        return None
+    # 단어 해시는 캐시하고, 3-gram 해시는 이웃한 단어 해시를 배열 연산으로 섞어 만듭니다.
+    words = np.fromiter(map(_token_hash, tokens), dtype=np.uint64, count=len(tokens))
+    shingles = np.unique(_mix64(words[:-2] ^ _mix64(words[1:-1] ^ _mix64(words[2:]))))
+    # 비트 j마다 1인 3-gram이 절반을 넘으면 1
+    bits = np.unpackbits(shingles.astype('<u8').view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int(np.packbits(votes, bitorder='little').view('<u8')[0])
+
+
+def _to_int64(value: int) -> int:
+    """BSON에는 부호 있는 64비트 정수만 저장되므로 변환합니다."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _from_int64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class _Entry:
+    """적재 범위(scope) 안에서 먼저 나온(원본) 기사 하나의 지문, 문서 _id, 명사. 명사는 태깅이 끝나면 채워집니다."""
+
+    __slots__ = ("exact", "simhash", "document_id", "scope", "nouns")
+
+    def __init__(self, exact: str, simhash_value: Optional[int], document_id: str, scope: str,
+                 nouns: List[str] = None):
+        self.exact = exact
+        self.simhash = simhash_value
+        self.document_id = document_id
+        self.scope = scope
+        self.nouns = nouns
+
+
+# 행 하나의 판별 결과: kind는 'exact'/'near'(같은 범위의 중복), 'reused'(다른 범위의 같은 기사에서 명사만 재사용한 원본)
+# 또는 None(태깅할 원본). entry는 이 행이 연결되는 원본(중복) 또는 이 행으로 등록한 원본, exact/simhash는 이 행의 지문
+DuplicateMatch = namedtuple("DuplicateMatch", ["kind", "entry", "exact", "simhash"])
+
+
+class DuplicateIndex:
+    """
+    중복 기사 판별 단계입니다. match()로 청크를 태깅하기 전에 이미 본 기사(이전 청크/파일 또는 같은 청크의 앞 행)를 찾아
+    태깅에서 빼고, resolve()로 원본의 명사를 나누어 준 뒤, annotate()로 문서에 지문과 원본 _id(duplicate_of)를 기록하거나 중복 문서를 뺍니다.
+    중복 판별은 같은 적재 범위(scope) 안에서만 하며, 다른 범위에서 본 같은 기사는 명사만 재사용합니다.
+    적재 스레드 하나에서만 사용합니다.
+    """
+
+    def __init__(self, mode: str = IMPORT_DEDUP, action: str = IMPORT_DEDUP_ACTION,
+                 near_distance: int = IMPORT_DEDUP_NEAR_DISTANCE, max_entries: int = IMPORT_DEDUP_MAX_ENTRIES):
+        if mode not in (DEDUP_EXACT, DEDUP_NEAR):
+            raise ValueError(f"알 수 없는 중복 판별 방식: {mode} (사용 가능: {', '.join(DEDUP_MODES)})")
+        if action not in DEDUP_ACTIONS:
+            raise ValueError(f"알 수 없는 중복 문서 처리 방식: {action} (사용 가능: {', '.join(DEDUP_ACTIONS)})")
+        self.mode = mode
+        self.action = action
+        self.near_distance = max(0, min(near_distance, 15))
+        self.max_entries = max(1, max_entries)
+        self.counts = {"exact": 0, "near": 0, "reused": 0, "skipped": 0}
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # 비둘기집 원리: 거리가 d 이하인 두 SimHash는 d + 1개 구간 중 적어도 하나가 같습니다.
+        bands = self.near_distance + 1
+        self._bounds = [(64 * i // bands, 64 * (i + 1) // bands) for i in range(bands)]
+        self._bands: Dict[Tuple[int, int], List[_Entry]] = {}
+
+    def _band_keys(self, value: int):
+        return [(i, (value >> start) & ((1 << (end - start)) - 1)) for i, (start, end) in enumerate(self._bounds)]
+
+    def _add(self, entry: _Entry):
+        existing = self._entries.get(entry.exact)
+        if existing is not None:
+            if existing.scope == entry.scope:
+                return
+            # 다른 범위의 같은 기사는 이 범위의 원본으로 바꿔 둡니다. (이 범위의 뒤쪽 행이 이 원본에 연결되도록)
+            self._remove(existing)
+        self._entries[entry.exact] = entry
+        if entry.simhash is not None:
+            for key in self._band_keys(entry.simhash):
+                self._bands.setdefault(key, []).append(entry)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries.values())))
+
+    def _remove(self, entry: _Entry):
+        if self._entries.get(entry.exact) is not entry:
+            return
+        del self._entries[entry.exact]
+        if entry.simhash is not None:
+            for key in self._band_keys(entry.simhash):
+                bucket = self._bands.get(key)
+                if bucket is not None:
+                    bucket.remove(entry)
+                    if not bucket:
+                        del self._bands[key]
+
+    def _find(self, exact: str, simhash_value: Optional[int], scope: str) -> Optional[Tuple[str, _Entry]]:
+        entry = self._entries.get(exact)
+        if entry is not None and entry.scope == scope:
+            return "exact", entry
+        if simhash_value is not None:
+            for key in self._band_keys(simhash_value):
+                for candidate in self._bands.get(key, ()):
+                    if (candidate.scope == scope and
+                            bin(candidate.simhash ^ simhash_value).count('1') <= self.near_distance):
+                        return "near", candidate
+        # 다른 범위의 같은 기사: 연결하지 않고 명사만 재사용 (태깅 결과가 같으므로 결과는 달라지지 않음)
+        if entry is not None and entry.nouns is not None:
+            return "reused", entry
+        return None
+
+    def _fingerprint(self, text: str) -> Tuple[str, Optional[int]]:
+        return content_hash(text), simhash(text) if self.mode == DEDUP_NEAR else None
+
+    def match(self, texts: List[str], document_ids: List[str], scope: str) -> List[DuplicateMatch]:
+        """
+        청크의 기사마다 같은 적재 범위(scope)에서 이미 본 기사인지 판별합니다.
+        처음 보는 기사(kind=None)와 다른 범위에서 본 기사(kind='reused')는 이 범위의 원본으로 등록되며, kind=None만 태깅해야 합니다.
+        document_ids[i]는 행 i가 저장될 문서 _id입니다. (원본이면 중복 문서의 duplicate_of로 쓰임)
+        """
+        matches = []
+        for i, text in enumerate(texts):
+            exact, simhash_value = self._fingerprint(text)
+            kind, entry = self._find(exact, simhash_value, scope) or (None, None)
+            if kind in (None, "reused"):
+                # 같은 청크의 뒤쪽 행도 찾을 수 있도록 태깅 전에 등록합니다. (명사는 재사용하거나 resolve()에서 채움)
+                entry = _Entry(exact, simhash_value, document_ids[i], scope,
+                               list(entry.nouns) if entry is not None else None)
+                self._add(entry)
+            matches.append(DuplicateMatch(kind, entry, exact, simhash_value))
+        return matches
+
+    def resolve(self, matches: List[DuplicateMatch], tagged: List[List[str]]) -> List[List[str]]:
+        """원본 행(kind=None)의 태깅 결과(순서대로)로 모든 행의 명사 목록을 만듭니다. 중복 행은 원본 명사의 복사본입니다."""
+        originals = iter(tagged)
+        for match in matches:
+            if match.kind is None:
+                match.entry.nouns = next(originals)
+        return [match.entry.nouns if match.kind is None else list(match.entry.nouns) for match in matches]
+
+    def forget(self, matches: List[DuplicateMatch]):
+        """태깅에 실패한 청크의 원본 등록을 취소합니다. (명사 없는 원본이 남지 않도록)"""
+        for match in matches:
+            if match.kind in (None, "reused"):
+                self._remove(match.entry)
+
+    def annotate(self, documents: List[dict], offsets: List[int], matches: list,
+                 stats: dict) -> Tuple[List[dict], List[int]]:
+        """
+        문서(명사가 있는 행, offsets는 청크 안의 행 번호)에 지문을 기록하고, 중복 문서에는 같은 범위의 원본 _id를 남깁니다.
+        action='skip'이면 중복 문서는 뺍니다. 명사만 재사용한 문서(kind='reused')는 원본이므로 그대로 저장합니다.
+        남은 (문서, 행 번호)를 반환하며, 태깅하지 않은 행 수는 stats의 duplicates에(그중 유사 중복은 near_duplicates,
+        저장하지 않은 문서는 skipped_duplicates) 더합니다.
+        """
+        for match in matches:
+            if match.kind is not None:
+                stats["duplicates"] += 1
+                self.counts[match.kind] += 1
+                DUPLICATE_ARTICLES_TOTAL.inc(kind=match.kind)
+                if match.kind == "near":
+                    stats["near_duplicates"] += 1
+
+        kept_documents, kept_offsets = [], []
+        for document, offset in zip(documents, offsets):
+            match = matches[offset]
+            document[DB_FIELD_CONTENT_HASH] = match.exact
+            if match.simhash is not None:
+                document[DB_FIELD_SIMHASH] = _to_int64(match.simhash)
+            if match.kind in ("exact", "near"):
+                if self.action == ACTION_SKIP:
+                    stats["skipped_duplicates"] += 1
+                    self.counts["skipped"] += 1
+                    continue
+                document[DB_FIELD_DUPLICATE_OF] = match.entry.document_id
+            kept_documents.append(document)
+            kept_offsets.append(offset)
+        return kept_documents, kept_offsets
+
+    def seed(self, documents: List[dict], scope: str):
+        """
+        체크포인트에서 이어서 적재할 때, 같은 범위(scope)에 이미 저장된 문서(명사는 디코딩된 상태)의 지문을 다시 등록합니다.
+        중단 전에 본 원본 기사를 기억하여 이어서 적재한 결과가 한 번에 적재한 결과와 같아지도록 합니다.
+        """
+        for document in documents:
+            exact = document.get(DB_FIELD_CONTENT_HASH)
+            if exact is None or document.get(DB_FIELD_DUPLICATE_OF) is not None:
+                continue
+            value = document.get(DB_FIELD_SIMHASH)
+            self._add(_Entry(exact, None if value is None else _from_int64(value), document["_id"],
+                             scope, list(document.get(DB_FIELD_NOUNS) or [])))
+
+    def describe(self) -> dict:
+        return {"mode": self.mode, "action": self.action, "entries": len(self._entries),
+                "near_distance": self.near_distance if self.mode == DEDUP_NEAR else None, **self.counts}
+
+
+def open_duplicate_index(mode: str = IMPORT_DEDUP, action: str = IMPORT_DEDUP_ACTION) -> Optional[DuplicateIndex]:
+    """mode가 'off'이면 None (중복 판별 없이 모든 기사를 태깅)."""
+    if mode == DEDUP_OFF:
+        return None
+    return DuplicateIndex(mode, action)
@@ -1,24 +1,61 @@
 # data_processor/importer.py
 
-from typing import List
+from functools import partial
+from itertools import islice
+from typing import Callable, List
 import pandas as pd
-from textblob import TextBlob
+import codecs
 import os
+import time
 from .db_connector import get_mongodb_client, close_mongodb_client
+from .parallel import NounExtractionEngine
+from .pipeline import StagedPipeline, merge_pipeline_stats
+from .noun_cache import open_noun_cache
+from .aggregates import NounAggregator
+from .vocab import NounCodec
+from .dedup import DuplicateIndex, open_duplicate_index
+from .cancellation import CancelToken
+from .indexes import prepare_indexes, finish_indexes
+from .columnar import ColumnarCache, open_columnar_cache
+from .taggers import get_tagger
+from .metrics import (
+    stage_timer, record_error, ARTICLE_TAGGING_SECONDS, MONGO_WRITE_SECONDS, ROWS_TOTAL, DOCUMENTS_TOTAL,
+    DUPLICATES_TOTAL, ROWS_PER_SECOND, NOUN_CACHE_TOTAL,
+)
+from .manifest import (
+    check_file_unchanged, load_manifest, save_manifest, touch_manifest,
+    load_checkpoint, save_checkpoint, clear_checkpoint,
+    new_generation, replace_previous_generations, discard_generation,
+)
+from .shards import (
+    LeaseLostError, ensure_queue_indexes, ensure_file_plan, open_shard, claim_shard, renew_lease,
+    checkpoint_shard, complete_shard, release_shard, yield_shard, finalize_file, queue_status, remaining_shards,
+    PLAN_COMPLETED,
+)
 from .constants import (
     WORKER_NAME, WORKER_FILE_PATH,
-    DB_NAME, RECORD_NOUNS_COLLECTION, EXCLUDE_NOUNS,
+    DB_NAME, RECORD_NOUNS_COLLECTION, IMPORT_MANIFEST_COLLECTION, NOUN_SUMMARY_COLLECTION,
+    IMPORT_CHECKPOINT_COLLECTION, NOUN_VOCAB_COLLECTION, NOUN_STORAGE_MODE, IMPORT_INDEX_BUILD,
+    # 🌟 샤드 큐 설정
+    IMPORT_ASSIGNMENT, IMPORT_INPUT_FILES, IMPORT_SHARD_COLLECTION, IMPORT_SHARD_LEASE_SEC,
     # DB_FIELD_MAPPING 제거
     DB_FIELD_DEFAULTS,
     # 🌟 DB 필드명 임포트
-    DB_FIELD_HEADING, DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_ARTICLES,
-    DB_FIELD_NOUNS, DB_FIELD_RECORD_ID,
+    DB_FIELD_HEADING, DB_FIELD_DATE, DB_FIELD_TAGS,
+    DB_FIELD_NOUNS, DB_FIELD_GENERATION, DB_FIELD_NOUN_ENCODING,
+    DB_FIELD_CONTENT_HASH, DB_FIELD_SIMHASH, DB_FIELD_DUPLICATE_OF,
     # 🌟 CSV 필드명 임포트 (추가)
     CSV_FIELD_HEADING, CSV_FIELD_DATE, CSV_FIELD_TAGS, CSV_FIELD_ARTICLES,
-    CSV_FIELD_RECORD_ID
+    CSV_FIELD_URL,
+    # 🌟 스트리밍 적재 설정
+    IMPORT_READ_CHUNK_ROWS, IMPORT_WRITE_BATCH_SIZE, CSV_ENCODINGS,
+    # 🌟 명사 캐시 / 열 단위 입력 캐시 설정
+    NOUN_CACHE_ENABLED, COLUMNAR_CACHE_ENABLED, COLUMNAR_CACHE_DIR,
+    # 🌟 중복 기사 판별 설정
+    IMPORT_DEDUP, IMPORT_DEDUP_ACTION,
 )
+from pymongo.errors import BulkWriteError
 import warnings
-import sys
 
 warnings.filterwarnings('ignore')
 
@@ -27,140 +64,833 @@ warnings.filterwarnings('ignore')
 # 유틸리티 함수 (기존 코드 유지)
 # ----------------------------------------------------------------------
 
-def extract_and_filter_proper_nouns(text) -> List[str]:
-    """TextBlob을 사용하여 고유 명사를 추출하고, 제외 목록에 있는 단어를 필터링합니다."""
-    if pd.isna(text) or text is None:
-        return []
-
-    text = str(text).replace('\n', ' ')
-
-    try:
-        blob = TextBlob(text)
-        # NNP/NNPS 태그된 단어 중 제외 목록을 거르고, 길이 1 또는 숫자인 단어를 제거
-        filtered_nouns = [
-            word.lower()
-            for word, tag in blob.tags
-            if tag in ('NNP', 'NNPS') and
-               word.lower() not in EXCLUDE_NOUNS and
-               len(word) > 1 and not word.isdigit()
-        ]
-
-        return filtered_nouns
-    except Exception as e:
-        print(f"ERROR: TextBlob 처리 중 오류 발생: {e}")
-        return []
+def tag_proper_nouns_batch(texts: List[str], backend: str = None) -> List[List[str]]:
+    """여러 기사를 태거의 일괄(batch) API로 한 번에 처리합니다. 프로세스 풀 워커에서 호출됩니다."""
+    return get_tagger(backend).extract_batch(texts)
 
 
 def parse_tags(tags_str: str) -> List[str]:
     """문자열 형태의 태그 목록을 파싱하여 소문자 리스트로 반환합니다."""
     if not tags_str:
-        return DB_FIELD_DEFAULTS.get(DB_FIELD_TAGS, [])
+        return list(DB_FIELD_DEFAULTS.get(DB_FIELD_TAGS, []))
 
     tags_str = tags_str.strip().strip('[]').replace("'", "")
     if not tags_str:
-        return DB_FIELD_DEFAULTS.get(DB_FIELD_TAGS, [])
+        return list(DB_FIELD_DEFAULTS.get(DB_FIELD_TAGS, []))
+
+    # 작은따옴표가 들어간 태그는 큰따옴표로 감싸져 있음 (예: "Editor's Pick")
+    return [tag.strip().strip('"').lower() for tag in tags_str.split(',') if tag.strip().strip('"')]
+
 
-    return [tag.strip().lower() for tag in tags_str.split(',') if tag.strip()]
+def detect_csv_encoding(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    파일 전체를 블록 단위로 디코딩해 보고 사용할 인코딩을 결정합니다.
+    청크 단위 읽기 도중 인코딩 오류로 중단되지 않도록 적재 전에 한 번만 확인합니다. (메모리 사용량은 block_size로 제한)
+    """
+    for encoding in CSV_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with open(file_path, 'rb') as f:
+                while True:
+                    block = f.read(block_size)
+                    if not block:
+                        break
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return CSV_ENCODINGS[-1]
+
+
+# ----------------------------------------------------------------------
+# 컬럼 단위 문서 생성 (df.iterrows 대체)
+# ----------------------------------------------------------------------
+
+def _column_as_str(df: pd.DataFrame, column: str) -> pd.Series:
+    """컬럼을 문자열 Series로 꺼냅니다. 컬럼이 없거나 값이 비어 있으면 빈 문자열을 사용합니다."""
+    if column not in df.columns:
+        return pd.Series([''] * len(df), index=df.index, dtype=object)
+    return df[column].fillna('').astype(str)
+
+
+def parse_dates(values: pd.Series) -> list:
+    """
+    timestamp 문자열 컬럼을 UTC datetime 목록으로 변환합니다. (BSON Date로 저장되어 날짜 범위 조회에 인덱스를 쓸 수 있음)
+    ISO 8601 형식은 한 번에 벡터화 변환하고, 실패한 값만 형식을 추론하여 다시 변환합니다. 그래도 해석할 수 없는 값은 None입니다.
+    """
+    parsed = pd.to_datetime(values, errors='coerce', utc=True, format='ISO8601')
+    retry = parsed.isna() & values.str.strip().ne('')
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], errors='coerce', utc=True, format='mixed')
+    return [None if pd.isna(timestamp) else timestamp.to_pydatetime() for timestamp in parsed]
+
+
+def build_document_columns(df: pd.DataFrame) -> dict:
+    """
+    청크 DataFrame에서 title/text/timestamp/tags/url 컬럼을 한 번씩만 꺼내어
+    날짜 변환, 태그 정규화(parse_tags), 분석용 텍스트(제목 + 본문) 결합을 컬럼 단위로 일괄 처리합니다.
+    invalid_dates는 값이 있지만 날짜로 해석하지 못한 행 수입니다.
+    """
+    titles = _column_as_str(df, CSV_FIELD_HEADING)
+    texts = _column_as_str(df, CSV_FIELD_ARTICLES)
+    raw_dates = _column_as_str(df, CSV_FIELD_DATE)
+    dates = parse_dates(raw_dates)
+
+    return {
+        "titles": titles.tolist(),
+        "links": _column_as_str(df, CSV_FIELD_URL).tolist(),
+        "dates": dates,
+        "invalid_dates": sum(1 for date, raw in zip(dates, raw_dates.tolist()) if date is None and raw.strip()),
+        "tags": [parse_tags(value) for value in _column_as_str(df, CSV_FIELD_TAGS).tolist()],
+        # 제목과 내용을 합쳐서 분석 (태거에는 이 컬럼만 전달)
+        "full_texts": titles.str.cat(texts, sep=' ').tolist(),
+    }
+
+
+def document_id(id_prefix: str, row: int) -> str:
+    """회차(또는 샤드)와 행 번호로 정해지는 문서 _id. 같은 배치를 다시 저장해도 문서가 중복되지 않습니다."""
+    return f"{id_prefix}:{row:09d}"
+
+
+def document_id_range(id_prefix: str, start_row: int = 0, end_row: int = None) -> dict:
+    """[start_row, end_row) 행의 문서 _id 범위 조건. end_row를 생략하면 id_prefix의 마지막 행까지입니다."""
+    end = document_id(id_prefix, end_row) if end_row is not None else f"{id_prefix};"  # ';'는 ':' 다음 문자
+    return {"$gte": document_id(id_prefix, start_row), "$lt": end}
+
+
+def assemble_documents(columns: dict, noun_lists: List[List[str]], source_file: str,
+                       generation: str = None, extra_fields: dict = None,
+                       id_prefix: str = None, first_row: int = 0) -> List[dict]:
+    """
+    컬럼 배열과 추출된 명사로 ImFiles 문서를 만듭니다. 명사가 없는 행은 건너뜁니다.
+    extra_fields는 모든 문서에 그대로 추가됩니다. (예: 샤드 ID)
+    id_prefix를 넘기면 문서 _id를 document_id(id_prefix, first_row + 청크 안의 행 번호)로 정합니다.
+    """
+    return [
+        {
+            **({"_id": document_id(id_prefix, first_row + offset)} if id_prefix else {}),
+            DB_FIELD_HEADING: title,    # 마스터가 검색하는 'Heading' 키
+            DB_FIELD_TAGS: tags,        # 마스터가 검색하는 'Tags' 키 (리스트 형식)
+            DB_FIELD_DATE: date_data,   # 마스터가 검색하는 'Date' 키
+            DB_FIELD_NOUNS: nouns,      # 마스터가 집계하는 'nouns' 키
+
+            # 기타 정보
+            "link": link,
+            "worker_name": WORKER_NAME,
+            "source_file": source_file,
+            DB_FIELD_GENERATION: generation,
+            **(extra_fields or {}),
+        }
+        for offset, (title, link, date_data, tags, nouns) in enumerate(zip(
+            columns["titles"], columns["links"], columns["dates"], columns["tags"], noun_lists
+        ))
+        if nouns
+    ]
 
 
 # ----------------------------------------------------------------------
 # MongoDB 연결 및 데이터 처리 함수
 # ----------------------------------------------------------------------
 
-def process_worker_files() -> bool:
+# 진행 상황 콜백: progress(source_file, state=..., rows=..., bytes_read=..., bytes_total=...)
+ProgressCallback = Callable[..., None]
+
+
+def _no_progress(source_file: str, **fields):
+    pass
+
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _flush_documents(collection, documents: list) -> int:
+    """
+    모아 둔 문서를 순서 무관(unordered) insert_many로 저장하고 저장 건수를 반환합니다.
+    _id가 같은 문서가 이미 있으면(중단 후 다시 저장하는 배치) 그 문서만 건너뛰므로 배치 저장은 멱등입니다.
+    """
+    if not documents:
+        return 0
+    started = time.perf_counter()
+    try:
+        collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if not errors or any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            record_error("mongo_write")
+            raise
+        DUPLICATES_TOTAL.inc(len(errors))
+        print(f"[{WORKER_NAME}]    - ♻️ 이미 저장된 문서 {len(errors)}건 건너뜀 (재시도된 배치).")
+    finally:
+        MONGO_WRITE_SECONDS.observe(time.perf_counter() - started, collection=collection.name)
+    return len(documents)
+
+
+def _read_chunks(reader, handle, stats: dict, start_row: int = 0, cancel: CancelToken = None):
+    """
+    [읽기 스테이지] CSV 청크를 읽고 컬럼 단위로 문서 필드를 계산하여
+    (행 수, 컬럼, 읽은 바이트 수, 청크 첫 행 번호)를 내보냅니다.
+    읽기 스테이지는 별도 스레드에서 실행되므로 stats는 이 스테이지 전용 딕셔너리여야 합니다. (파이프라인이 끝난 뒤 합침)
+    cancel이 중단되면 남은 청크가 있어도 멈추고 stats["stopped"]에 사유를 남깁니다.
+    """
+    next_row = start_row
+    while True:
+        with stage_timer("read", stats):
+            df = next(reader, None)
+        if df is None:
+            return
+        if cancel is not None and cancel.stopped:
+            stats["stopped"] = cancel.stop_reason()
+            return
+
+        # 3. 컬럼 단위로 문서 필드를 일괄 계산
+        with stage_timer("build", stats):
+            columns = build_document_columns(df)
+        stats["invalid_dates"] += columns["invalid_dates"]
+        yield len(df), columns, handle.tell(), next_row
+        next_row += len(df)
+
+
+def _tag_chunk(item: tuple, engine: NounExtractionEngine, source_file: str, generation: str, stats: dict,
+               pending: list, aggregator: NounAggregator = None, extra_fields: dict = None,
+               id_prefix: str = None, codec: NounCodec = None, dedup: DuplicateIndex = None) -> List[tuple]:
+    """
+    [태깅 스테이지] 청크 하나를 태깅하고 명사 빈도를 집계한 뒤, 배치 크기만큼 모인 (문서 배치, 커밋 행) 목록을 반환합니다.
+    커밋 행은 배치의 마지막 문서 다음 행 번호로, 배치가 저장되면 그 앞의 행은 모두 처리된 것입니다.
+    pending에는 아직 저장하지 않은 (행 번호, 문서)가 쌓입니다. codec을 넘기면 집계 후 명사를 저장 형식으로 인코딩합니다.
+    dedup(DuplicateIndex)을 넘기면 이미 본 기사는 태깅하지 않고 원본의 명사를 재사용하며, 중복 문서를 연결하거나 뺍니다.
+    """
+    rows, columns, _, first_row = item
+    texts = columns["full_texts"]
+
+    # 🌟🌟🌟 핵심 함수 호출 (청크 단위 병렬 태깅, 행 순서 보존) 🌟🌟🌟
+    if dedup is None:
+        with stage_timer("extract", stats):
+            noun_lists, chunk_stats = engine.extract(texts)
+    else:
+        with stage_timer("dedup", stats):
+            ids = [document_id(id_prefix, first_row + offset) if id_prefix else None for offset in range(rows)]
+            matches = dedup.match(texts, ids, id_prefix or source_file)
+        unique = [texts[offset] for offset, match in enumerate(matches) if match.kind is None]
+        try:
+            with stage_timer("extract", stats):
+                tagged, chunk_stats = engine.extract(unique)
+        except Exception:
+            dedup.forget(matches)
+            raise
+        noun_lists = dedup.resolve(matches, tagged)
+    for chunk in chunk_stats:
+        chunk["chunk"] = len(stats["chunks"])
+        stats["chunks"].append(chunk)
+        # 청크 안의 기사별 시간은 알 수 없으므로 청크 평균을 기사 수만큼 기록
+        if chunk["rows"]:
+            ARTICLE_TAGGING_SECONDS.observe(chunk["seconds"] / chunk["rows"], count=chunk["rows"])
+        record_error("tagging", chunk["errors"])
+
+    # 추출된 명사가 있을 경우에만 문서 생성
+    with stage_timer("build", stats):
+        documents = assemble_documents(columns, noun_lists, source_file, generation, extra_fields,
+                                       id_prefix=id_prefix, first_row=first_row)
+        offsets = [offset for offset, nouns in enumerate(noun_lists) if nouns]
+        if dedup is not None:
+            documents, offsets = dedup.annotate(documents, offsets, matches, stats)
+        if aggregator is not None:
+            aggregator.add_documents(documents)
+        if codec is not None:
+            codec.encode_documents(documents)
+        pending.extend((first_row + offset, document) for offset, document in zip(offsets, documents))
+    stats["rows"] += rows
+    ROWS_TOTAL.inc(rows)
+
+    # 4. 배치 크기만큼 모이면 쓰기 스테이지로 넘김 (Batch Insert)
+    batches = []
+    while len(pending) >= IMPORT_WRITE_BATCH_SIZE:
+        batch = pending[:IMPORT_WRITE_BATCH_SIZE]
+        del pending[:IMPORT_WRITE_BATCH_SIZE]
+        batches.append(([document for _, document in batch], batch[-1][0] + 1))
+    return batches
+
+
+def _write_batch(collection, documents: list, stats: dict):
+    """[쓰기 스테이지] 문서 배치 하나를 저장합니다."""
+    with stage_timer("write", stats):
+        written = _flush_documents(collection, documents)
+    stats["documents"] += written
+    stats["batches"] += 1
+    DOCUMENTS_TOTAL.inc(written)
+
+
+# 체크포인트 콜백: on_commit(rows_committed, batch_id, documents)
+CommitCallback = Callable[[int, int, int], None]
+
+
+def _process_file(file_path: str, engine: NounExtractionEngine, collection, generation: str,
+                  progress: ProgressCallback = _no_progress, aggregator: NounAggregator = None,
+                  encoding: str = None, shard: dict = None,
+                  start_row: int = 0, on_commit: CommitCallback = None, codec: NounCodec = None,
+                  columnar: ColumnarCache = None, dedup: DuplicateIndex = None,
+                  cancel: CancelToken = None) -> dict:
+    """
+    하나의 CSV 파일을 행 청크 단위로 스트리밍하면서 명사를 추출하고,
+    IMPORT_WRITE_BATCH_SIZE 건씩 ImFiles에 저장합니다. 모든 문서에는 generation이 기록됩니다.
+    읽기/태깅/쓰기는 크기 제한 큐로 연결된 스테이지로 겹쳐 실행되며(StagedPipeline), 스테이지 사용률이 통계에 포함됩니다.
+    청크마다 progress로 처리 행 수와 읽은 바이트 수를 알리고, 파일 처리 통계를 반환합니다.
+    shard(샤드 큐 문서)를 넘기면 헤더 + 해당 바이트 범위만 읽고, 문서에 샤드 ID를 기록합니다.
+
+    문서 _id는 회차(샤드면 샤드 ID)와 행 번호로 정해지므로 같은 배치를 다시 저장해도 중복되지 않습니다.
+    start_row부터 읽기 시작하며(이전 행은 건너뜀), 배치가 저장될 때마다 on_commit으로 체크포인트를 남깁니다.
+    codec(NounCodec)을 넘기면 명사를 그 저장 형식('pairs'/'packed')으로 저장합니다.
+    columnar(열 단위 캐시)를 넘기면 CSV 대신 캐시에서 해당 행 범위만 읽습니다. (인코딩 감지와 CSV 파싱 생략)
+    dedup(DuplicateIndex)을 넘기면 태깅 전에 중복 기사를 찾아 명사를 재사용하고, 중복 행 수를 통계에 남깁니다.
+    cancel(CancelToken)이 취소되거나 예산을 넘으면 청크 사이에서 멈추고, 처리한 행까지 커밋한 뒤 stats["stopped"]에 사유를 남깁니다.
+    """
+    file_start = time.perf_counter()
+    source_file = os.path.basename(file_path)
+    extra_fields = None
+    id_prefix = generation
+    if shard is not None:
+        extra_fields = {"shard_id": shard["_id"]}
+        id_prefix = shard["_id"]
+
+    row_range = columnar.rows_for(shard) if columnar is not None else None
+    if row_range is not None:
+        # 샤드 안의 행 번호는 CSV 경로와 같으므로 캐시가 없는 워커와 섞여도 문서 _id가 같습니다.
+        handle = reader = columnar.open(row_range[0] + start_row, row_range[1])
+        bytes_total = handle.bytes_total
+        encoding = columnar.encoding
+    else:
+        encoding = encoding or detect_csv_encoding(file_path)
+        if shard is None:
+            handle = open(file_path, 'rb')
+            bytes_total = os.path.getsize(file_path)
+        else:
+            handle = open_shard(file_path, shard["header_end"], shard["start"], shard["end"])
+            bytes_total = len(handle.getbuffer())
+        reader = None
+
+    # 단계별 소요 시간: CSV 파싱 또는 캐시 읽기(read) / 문서 생성(build) / 중복 판별(dedup) / 태깅(extract) / DB 저장(write)
+    # duplicates: 중복으로 판별되어 태깅하지 않은 행 수 (다른 파일/샤드에서 본 기사의 명사만 재사용한 행 포함,
+    #             near_duplicates는 그중 유사 중복, skipped_duplicates는 저장하지 않은 문서)
+    stats = {"encoding": encoding, "input": "csv" if reader is None else "columnar",
+             "rows": 0, "documents": 0, "batches": 0, "resumed_from_row": start_row,
+             "invalid_dates": 0, "duplicates": 0, "near_duplicates": 0, "skipped_duplicates": 0,
+             "read_seconds": 0.0, "build_seconds": 0.0, "dedup_seconds": 0.0, "extract_seconds": 0.0,
+             "write_seconds": 0.0, "stopped": None,
+             "chunks": []}
+    # 읽기 스테이지 전용 통계: build_seconds는 태깅 스테이지도 더하므로, 같은 딕셔너리를 두 스레드가 갱신하지 않도록 나눕니다.
+    read_stats = {"read_seconds": 0.0, "build_seconds": 0.0, "invalid_dates": 0, "stopped": None}
+    pending = []
+
+    def tag(item):
+        if cancel is not None and cancel.stopped:
+            # 멈춘 뒤에 읽기 스테이지가 미리 읽어 둔 청크는 태깅하지 않습니다. (커밋 행은 태깅한 청크까지)
+            stats["stopped"] = cancel.stop_reason()
+            return []
+        batches = _tag_chunk(item, engine, source_file, generation, stats, pending, aggregator, extra_fields,
+                             id_prefix, codec, dedup)
+        if cancel is not None:
+            cancel.add_rows(item[0])
+        progress(source_file, rows=stats["rows"], documents=stats["documents"],
+                 bytes_read=item[2], bytes_total=bytes_total)
+        print(f"[{WORKER_NAME}]    - {start_row + stats['rows']}행 처리 / {stats['documents']}건 저장")
+        return batches
+
+    def finish():
+        # 남은 문서와 함께 파일 끝까지 커밋 (문서가 없으면 체크포인트만 남김)
+        return [([document for _, document in pending], start_row + stats["rows"])]
+
+    def write(batch):
+        documents, rows_committed = batch
+        if documents:
+            _write_batch(collection, documents, stats)
+        if on_commit is not None:
+            on_commit(rows_committed, stats["batches"], stats["documents"])
+
+    # CSV 파일을 행 청크 단위로 읽기 (파일 전체를 메모리에 올리지 않음)
+    # 바이너리 핸들을 넘겨 tell()로 읽은 바이트 수(진행률)를 알 수 있게 합니다.
+    # 체크포인트에서 이어서 적재하는 경우 헤더 다음의 start_row개 행은 파싱만 하고 건너뜁니다.
+    pipeline = StagedPipeline()
+    with handle:
+        if reader is None:
+            reader = pd.read_csv(handle, encoding=encoding, chunksize=IMPORT_READ_CHUNK_ROWS,
+                                 skiprows=range(1, start_row + 1) if start_row else None)
+        pipeline.run(_read_chunks(reader, handle, read_stats, start_row, cancel), tag, write, finish)
+    stats["pipeline"] = pipeline.describe()
+    for key in ("read_seconds", "build_seconds", "invalid_dates"):
+        stats[key] += read_stats[key]
+    stats["stopped"] = stats["stopped"] or read_stats["stopped"]
+
+    if stats["chunks"]:
+        seconds = [c["seconds"] for c in stats["chunks"]]
+        print(f"[{WORKER_NAME}]    - 🧩 태깅 청크 {len(seconds)}개 "
+              f"(최소 {min(seconds):.2f}s / 평균 {sum(seconds) / len(seconds):.2f}s / 최대 {max(seconds):.2f}s)")
+
+    if stats["stopped"]:
+        print(f"[{WORKER_NAME}]    - ⏹️ 중단 ({stats['stopped']}): {start_row + stats['rows']}행까지 커밋, 남은 행은 다음 실행에서 이어서 처리")
+
+    if stats["duplicates"]:
+        print(f"[{WORKER_NAME}]    - 🪞 중복 기사 {stats['duplicates']}건 (유사 {stats['near_duplicates']}건, "
+              f"저장 생략 {stats['skipped_duplicates']}건): 태깅 없이 원본 명사 재사용")
+
+    if stats["documents"]:
+        print(f"[{WORKER_NAME}]    - ✨ {stats['documents']}건 DB 저장 완료 ({stats['batches']}개 배치, "
+              f"병목 스테이지: {stats['pipeline']['bottleneck']}).")
+    else:
+        print(f"[{WORKER_NAME}]    - ⚠️ 저장할 데이터가 없습니다 (명사 추출 실패).")
+
+    for key in ("read_seconds", "build_seconds", "dedup_seconds", "extract_seconds", "write_seconds"):
+        stats[key] = round(stats[key], 4)
+    stats["seconds"] = round(time.perf_counter() - file_start, 3)
+    if stats["seconds"] > 0:
+        ROWS_PER_SECOND.set(stats["rows"] / stats["seconds"])
+    return stats
+
+
+def _restore_committed(collection, id_prefix: str, start_row: int, aggregator: NounAggregator,
+                       codec: NounCodec = None, dedup: DuplicateIndex = None) -> int:
+    """
+    체크포인트에서 이어서 적재하기 전에, 커밋 행 이후에 저장된 문서(체크포인트 갱신 전에 중단된 배치)를 지우고
+    커밋된 문서의 명사 빈도를 집계기에 다시 더합니다. (인코딩된 명사는 codec의 사전으로 되돌림) 복원한 문서 수를 반환합니다.
+    dedup을 넘기면 커밋된 원본 기사의 지문을 다시 등록하여, 이후 행의 중복 판별이 한 번에 적재한 경우와 같아지게 합니다.
+    커밋된 문서는 IMPORT_WRITE_BATCH_SIZE 건씩 읽어 처리하므로 메모리 사용량은 파일 크기와 무관합니다.
+    """
+    collection.delete_many({"_id": document_id_range(id_prefix, start_row)})
+    cursor = iter(collection.find({"_id": document_id_range(id_prefix, 0, start_row)},
+                                  {DB_FIELD_NOUNS: 1, DB_FIELD_NOUN_ENCODING: 1, DB_FIELD_DATE: 1, DB_FIELD_TAGS: 1,
+                                   DB_FIELD_CONTENT_HASH: 1, DB_FIELD_SIMHASH: 1, DB_FIELD_DUPLICATE_OF: 1,
+                                   "source_file": 1},
+                                  batch_size=IMPORT_WRITE_BATCH_SIZE))
+    restored = 0
+    while True:
+        documents = list(islice(cursor, IMPORT_WRITE_BATCH_SIZE))
+        if not documents:
+            return restored
+        if codec is not None:
+            codec.decode_documents(documents)
+        aggregator.add_documents(documents)
+        if dedup is not None:
+            dedup.seed(documents, id_prefix)
+        restored += len(documents)
+
+
+def _import_file(file_path: str, engine: NounExtractionEngine, db, force: bool,
+                 progress: ProgressCallback = _no_progress, codec: NounCodec = None,
+                 columnar_dir: str = None, dedup: DuplicateIndex = None, cancel: CancelToken = None) -> dict:
+    """
+    매니페스트와 비교해 내용이 바뀐 파일만 다시 적재합니다. columnar_dir를 넘기면 열 단위 캐시(없으면 생성)에서 읽습니다.
+    새 회차(generation)로 모두 저장한 뒤에 이전 회차 문서를 지우므로, 실패 시에는 이전 데이터가 그대로 남습니다.
+    배치마다 체크포인트(커밋 행, 배치 번호)를 남기므로, 중단된 적재는 다음 실행에서 같은 회차로 마지막 커밋 이후부터 이어집니다.
+    cancel로 멈추면 처리한 행까지 커밋하고 체크포인트를 남긴 채 status='partial'을 반환합니다. (이전 회차는 그대로)
+    """
+    source_file = os.path.basename(file_path)
+    collection = db[RECORD_NOUNS_COLLECTION]
+    summary_collection = db[NOUN_SUMMARY_COLLECTION]
+    manifest_collection = db[IMPORT_MANIFEST_COLLECTION]
+    checkpoint_collection = db[IMPORT_CHECKPOINT_COLLECTION]
+
+    previous = load_manifest(manifest_collection, source_file)
+    checkpoint = load_checkpoint(checkpoint_collection, source_file)
+    unchanged, fingerprint = check_file_unchanged(previous, file_path)
+    # 중단된 적재가 남아 있으면 변경 여부와 관계없이 먼저 마무리합니다. (일부만 저장된 회차를 남기지 않도록)
+    if unchanged and not force and checkpoint is None:
+        if previous.get("mtime") != fingerprint["mtime"]:
+            touch_manifest(manifest_collection, source_file, fingerprint)
+        print(f"[{WORKER_NAME}] ⏭️ 변경 없음, 건너뜀: {file_path}")
+        progress(source_file, state="skipped")
+        return {"status": "skipped", "documents": previous.get("document_count", 0), "sha256": fingerprint["sha256"]}
+
+    if fingerprint.get("sha256") is None:
+        # 강제 재적재인데 크기/수정 시각 비교로 해시 계산을 건너뛴 경우
+        _, fingerprint = check_file_unchanged(None, file_path)
+
+    aggregator = NounAggregator()
+    start_row = restored = batch_base = 0
+    if checkpoint and checkpoint["sha256"] == fingerprint["sha256"]:
+        generation = checkpoint[DB_FIELD_GENERATION]
+        start_row, batch_base = checkpoint["rows_committed"], checkpoint["batch_id"]
+        restored = _restore_committed(collection, generation, start_row, aggregator, codec, dedup)
+        print(f"[{WORKER_NAME}] ⏯️ 체크포인트에서 이어서 적재: {file_path} ({start_row}행 / 배치 {batch_base}까지 완료)")
+    else:
+        if checkpoint:
+            # 파일 내용이 바뀌어 이어서 적재할 수 없는 중단된 회차를 정리합니다.
+            discard_generation(collection, source_file, checkpoint[DB_FIELD_GENERATION])
+        generation = new_generation()
+        print(f"[{WORKER_NAME}] ➡️ 파일 스트리밍 처리 시작: {file_path}")
+
+    def commit(rows_committed, batch_id, documents):
+        save_checkpoint(checkpoint_collection, source_file, fingerprint["sha256"], generation,
+                        rows_committed, batch_base + batch_id, restored + documents)
+
+    # 첫 배치 전에 중단되어도 이 회차의 문서를 찾아 정리할 수 있도록 시작 체크포인트를 남깁니다.
+    commit(start_row, 0, 0)
+    progress(source_file, state="running", bytes_total=fingerprint["size"])
+    try:
+        columnar = open_columnar_cache(file_path, fingerprint["sha256"], detect_csv_encoding, cache_dir=columnar_dir)
+        stats = _process_file(file_path, engine, collection, generation, progress, aggregator,
+                              start_row=start_row, on_commit=commit, codec=codec, columnar=columnar, dedup=dedup,
+                              cancel=cancel)
+        if stats["stopped"]:
+            stats["documents"] += restored
+            stats.update(status="partial", rows_committed=start_row + stats["rows"], sha256=fingerprint["sha256"],
+                         generation=generation)
+            progress(source_file, state="stopped", rows=stats["rows"], documents=stats["documents"])
+            return stats
+        # 명사 빈도 부분 집계 저장 (마스터는 ImFiles 전체 대신 이 문서들만 병합)
+        summaries = aggregator.to_documents(source_file, generation)
+        discard_generation(summary_collection, source_file, generation)
+        _flush_documents(summary_collection, summaries)
+        stats["summary_documents"] = len(summaries)
+    except Exception:
+        print(f"[{WORKER_NAME}]    - 💾 저장된 배치는 유지합니다. 다음 실행에서 체크포인트부터 이어서 적재합니다.")
+        raise
+
+    stats["documents"] += restored
+    # 매니페스트에 새 회차를 먼저 기록(공개)한 뒤 이전 회차를 지웁니다. 마스터는 매니페스트의 회차만 읽습니다.
+    save_manifest(manifest_collection, source_file, fingerprint, stats["documents"], generation)
+    stats["replaced_documents"] = replace_previous_generations(collection, source_file, generation)
+    replace_previous_generations(summary_collection, source_file, generation)
+    clear_checkpoint(checkpoint_collection, source_file)
+    stats.update(status="rebuilt", sha256=fingerprint["sha256"], generation=generation)
+    progress(source_file, state="completed", rows=stats["rows"], documents=stats["documents"])
+    return stats
+
+
+def _import_static_files(files: List[str], engine: NounExtractionEngine, db, force: bool, report: dict,
+                         progress: ProgressCallback = _no_progress, codec: NounCodec = None,
+                         columnar_dir: str = None, dedup: DuplicateIndex = None, cancel: CancelToken = None) -> bool:
+    """
+    WORKER_CHUNK_FILES 방식: 이 워커에 할당된 파일을 차례로 적재합니다.
+    cancel로 멈추면 시작하지 않은 파일을 report["remaining_files"]에 남깁니다.
+    """
+    success = True
+    for file_path in files:
+        progress(os.path.basename(file_path), state="pending")
+
+    for index, file_path in enumerate(files):
+        if cancel is not None and cancel.stopped:
+            report["remaining_files"] = [os.path.basename(path) for path in files[index:]]
+            break
+        source_file = os.path.basename(file_path)
+        try:
+            file_report = _import_file(file_path, engine, db, force, progress, codec, columnar_dir, dedup, cancel)
+            report["files"][source_file] = file_report
+            report[file_report["status"]].append(source_file)
+            if file_report["status"] == "rebuilt":
+                print(f"[{WORKER_NAME}] ✅ 파일 처리 완료: {file_path}")
+
+        except FileNotFoundError:
+            print(f"[{WORKER_NAME}] ❌ 파일을 찾을 수 없음: {file_path}")
+            record_error("file_not_found")
+            progress(source_file, state="failed", error="file not found")
+            success = False
+        except Exception as e:
+            print(f"[{WORKER_NAME}] ❌ 파일 처리 중 오류 ({file_path}): {e}")
+            record_error("file")
+            progress(source_file, state="failed", error=str(e))
+            success = False
+    return success
+
+
+# ----------------------------------------------------------------------
+# 공용 샤드 큐 방식 (IMPORT_ASSIGNMENT='shared')
+# ----------------------------------------------------------------------
+
+_STAGE_KEYS = ("rows", "documents", "batches", "invalid_dates", "duplicates", "near_duplicates", "skipped_duplicates",
+               "read_seconds", "build_seconds", "dedup_seconds", "extract_seconds", "write_seconds")
+
+
+def _import_shard(shard: dict, plan: dict, file_path: str, engine: NounExtractionEngine, db, queue,
+                  progress: ProgressCallback = _no_progress, codec: NounCodec = None,
+                  columnar_dir: str = None, dedup: DuplicateIndex = None, cancel: CancelToken = None) -> dict:
+    """
+    임대한 샤드 하나를 적재합니다. 배치마다 샤드 문서에 체크포인트를 남기며 임대를 연장하고, 임대를 잃으면 LeaseLostError로 중단합니다.
+    이전 시도가 중단된 샤드는 그 체크포인트부터 이어서 처리합니다.
+    cancel로 멈추면 처리한 행까지 커밋하고 샤드를 대기 상태로 돌려놓아 다른 워커(또는 다음 실행)가 이어서 처리하게 합니다.
+    샤드 문서와 부분 집계는 파일 계획의 회차(generation)로 저장되며, 파일 교체는 마지막 샤드를 끝낸 워커가 합니다.
+    """
+    collection = db[RECORD_NOUNS_COLLECTION]
+    summary_collection = db[NOUN_SUMMARY_COLLECTION]
+    generation = shard[DB_FIELD_GENERATION]
+    progress_key = f"{shard['source_file']}#{shard['index']}"
+    renewed_at = time.monotonic()
+
+    def shard_progress(_source_file, **fields):
+        nonlocal renewed_at
+        # 임대 시간의 절반이 지날 때마다 연장 (임대를 잃었으면 여기서 중단)
+        if time.monotonic() - renewed_at >= IMPORT_SHARD_LEASE_SEC / 2:
+            renew_lease(queue, shard)
+            renewed_at = time.monotonic()
+        progress(progress_key, **fields)
+
+    aggregator = NounAggregator()
+    start_row = shard.get("rows_committed", 0)
+    restored = 0
+    if shard["attempt"] > 1 or start_row or shard.get("reset_count"):
+        # 이전 시도(중단된 워커, 취소로 멈춘 실행, 또는 failed에서 다시 돌린 샤드)의 체크포인트 이후부터 이어서 처리
+        restored = _restore_committed(collection, shard["_id"], start_row, aggregator, codec, dedup)
+
+    def commit(rows_committed, batch_id, documents):
+        nonlocal renewed_at
+        checkpoint_shard(queue, shard, rows_committed, shard.get("batch_id", 0) + batch_id, restored + documents)
+        renewed_at = time.monotonic()
+
+    print(f"[{WORKER_NAME}] ➡️ 샤드 처리 시작: {progress_key} (바이트 {shard['start']}~{shard['end']}, "
+          f"시도 {shard['attempt']}, {start_row}행부터)")
+    progress(progress_key, state="running", bytes_total=shard["end"] - shard["start"])
+    try:
+        # 캐시는 파일 전체를 한 번 변환해 두고 샤드마다 해당 행 범위만 읽습니다.
+        columnar = open_columnar_cache(file_path, plan["sha256"], detect_csv_encoding, encoding=plan["encoding"],
+                                       cache_dir=columnar_dir)
+        stats = _process_file(file_path, engine, collection, generation, shard_progress, aggregator,
+                              encoding=plan["encoding"], shard=dict(shard, header_end=plan["header_end"]),
+                              start_row=start_row, on_commit=commit, codec=codec, columnar=columnar, dedup=dedup,
+                              cancel=cancel)
+        stats["documents"] += restored
+        if stats["stopped"]:
+            yield_shard(queue, shard)
+            stats.update(shard=shard["_id"], index=shard["index"], attempt=shard["attempt"],
+                         rows_committed=start_row + stats["rows"])
+            progress(progress_key, state="stopped", rows=stats["rows"], documents=stats["documents"])
+            return stats
+        summaries = aggregator.to_documents(shard["source_file"], generation)
+        for summary in summaries:
+            summary["shard_id"] = shard["_id"]
+        summary_collection.delete_many({"shard_id": shard["_id"]})
+        _flush_documents(summary_collection, summaries)
+        updated_plan = complete_shard(queue, shard, start_row + stats["rows"], stats["documents"])
+    except Exception as e:
+        # 저장된 배치와 체크포인트는 남겨 두어 다음 시도가 이어서 처리합니다.
+        if not isinstance(e, LeaseLostError):
+            release_shard(queue, shard, str(e))
+        progress(progress_key, state="failed", error=str(e))
+        raise
+
+    stats.update(shard=shard["_id"], index=shard["index"], attempt=shard["attempt"])
+    progress(progress_key, state="completed", rows=stats["rows"], documents=stats["documents"])
+
+    if updated_plan and updated_plan["done_count"] >= updated_plan["shard_count"]:
+        stats["replaced_documents"] = finalize_file(queue, updated_plan, (collection, summary_collection))
+        stats["finalized"] = True
+        print(f"[{WORKER_NAME}] ✅ 파일 처리 완료 (모든 샤드): {shard['source_file']}")
+    return stats
+
+
+def _import_shared_queue(files: List[str], engine: NounExtractionEngine, db, force: bool, report: dict,
+                         progress: ProgressCallback = _no_progress, codec: NounCodec = None,
+                         columnar_dir: str = None, dedup: DuplicateIndex = None, cancel: CancelToken = None) -> bool:
+    """
+    입력 파일마다 샤드 계획을 확인(필요하면 생성)한 뒤, 가져갈 샤드가 없을 때까지 공용 큐에서 샤드를 임대하여 처리합니다.
+    워커 수와 무관하게 샤드 단위로 일이 나뉘므로, 워커를 추가하면 전체 재적재 시간이 줄어듭니다.
+    cancel로 멈추면 더 가져가지 않고, 완료되지 않은 샤드 목록을 report["remaining_shards"]에 남깁니다.
+    """
+    queue = db[IMPORT_SHARD_COLLECTION]
+    collections = (db[RECORD_NOUNS_COLLECTION], db[NOUN_SUMMARY_COLLECTION])
+    ensure_queue_indexes(queue, collections)
+    requested_at = time.time()
+    success = True
+
+    paths = {}
+    plans = {}
+    for file_path in files:
+        source_file = os.path.basename(file_path)
+        try:
+            plan, status = ensure_file_plan(queue, file_path, detect_csv_encoding, force, requested_at,
+                                            collections=collections)
+        except FileNotFoundError:
+            print(f"[{WORKER_NAME}] ❌ 파일을 찾을 수 없음: {file_path}")
+            record_error("file_not_found")
+            progress(source_file, state="failed", error="file not found")
+            success = False
+            continue
+
+        if status == 'skipped':
+            print(f"[{WORKER_NAME}] ⏭️ 변경 없음, 건너뜀: {file_path}")
+            progress(source_file, state="skipped")
+            report["files"][source_file] = {"status": "skipped", "documents": plan.get("document_count", 0),
+                                            "sha256": plan["sha256"]}
+            report["skipped"].append(source_file)
+        else:
+            paths[source_file] = file_path
+            plans[source_file] = plan
+
+    # 가져갈 수 있는 샤드가 없어질 때까지 반복 (실패한 샤드는 이번 실행에서 다시 가져가지 않음)
+    failed_shards = []
+    while paths and not (cancel is not None and cancel.stopped):
+        shard = claim_shard(queue, list(paths), exclude=failed_shards)
+        if shard is None:
+            break
+        source_file = shard["source_file"]
+        plan = plans[source_file]
+        if plan[DB_FIELD_GENERATION] != shard[DB_FIELD_GENERATION]:
+            plan = plans[source_file] = queue.find_one({"_id": plan["_id"]})
+
+        file_report = report["files"].setdefault(source_file, dict(
+            {key: 0 for key in _STAGE_KEYS}, status="in_progress", shards=[],
+            sha256=plan["sha256"], generation=plan[DB_FIELD_GENERATION],
+        ))
+        try:
+            stats = _import_shard(shard, plan, paths[source_file], engine, db, queue, progress, codec, columnar_dir,
+                                  dedup, cancel)
+        except LeaseLostError:
+            print(f"[{WORKER_NAME}] ⚠️ 임대 만료로 다른 워커가 가져간 샤드: {shard['_id']}")
+            record_error("lease_lost")
+            continue
+        except Exception as e:
+            print(f"[{WORKER_NAME}] ❌ 샤드 처리 중 오류 ({shard['_id']}): {e}")
+            record_error("shard")
+            failed_shards.append(shard["_id"])
+            success = False
+            continue
+
+        for key in _STAGE_KEYS:
+            file_report[key] = round(file_report[key] + stats[key], 4)
+        file_report["pipeline"] = merge_pipeline_stats([file_report.get("pipeline"), stats["pipeline"]])
+        file_report["shards"].append({key: stats[key] for key in ("shard", "index", "attempt", "rows",
+                                                                  "documents", "seconds", "stopped")})
+
+    # 이 워커가 더 가져갈 샤드가 없으면, 파일별로 완료 여부(다른 워커가 처리 중인 샤드 포함)를 보고합니다.
+    report["queue"] = queue_status(queue, list(paths))
+    for source_file in paths:
+        plan = queue.find_one({"_id": plans[source_file]["_id"]})
+        file_report = report["files"].setdefault(source_file, {"shards": []})
+        file_report["status"] = "rebuilt" if plan and plan["state"] == PLAN_COMPLETED else "in_progress"
+        report[file_report["status"]].append(source_file)
+        if file_report["status"] == "rebuilt":
+            progress(source_file, state="completed")
+        if report["queue"].get(source_file, {}).get("failed"):
+            success = False
+    if cancel is not None and cancel.stopped:
+        report["remaining_shards"] = remaining_shards(queue, list(paths))
+    return success
+
+
+def _stop_summary(report: dict, cancel: CancelToken) -> dict:
+    """
+    멈춘 Rebuild의 부분 결과입니다. 마스터는 남은 파일/샤드를 다른 워커에 나눠 줄 수 있습니다.
+    files_partial은 이어서 처리할 파일별 커밋 행이며, 다음 실행은 그 행부터 시작합니다.
+    """
+    files = report["files"]
+    summary = {
+        "reason": cancel.stop_reason(),
+        "budget": cancel.describe(),
+        "rows_completed": sum(stats.get("rows", 0) for stats in files.values()),
+        "files_completed": report["rebuilt"] + report["skipped"],
+        "files_partial": {name: stats["rows_committed"] for name, stats in files.items()
+                          if stats.get("status") == "partial"},
+        "remaining_files": report.get("remaining_files", []),
+        "remaining_shards": report.get("remaining_shards", []),
+    }
+    print(f"[{WORKER_NAME}] ⏹️ Rebuild 중단 ({summary['reason']}): {summary['rows_completed']}행 처리, "
+          f"완료 파일 {len(summary['files_completed'])}개, 남은 파일 {len(summary['remaining_files'])}개, "
+          f"남은 샤드 {len(summary['remaining_shards'])}개")
+    return summary
+
+
+def process_worker_files(report: dict = None, force: bool = False,
+                         progress: ProgressCallback = _no_progress,
+                         files: List[str] = None, client=None, extract_options: dict = None,
+                         assignment: str = None, cancel: CancelToken = None) -> bool:
     """
     할당된 CSV 파일을 읽어 명사를 추출하고 MongoDB에 저장합니다.
+    매니페스트상 내용이 바뀌지 않은 파일은 건너뛰며, force=True이면 모든 파일을 다시 적재합니다.
+    report 딕셔너리를 넘기면 추출 모드, 건너뛴/재적재한 파일 목록과 파일/청크별 처리 통계를 채워 줍니다.
+    progress 콜백에는 파일별 상태(pending/running/skipped/completed/failed)와 처리 행 수, 읽은 바이트 수가 전달됩니다.
+
+    assignment(기본: IMPORT_ASSIGNMENT)가 'shared'이면 모든 입력 파일을 샤드로 나눈 공용 큐에서 샤드를 가져가 처리하고,
+    'static'이면 WORKER_CHUNK_FILES에 고정 할당된 파일만 처리합니다.
+
+    cancel(CancelToken)을 넘기면 청크 사이마다 취소 요청과 시간/행 예산을 확인합니다. 멈추면 처리한 행까지 커밋하고(체크포인트 유지)
+    report["stopped"]에 부분 결과(완료한 파일/행, 이어서 처리할 파일과 남은 샤드)를 남깁니다.
+
+    벤치마크/테스트용 주입 인자:
+      - files: 처리할 파일 목록 (기본: shared는 IMPORT_INPUT_FILES, static은 WORKER_FILE_PATH)
+      - client: 사용할 MongoClient 호환 객체 (기본: 공유 클라이언트)
+      - extract_options: {"mode", "workers", "chunk_size", "tagger", "cache", "noun_storage", "index_build",
+        "columnar_cache"(캐시 디렉터리, False이면 사용 안 함), "dedup", "dedup_action"} 로 추출/저장 설정을 덮어씁니다.
     """
-    client = None
+    assignment = assignment or IMPORT_ASSIGNMENT
+    if files is None:
+        files = IMPORT_INPUT_FILES if assignment == 'shared' else WORKER_FILE_PATH
+    extract_options = dict(extract_options or {})
+    owns_client = client is None
+    cache = None
     total_success = True
+    if report is None:
+        report = {}
+    report.setdefault("files", {})
+    report.setdefault("skipped", [])
+    report.setdefault("rebuilt", [])
+    report.setdefault("in_progress", [])
+    report.setdefault("partial", [])
+    if cancel is not None:
+        cancel.start()
 
     try:
         # 1. DB 연결
-        client = get_mongodb_client()
+        if owns_client:
+            client = get_mongodb_client()
         if client is None:
             return False
 
         db = client[DB_NAME]
-        collection = db[RECORD_NOUNS_COLLECTION]
 
-        if not WORKER_FILE_PATH:
+        if not files:
             print(f"[{WORKER_NAME}] ⚠️ 처리할 파일이 없습니다.")
             return True
 
-        print(f"[{WORKER_NAME}] 총 {len(WORKER_FILE_PATH)}개의 파일을 처리합니다.")
-
-        # 2. 파일 순회
-        for file_path in WORKER_FILE_PATH:
-            try:
-                print(f"[{WORKER_NAME}] ➡️ 파일 로드 중: {file_path}")
-
-                # CSV 파일 읽기 (인코딩 에러 방지)
-                try:
-                    df = pd.read_csv(file_path, encoding='utf-8')
-                except UnicodeDecodeError:
-                    df = pd.read_csv(file_path, encoding='cp949')
-
-                documents_to_insert = []
-                print(f"[{WORKER_NAME}]    - 데이터 처리 시작 ({len(df)}행)...")
-
-                # 3. 행(Row) 단위 처리 (여기가 핵심입니다!)
-                for index, row in df.iterrows():
-                    try:
-                        # 컬럼명 확인 필수! (csv 파일의 헤더와 일치해야 함)
-                        title = str(row.get(CSV_FIELD_HEADING, ''))  # 'title'
-                        content = str(row.get(CSV_FIELD_ARTICLES, ''))  # 'text'
-                        link = str(row.get('link', ''))  # (CSV에 'link' 컬럼이 있다면 사용)
-                        date_data = str(row.get(CSV_FIELD_DATE, ''))
-                        tags_data = str(row.get(CSV_FIELD_TAGS, ''))
-                        parsed_tags = [tag.strip() for tag in tags_data.split(',') if tag.strip()]
-
-                        # 제목과 내용을 합쳐서 분석
-                        full_text = f"{title} {content}"
-
-                        # 🌟🌟🌟 핵심 함수 호출 🌟🌟🌟
-                        nouns = extract_and_filter_proper_nouns(full_text)
-
-                        # 추출된 명사가 있을 경우에만 문서 생성
-                        if nouns:
-                            doc = {
-                                DB_FIELD_HEADING: title,   # 마스터가 검색하는 'Heading' 키
-                                DB_FIELD_TAGS: parsed_tags, # 마스터가 검색하는 'Tags' 키 (리스트 형식)
-                                DB_FIELD_DATE: date_data,   # 마스터가 검색하는 'Date' 키
-                                DB_FIELD_NOUNS: nouns,      # 마스터가 집계하는 'nouns' 키
-
-                                # 기타 정보
-                                "link": link,
-                                "worker_name": WORKER_NAME,
-                                "source_file": os.path.basename(file_path)
-                            }
-                            documents_to_insert.append(doc)
-
-                    except Exception as row_e:
-                        # 한 행이 에러나도 멈추지 않고 계속 진행
-                        continue
-
-                # 4. DB 일괄 삽입 (Batch Insert)
-                if documents_to_insert:
-                    collection.insert_many(documents_to_insert)
-                    print(f"[{WORKER_NAME}]    - ✨ {len(documents_to_insert)}건 DB 저장 완료.")
-                else:
-                    print(f"[{WORKER_NAME}]    - ⚠️ 저장할 데이터가 없습니다 (명사 추출 실패).")
-
-                print(f"[{WORKER_NAME}] ✅ 파일 처리 완료: {file_path}")
-
-            except FileNotFoundError:
-                print(f"[{WORKER_NAME}] ❌ 파일을 찾을 수 없음: {file_path}")
-                total_success = False
-            except Exception as e:
-                print(f"[{WORKER_NAME}] ❌ 파일 처리 중 오류 ({file_path}): {e}")
-                total_success = False
+        print(f"[{WORKER_NAME}] 총 {len(files)}개의 파일을 처리합니다.")
+
+        tagger = get_tagger(extract_options.pop("tagger", None))
+        codec = NounCodec(db[NOUN_VOCAB_COLLECTION], extract_options.pop("noun_storage", NOUN_STORAGE_MODE))
+        index_build = extract_options.pop("index_build", IMPORT_INDEX_BUILD)
+        columnar_dir = extract_options.pop("columnar_cache", COLUMNAR_CACHE_DIR if COLUMNAR_CACHE_ENABLED else None)
+        # 중복 기사 지문은 이번 Rebuild에서 처리하는 모든 파일(샤드)에 걸쳐 기억합니다.
+        dedup = open_duplicate_index(extract_options.pop("dedup", IMPORT_DEDUP),
+                                     extract_options.pop("dedup_action", IMPORT_DEDUP_ACTION))
+        report["indexes"] = prepare_indexes(db, index_build)
+        if extract_options.pop("cache", NOUN_CACHE_ENABLED):
+            cache = open_noun_cache(tagger.version)
+
+        with NounExtractionEngine(partial(tag_proper_nouns_batch, backend=tagger.name), batch=True,
+                                  cache=cache, **extract_options) as engine:
+            report["extraction"] = dict(engine.describe(), tagger=tagger.name)
+            report["assignment"] = assignment
+            print(f"[{WORKER_NAME}] 🧠 명사 추출 모드: {engine.mode} (워커 {report['extraction']['workers']}개, "
+                  f"태거 {tagger.name}, 명사 저장 형식 {codec.mode}, "
+                  f"중복 판별 {dedup.mode + '/' + dedup.action if dedup is not None else 'off'})")
+
+            # 2. 공용 샤드 큐에서 샤드를 가져가며 처리하거나, 고정 할당된 파일을 순회
+            if assignment == 'shared':
+                total_success = _import_shared_queue(files, engine, db, force, report, progress, codec,
+                                                     columnar_dir, dedup, cancel)
+            else:
+                total_success = _import_static_files(files, engine, db, force, report, progress, codec,
+                                                     columnar_dir, dedup, cancel)
+            if cancel is not None and cancel.stopped:
+                report["stopped"] = _stop_summary(report, cancel)
+            report["noun_storage"] = codec.describe()
+            report["dedup"] = dedup.describe() if dedup is not None else None
+            # 조회용 인덱스는 대량 저장이 끝난 뒤 생성 (IMPORT_INDEX_BUILD='after')
+            report["indexes"] = finish_indexes(db, index_build) or report["indexes"]
+
+            # 스테이지(읽기/태깅/쓰기) 사용률과 큐 깊이 합계: 병목 스테이지 확인용
+            report["pipeline"] = merge_pipeline_stats(f.get("pipeline") for f in report["files"].values())
 
     except Exception as e:
         print(f"[{WORKER_NAME}] ❌ 치명적 오류 발생: {e}")
+        record_error("fatal")
         total_success = False
 
     finally:
-        # 5. DB 연결 해제
-        close_mongodb_client(client)
-
-    return total_success
\ No newline at end of file
+        if cache is not None:
+            report["noun_cache"] = cache.stats()
+            print(f"[{WORKER_NAME}] 🗃️ 명사 캐시: 적중 {cache.hits}건 / 미스 {cache.misses}건")
+            NOUN_CACHE_TOTAL.inc(cache.hits, result="hit")
+            NOUN_CACHE_TOTAL.inc(cache.misses, result="miss")
+            cache.close()
+
+        # 5. DB 연결 반환 (공유 커넥션 풀은 다음 작업에서 재사용)
+        if owns_client:
+            close_mongodb_client(client)
+
+    return total_success
@@ -0,0 +1,77 @@
+# data_processor/indexes.py
+
+from typing import List
+import time
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from .constants import (
+    WORKER_NAME,
+    RECORD_NOUNS_COLLECTION, NOUN_SUMMARY_COLLECTION,
+    DB_FIELD_DATE, DB_FIELD_TAGS, DB_FIELD_GENERATION,
+    IMPORT_INDEX_BUILD,
+)
+
+# 회차 교체(replace_previous_generations), 중단된 회차 정리, 파일별 조회에 쓰는 인덱스. 적재 중에도 필요하므로 항상 먼저 만듭니다.
+_MAINTENANCE_INDEXES = {
+    RECORD_NOUNS_COLLECTION: [
+        IndexModel([("worker_name", ASCENDING), ("source_file", ASCENDING), (DB_FIELD_GENERATION, ASCENDING)],
+                   name="worker_file_generation"),
+    ],
+    NOUN_SUMMARY_COLLECTION: [
+        IndexModel([("worker_name", ASCENDING), ("source_file", ASCENDING), (DB_FIELD_GENERATION, ASCENDING)],
+                   name="worker_file_generation"),
+    ],
+}
+
+# 마스터의 날짜 범위/태그 조회용 인덱스. 문서마다 갱신 비용이 들므로 IMPORT_INDEX_BUILD='after'이면 적재가 끝난 뒤 만듭니다.
+_QUERY_INDEXES = {
+    RECORD_NOUNS_COLLECTION: [
+        IndexModel([(DB_FIELD_DATE, DESCENDING)], name="date"),
+        # Tags는 배열이므로 멀티키 인덱스 (태그 + 기간 조회)
+        IndexModel([(DB_FIELD_TAGS, ASCENDING), (DB_FIELD_DATE, DESCENDING)], name="tags_date"),
+    ],
+    NOUN_SUMMARY_COLLECTION: [
+        IndexModel([("dimension", ASCENDING), ("key", ASCENDING)], name="dimension_key"),
+    ],
+}
+
+
+def _create(db, indexes: dict) -> List[str]:
+    created = []
+    for collection_name, models in indexes.items():
+        # createIndexes는 같은 정의의 인덱스가 이미 있으면 아무것도 하지 않습니다.
+        created.extend(f"{collection_name}.{name}" for name in db[collection_name].create_indexes(models))
+    return created
+
+
+def ensure_maintenance_indexes(db) -> List[str]:
+    return _create(db, _MAINTENANCE_INDEXES)
+
+
+def ensure_query_indexes(db) -> dict:
+    """조회용 인덱스를 만들고 {"indexes": [...], "seconds": ...}를 반환합니다."""
+    started = time.perf_counter()
+    names = _create(db, _QUERY_INDEXES)
+    seconds = round(time.perf_counter() - started, 3)
+    print(f"[{WORKER_NAME}] 🗂️ 조회 인덱스 확인/생성 완료: {len(names)}개 ({seconds:.2f}s)")
+    return {"indexes": names, "seconds": seconds}
+
+
+def prepare_indexes(db, mode: str = IMPORT_INDEX_BUILD) -> dict:
+    """적재 전에 호출합니다. 관리용 인덱스는 항상, 조회용 인덱스는 mode='before'일 때만 만듭니다."""
+    ensure_maintenance_indexes(db)
+    if mode == 'before':
+        return ensure_query_indexes(db)
+    return None
+
+
+def finish_indexes(db, mode: str = IMPORT_INDEX_BUILD) -> dict:
+    """
+    적재 후에 호출합니다. mode='after'이면 없는 조회용 인덱스를 만듭니다.
+    이미 있는 인덱스는 지우지 않습니다. (다른 워커의 문서와 마스터 조회가 같은 컬렉션을 쓰므로)
+    따라서 인덱스 없이 저장되는 이점은 컬렉션의 첫 적재에만 적용됩니다.
+    """
+    if mode == 'after':
+        return ensure_query_indexes(db)
+    return None
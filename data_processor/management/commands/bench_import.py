@@ -0,0 +1,198 @@
+# data_processor/management/commands/bench_import.py
+#
+# 임포트 파이프라인 전체(process_worker_files)를 인메모리 Mongo 대체 구현으로 돌려 성능 지표를 JSON으로 출력합니다.
+# 사용법: python manage.py bench_import --rows 2000 --files 2 --tagger heuristic --output bench.json
+#         python manage.py bench_import --sample-from data/2015.csv --rows 5000 --write-latency-ms 2
+
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import bson
+from django.core.management.base import BaseCommand
+
+from data_processor.benchmarks import write_synthetic_csv
+from data_processor.columnar import open_columnar_cache
+from data_processor.dedup import DEDUP_MODES, DEDUP_ACTIONS
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, IMPORT_READ_CHUNK_ROWS, IMPORT_WRITE_BATCH_SIZE,
+)
+from data_processor.importer import process_worker_files, detect_csv_encoding
+from data_processor.manifest import file_sha256
+from data_processor.memory_store import InMemoryClient
+from data_processor.taggers import TAGGER_BACKENDS
+from data_processor.vocab import STORAGE_MODES
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _latency_summary(latencies) -> dict:
+    milliseconds = [latency * 1000 for latency in latencies]
+    return {
+        "calls": len(milliseconds),
+        "p50_ms": round(_percentile(milliseconds, 0.50), 3),
+        "p95_ms": round(_percentile(milliseconds, 0.95), 3),
+        "max_ms": round(max(milliseconds), 3) if milliseconds else 0.0,
+        "total_seconds": round(sum(latencies), 4),
+    }
+
+
+def _max_rss_mb():
+    """프로세스 최대 RSS(MB). Linux는 ru_maxrss가 KB, macOS는 바이트 단위입니다."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if platform.system() == 'Darwin' else 1024), 1)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "합성(또는 샘플링한) CSV로 임포트 파이프라인을 벤치마크하고 rows/sec, 단계별 시간, 메모리, 쓰기 지연을 JSON으로 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000, help="파일당 행 수")
+        parser.add_argument("--files", type=int, default=1, help="생성할 CSV 파일 수")
+        parser.add_argument("--sample-from", default=None, help="합성 대신 이 CSV에서 행을 샘플링합니다.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--mode", default="serial", choices=["serial", "process"])
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=None)
+        parser.add_argument("--tagger", default="heuristic", choices=list(TAGGER_BACKENDS))
+        parser.add_argument("--write-latency-ms", type=float, default=0.0, help="쓰기 호출마다 더할 가상 네트워크 지연")
+        parser.add_argument("--cache", action="store_true", help="명사 캐시를 사용합니다. (기본: 끔)")
+        parser.add_argument("--noun-storage", default="list", choices=list(STORAGE_MODES),
+                            help="ImFiles 명사 저장 형식 (imfiles_bytes로 크기 비교)")
+        parser.add_argument("--columnar", action="store_true",
+                            help="열 단위 입력 캐시를 미리 만들어 두고 캐시에서 읽습니다. (기본: CSV 직접 파싱)")
+        parser.add_argument("--dedup", default="off", choices=list(DEDUP_MODES),
+                            help="태깅 전 중복 기사 판별 (--sample-from은 복원 추출이라 중복 행이 생김)")
+        parser.add_argument("--dedup-action", default="link", choices=list(DEDUP_ACTIONS))
+        parser.add_argument("--trace-memory", action="store_true",
+                            help="tracemalloc으로 파이썬 힙 최대 사용량도 측정합니다. (처리량이 느려짐)")
+        parser.add_argument("--output", default=None, help="결과 JSON을 저장할 경로 (기본: 표준 출력)")
+        parser.add_argument("--keep", action="store_true", help="생성한 CSV 임시 디렉터리를 지우지 않습니다.")
+
+    def handle(self, *args, **options):
+        workdir = tempfile.mkdtemp(prefix="bench_import_")
+        try:
+            files = [
+                write_synthetic_csv(os.path.join(workdir, f"bench_{i}.csv"), options["rows"],
+                                    seed=options["seed"] + i, sample_from=options["sample_from"])
+                for i in range(options["files"])
+            ]
+            result = self._run(files, options, workdir)
+        finally:
+            if options["keep"]:
+                self.stderr.write(f"생성한 CSV: {workdir}")
+            else:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        payload = json.dumps(result, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], 'w', encoding='utf-8') as handle:
+                handle.write(payload + "\n")
+            self.stderr.write(f"결과 저장: {options['output']}")
+        else:
+            self.stdout.write(payload)
+
+    def _run(self, files, options, workdir) -> dict:
+        client = InMemoryClient(write_latency_ms=options["write_latency_ms"])
+        extract_options = {"mode": options["mode"], "tagger": options["tagger"], "cache": options["cache"],
+                           "noun_storage": options["noun_storage"], "columnar_cache": False,
+                           "dedup": options["dedup"], "dedup_action": options["dedup_action"]}
+        if options["columnar"]:
+            # 캐시 생성은 파일 내용당 한 번이므로 측정에서 제외합니다.
+            extract_options["columnar_cache"] = os.path.join(workdir, "columnar")
+            with contextlib.redirect_stdout(sys.stderr):
+                for path in files:
+                    open_columnar_cache(path, file_sha256(path), detect_csv_encoding,
+                                        cache_dir=extract_options["columnar_cache"])
+        if options["workers"]:
+            extract_options["workers"] = options["workers"]
+        if options["chunk_size"]:
+            extract_options["chunk_size"] = options["chunk_size"]
+
+        report = {}
+        peak_traced = None
+        if options["trace_memory"]:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            # importer 로그는 표준 에러로 보내 표준 출력에는 JSON만 남깁니다.
+            with contextlib.redirect_stdout(sys.stderr):
+                success = process_worker_files(report, force=True, files=files, client=client,
+                                               extract_options=extract_options)
+            seconds = time.perf_counter() - started
+            if options["trace_memory"]:
+                peak_traced = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        finally:
+            if options["trace_memory"]:
+                tracemalloc.stop()
+
+        file_stats = [report["files"][os.path.basename(path)] for path in files
+                      if os.path.basename(path) in report.get("files", {})]
+        rows = sum(stats.get("rows", 0) for stats in file_stats)
+        stages = {
+            key: round(sum(stats.get(f"{key}_seconds", 0.0) for stats in file_stats), 4)
+            for key in ("read", "build", "dedup", "extract", "write")
+        }
+
+        return {
+            "benchmark": "import_pipeline",
+            "git_revision": _git_revision(),
+            "success": success,
+            "config": {
+                "files": len(files),
+                "rows_per_file": options["rows"],
+                "sample_from": options["sample_from"],
+                "seed": options["seed"],
+                "read_chunk_rows": IMPORT_READ_CHUNK_ROWS,
+                "write_batch_size": IMPORT_WRITE_BATCH_SIZE,
+                "write_latency_ms": options["write_latency_ms"],
+                "columnar_cache": options["columnar"],
+                "extraction": report.get("extraction"),
+            },
+            "rows": rows,
+            "documents": sum(stats.get("documents", 0) for stats in file_stats),
+            "seconds": round(seconds, 3),
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+            # 태깅(extract) 대 I/O(CSV 읽기 + DB 쓰기) 시간 비교
+            "stage_seconds": stages,
+            "tagging_seconds": stages["extract"],
+            "io_seconds": round(stages["read"] + stages["write"], 4),
+            "memory": {
+                "peak_traced_mb": peak_traced,
+                "max_rss_mb": _max_rss_mb(),
+            },
+            "pipeline": report.get("pipeline"),
+            # 저장된 ImFiles 문서의 BSON 크기 합계 (명사 저장 형식 비교용)
+            "imfiles_bytes": sum(len(bson.encode(document))
+                                 for document in client[DB_NAME][RECORD_NOUNS_COLLECTION].find({})),
+            "noun_storage": report.get("noun_storage"),
+            "dedup": report.get("dedup"),
+            "mongo_write_latency": _latency_summary(client.write_latencies()),
+        }
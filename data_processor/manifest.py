@@ -0,0 +1,148 @@
+# data_processor/manifest.py
+
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+import hashlib
+import os
+import uuid
+
+from .constants import WORKER_NAME, DB_FIELD_GENERATION
+
+
+# ----------------------------------------------------------------------
+# 파일 지문 (크기, 수정 시각, 내용 해시)
+# ----------------------------------------------------------------------
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def check_file_unchanged(previous: Optional[dict], file_path: str) -> Tuple[bool, dict]:
+    """
+    이전 매니페스트와 비교하여 (변경 없음 여부, 현재 지문)을 반환합니다.
+    크기와 수정 시각이 같으면 해시 계산 없이 변경 없음으로 판단하고,
+    수정 시각만 바뀐 경우에는 해시를 비교하여 내용이 같으면 변경 없음으로 봅니다.
+    """
+    stat = os.stat(file_path)
+    fingerprint = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime") == stat.st_mtime:
+        fingerprint["sha256"] = previous.get("sha256")
+        return True, fingerprint
+
+    fingerprint["sha256"] = file_sha256(file_path)
+    unchanged = bool(previous) and previous.get("sha256") == fingerprint["sha256"]
+    return unchanged, fingerprint
+
+
+# ----------------------------------------------------------------------
+# 매니페스트 컬렉션 (worker_name + source_file 당 문서 1개)
+# ----------------------------------------------------------------------
+
+def _manifest_id(source_file: str) -> str:
+    return f"{WORKER_NAME}:{source_file}"
+
+
+def load_manifest(manifest_collection, source_file: str) -> Optional[dict]:
+    return manifest_collection.find_one({"_id": _manifest_id(source_file)})
+
+
+def save_manifest(manifest_collection, source_file: str, fingerprint: dict,
+                  document_count: int, generation: str):
+    manifest_collection.replace_one(
+        {"_id": _manifest_id(source_file)},
+        {
+            "worker_name": WORKER_NAME,
+            "source_file": source_file,
+            "size": fingerprint["size"],
+            "mtime": fingerprint["mtime"],
+            "sha256": fingerprint["sha256"],
+            "document_count": document_count,
+            DB_FIELD_GENERATION: generation,
+            "updated_at": datetime.now(timezone.utc),
+        },
+        upsert=True,
+    )
+
+
+def touch_manifest(manifest_collection, source_file: str, fingerprint: dict):
+    """내용은 같고 수정 시각만 바뀐 경우, 다음 비교에서 해시를 다시 계산하지 않도록 지문만 갱신합니다."""
+    manifest_collection.update_one(
+        {"_id": _manifest_id(source_file)},
+        {"$set": {"size": fingerprint["size"], "mtime": fingerprint["mtime"]}},
+    )
+
+
+# ----------------------------------------------------------------------
+# 체크포인트 (적재 중인 파일의 마지막 저장 배치, worker_name + source_file 당 문서 1개)
+# ----------------------------------------------------------------------
+
+def load_checkpoint(checkpoint_collection, source_file: str) -> Optional[dict]:
+    return checkpoint_collection.find_one({"_id": _manifest_id(source_file)})
+
+
+def save_checkpoint(checkpoint_collection, source_file: str, sha256: str, generation: str,
+                    rows_committed: int, batch_id: int, document_count: int):
+    """
+    배치 하나가 저장될 때마다 호출합니다. rows_committed 이전 행의 문서는 모두 저장되었음을 뜻하며,
+    중단 후 같은 내용(sha256)의 파일을 다시 적재하면 같은 회차로 이 행부터 이어서 처리합니다.
+    """
+    checkpoint_collection.update_one(
+        {"_id": _manifest_id(source_file)},
+        {"$set": {
+            "worker_name": WORKER_NAME,
+            "source_file": source_file,
+            "sha256": sha256,
+            DB_FIELD_GENERATION: generation,
+            "rows_committed": rows_committed,
+            "batch_id": batch_id,
+            "document_count": document_count,
+            "updated_at": datetime.now(timezone.utc),
+        }},
+        upsert=True,
+    )
+
+
+def clear_checkpoint(checkpoint_collection, source_file: str):
+    checkpoint_collection.delete_one({"_id": _manifest_id(source_file)})
+
+
+# ----------------------------------------------------------------------
+# 적재 회차(generation) 단위 교체
+# ----------------------------------------------------------------------
+
+def new_generation() -> str:
+    return uuid.uuid4().hex
+
+
+def _generation_query(source_file: str, worker_name: Optional[str]) -> dict:
+    query = {"source_file": source_file}
+    if worker_name is not None:
+        query["worker_name"] = worker_name
+    return query
+
+
+def replace_previous_generations(collection, source_file: str, generation: str,
+                                 worker_name: Optional[str] = WORKER_NAME) -> int:
+    """
+    새 회차 적재가 끝난 뒤, 같은 파일의 이전 회차 문서(매니페스트 도입 전 문서 포함)를 삭제합니다.
+    worker_name=None이면 어느 워커가 적재했든 모두 대상으로 합니다. (샤드 큐 방식)
+    """
+    query = _generation_query(source_file, worker_name)
+    query[DB_FIELD_GENERATION] = {"$ne": generation}
+    return collection.delete_many(query).deleted_count
+
+
+def discard_generation(collection, source_file: str, generation: str,
+                       worker_name: Optional[str] = WORKER_NAME) -> int:
+    """적재 도중 실패한 회차의 문서를 지워 이전 회차 데이터만 남깁니다."""
+    query = _generation_query(source_file, worker_name)
+    query[DB_FIELD_GENERATION] = generation
+    return collection.delete_many(query).deleted_count
@@ -0,0 +1,288 @@
+# data_processor/memory_store.py
+#
+# 벤치마크/테스트용 인메모리 MongoDB 대체 구현입니다.
+# importer가 사용하는 pymongo API의 일부(insert/find/update/delete, 간단한 쿼리 연산자)만 흉내 냅니다.
+# write_latency_ms로 네트워크 왕복 지연을 흉내 낼 수 있고, 쓰기 호출마다 지연 시간을 기록합니다.
+
+from collections import OrderedDict
+from types import SimpleNamespace
+from typing import Dict, List
+import copy
+import threading
+import time
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+_MISSING = object()
+
+
+def _get_field(document: dict, path: str):
+    value = document
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _match_value(value, condition) -> bool:
+    if isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+        for operator, operand in condition.items():
+            present = value is not _MISSING
+            if operator == '$ne' and present and value == operand:
+                return False
+            if operator == '$in' and not (present and value in operand):
+                return False
+            if operator == '$nin' and present and value in operand:
+                return False
+            if operator == '$exists' and present != bool(operand):
+                return False
+            if operator in ('$lt', '$lte', '$gt', '$gte'):
+                if not present or value is None:
+                    return False
+                if operator == '$lt' and not value < operand:
+                    return False
+                if operator == '$lte' and not value <= operand:
+                    return False
+                if operator == '$gt' and not value > operand:
+                    return False
+                if operator == '$gte' and not value >= operand:
+                    return False
+        return True
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return (None if value is _MISSING else value) == condition
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for key, condition in (query or {}).items():
+        if key == '$or':
+            if not any(_matches(document, sub) for sub in condition):
+                return False
+        elif key == '$and':
+            if not all(_matches(document, sub) for sub in condition):
+                return False
+        elif not _match_value(_get_field(document, key), condition):
+            return False
+    return True
+
+
+def _apply_update(document: dict, update: dict, inserting: bool = False):
+    for operator, fields in update.items():
+        if operator == '$set' or (operator == '$setOnInsert' and inserting):
+            for key, value in fields.items():
+                document[key] = copy.deepcopy(value)
+        elif operator == '$inc':
+            for key, value in fields.items():
+                document[key] = document.get(key, 0) + value
+        elif operator == '$unset':
+            for key in fields:
+                document.pop(key, None)
+        elif operator == '$max':
+            for key, value in fields.items():
+                if key not in document or document[key] < value:
+                    document[key] = value
+
+
+def _project(document: dict, projection: dict) -> dict:
+    if not projection:
+        return copy.deepcopy(document)
+    included = {key for key, flag in projection.items() if flag}
+    if included:
+        result = {key: copy.deepcopy(document[key]) for key in included if key in document}
+        if projection.get('_id', 1) and '_id' in document:
+            result['_id'] = document['_id']
+        return result
+    return {key: copy.deepcopy(value) for key, value in document.items() if key not in projection}
+
+
+class InMemoryCollection:
+    """pymongo Collection의 일부 API를 흉내 내는 인메모리 컬렉션입니다."""
+
+    def __init__(self, name: str, write_latency_ms: float = 0.0):
+        self.name = name
+        self.write_latency_ms = write_latency_ms
+        self.write_latencies: List[float] = []
+        self.indexes: List[tuple] = []
+        self._documents: "OrderedDict[object, dict]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    # -- 내부 도우미 -------------------------------------------------------
+    def _write_call(self, started: float):
+        if self.write_latency_ms:
+            time.sleep(self.write_latency_ms / 1000.0)
+        self.write_latencies.append(time.perf_counter() - started)
+
+    def _insert(self, document: dict):
+        document.setdefault('_id', ObjectId())
+        if document['_id'] in self._documents:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} _id: {document['_id']}",
+                                    11000)
+        self._documents[document['_id']] = copy.deepcopy(document)
+
+    # -- 쓰기 ---------------------------------------------------------------
+    def insert_one(self, document: dict, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            self._insert(document)
+        self._write_call(started)
+        return SimpleNamespace(inserted_id=document['_id'], acknowledged=True)
+
+    def insert_many(self, documents, ordered: bool = True, **kwargs):
+        started = time.perf_counter()
+        inserted, errors = [], []
+        with self._lock:
+            for index, document in enumerate(documents):
+                try:
+                    self._insert(document)
+                    inserted.append(document['_id'])
+                except DuplicateKeyError as e:
+                    errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                    if ordered:
+                        break
+        self._write_call(started)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(inserted), "writeConcernErrors": [],
+                                  "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []})
+        return SimpleNamespace(inserted_ids=inserted, acknowledged=True)
+
+    def replace_one(self, query: dict, replacement: dict, upsert: bool = False, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            target = next((doc for doc in self._documents.values() if _matches(doc, query)), None)
+            if target is not None:
+                new_document = copy.deepcopy(replacement)
+                new_document['_id'] = target['_id']
+                self._documents[target['_id']] = new_document
+            elif upsert:
+                new_document = copy.deepcopy(replacement)
+                if '_id' in query and not isinstance(query['_id'], dict):
+                    new_document.setdefault('_id', query['_id'])
+                self._insert(new_document)
+        self._write_call(started)
+        return SimpleNamespace(matched_count=int(target is not None), modified_count=int(target is not None))
+
+    def update_one(self, query: dict, update: dict, upsert: bool = False, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            target = next((doc for doc in self._documents.values() if _matches(doc, query)), None)
+            if target is not None:
+                _apply_update(target, update)
+            elif upsert:
+                new_document = {key: value for key, value in query.items() if not isinstance(value, dict)}
+                _apply_update(new_document, update, inserting=True)
+                self._insert(new_document)
+        self._write_call(started)
+        return SimpleNamespace(matched_count=int(target is not None), modified_count=int(target is not None))
+
+    def update_many(self, query: dict, update: dict, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            targets = [doc for doc in self._documents.values() if _matches(doc, query)]
+            for target in targets:
+                _apply_update(target, update)
+        self._write_call(started)
+        return SimpleNamespace(matched_count=len(targets), modified_count=len(targets))
+
+    def find_one_and_update(self, query: dict, update: dict, upsert: bool = False, sort=None,
+                            return_document=False, **kwargs):
+        """return_document가 참(ReturnDocument.AFTER)이면 갱신 후 문서를, 아니면 갱신 전 문서를 반환합니다."""
+        started = time.perf_counter()
+        with self._lock:
+            candidates = [doc for doc in self._documents.values() if _matches(doc, query)]
+            for key, direction in reversed(sort or []):
+                candidates.sort(key=lambda doc: (doc.get(key) is None, doc.get(key)), reverse=direction < 0)
+            target = candidates[0] if candidates else None
+            before = copy.deepcopy(target)
+            if target is not None:
+                _apply_update(target, update)
+            elif upsert:
+                target = {key: value for key, value in query.items() if not isinstance(value, dict)}
+                _apply_update(target, update, inserting=True)
+                self._insert(target)
+                target = self._documents[target['_id']]
+        self._write_call(started)
+        if return_document:
+            return copy.deepcopy(target)
+        return before
+
+    def delete_many(self, query: dict, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            doomed = [key for key, doc in self._documents.items() if _matches(doc, query)]
+            for key in doomed:
+                del self._documents[key]
+        self._write_call(started)
+        return SimpleNamespace(deleted_count=len(doomed))
+
+    def delete_one(self, query: dict, **kwargs):
+        started = time.perf_counter()
+        with self._lock:
+            doomed = next((key for key, doc in self._documents.items() if _matches(doc, query)), None)
+            if doomed is not None:
+                del self._documents[doomed]
+        self._write_call(started)
+        return SimpleNamespace(deleted_count=int(doomed is not None))
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append((keys, kwargs))
+        return kwargs.get('name') or '_'.join(f"{key}_{direction}" for key, direction in keys)
+
+    def create_indexes(self, models):
+        return [self.create_index(model.document['key'].items(), name=model.document.get('name'))
+                for model in models]
+
+    # -- 읽기 ---------------------------------------------------------------
+    def find(self, query: dict = None, projection: dict = None, **kwargs) -> List[dict]:
+        with self._lock:
+            return [_project(doc, projection) for doc in self._documents.values() if _matches(doc, query)]
+
+    def find_one(self, query: dict = None, projection: dict = None, **kwargs):
+        with self._lock:
+            for doc in self._documents.values():
+                if _matches(doc, query):
+                    return _project(doc, projection)
+        return None
+
+    def count_documents(self, query: dict = None, **kwargs) -> int:
+        with self._lock:
+            return sum(1 for doc in self._documents.values() if _matches(doc, query))
+
+
+class InMemoryDatabase:
+    def __init__(self, name: str, write_latency_ms: float = 0.0):
+        self.name = name
+        self.write_latency_ms = write_latency_ms
+        self._collections: Dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(name, self.write_latency_ms)
+        return self._collections[name]
+
+    def list_collection_names(self) -> List[str]:
+        return list(self._collections)
+
+
+class InMemoryClient:
+    """MongoClient 대신 importer에 주입하는 인메모리 클라이언트입니다."""
+
+    def __init__(self, write_latency_ms: float = 0.0):
+        self.write_latency_ms = write_latency_ms
+        self._databases: Dict[str, InMemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = InMemoryDatabase(name, self.write_latency_ms)
+        return self._databases[name]
+
+    def get_database(self, name: str) -> InMemoryDatabase:
+        return self[name]
+
+    def write_latencies(self) -> List[float]:
+        return [latency for db in self._databases.values()
+                for collection in db._collections.values() for latency in collection.write_latencies]
+
+    def close(self):
+        pass
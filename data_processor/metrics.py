@@ -0,0 +1,291 @@
+# data_processor/metrics.py
+#
+# 워커 프로세스 전역 지표 레지스트리와 Prometheus 텍스트 형식(0.0.4) 출력입니다. (GET /metrics)
+# 태깅은 프로세스 풀에서 실행되지만 청크 통계가 부모 프로세스로 돌아오므로 지표는 모두 부모 프로세스에서 기록합니다.
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import bisect
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_INF = float('inf')
+
+
+def _format_value(value: float) -> str:
+    if value == _INF:
+        return '+Inf'
+    if float(value).is_integer():
+        return f"{value:.1f}"
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: 레이블 {self.labelnames}가 필요합니다. (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """
+    단조 증가 값. rows/sec 같은 비율은 Prometheus에서 rate()로 계산합니다.
+    function을 주면 스크레이프할 때마다 호출하여 누적값을 읽습니다. (레이블 없는 카운터만, 예: 프로세스 CPU 시간)
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 function: Callable[[], Optional[float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._function = function
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        if self._function is not None:
+            value = self._function()
+            return [] if value is None else [(self.name, '', value)]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값. function을 주면 스크레이프할 때마다 호출하여 값을 읽습니다. (레이블 없는 게이지만)"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 function: Callable[[], Optional[float]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._function = function
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        if self._function is not None:
+            value = self._function()
+            return [] if value is None else [(self.name, '', value)]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램. observe(value, count)로 같은 값 count개를 한 번에 기록할 수 있습니다."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, count: int = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state["buckets"][index] += count
+            state["sum"] += value * count
+            state["count"] += count
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state["count"] if state else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((key, dict(state, buckets=list(state["buckets"]))) for key, state in self._values.items())
+        samples = []
+        for key, state in items:
+            cumulative = 0
+            for bound, observed in zip(self.buckets, state["buckets"]):
+                cumulative += observed
+                samples.append((f"{self.name}_bucket",
+                                _format_labels(self.labelnames, key, (("le", _format_value(bound)),)), cumulative))
+            samples.append((f"{self.name}_bucket",
+                            _format_labels(self.labelnames, key, (("le", "+Inf"),)), state["count"]))
+            samples.append((f"{self.name}_sum", _format_labels(self.labelnames, key), state["sum"]))
+            samples.append((f"{self.name}_count", _format_labels(self.labelnames, key), state["count"]))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self._metrics.values()) + '\n'
+
+
+REGISTRY = Registry()
+
+
+# ----------------------------------------------------------------------
+# 프로세스 지표
+# ----------------------------------------------------------------------
+
+def process_rss_bytes() -> Optional[float]:
+    """현재 RSS(바이트). /proc이 없으면 최대 RSS(ru_maxrss)로 대신합니다."""
+    try:
+        with open('/proc/self/statm') as f:
+            return float(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # Linux는 KB, macOS는 바이트 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return float(rss if os.uname().sysname == 'Darwin' else rss * 1024)
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+# ----------------------------------------------------------------------
+# 워커 지표 정의
+# ----------------------------------------------------------------------
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "worker_import_stage_seconds", "청크/배치 하나의 스테이지별 처리 시간 (read=CSV 파싱, build=문서 생성, "
+    "dedup=중복 기사 판별, extract=태깅, write=Mongo 저장)", ["stage"],
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60),
+))
+ARTICLE_TAGGING_SECONDS = REGISTRY.register(Histogram(
+    "worker_tagging_article_seconds", "기사 하나의 태깅 시간 (태깅 청크 시간 / 청크 기사 수, 캐시 적중 제외)",
+    buckets=(.0001, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1),
+))
+MONGO_WRITE_SECONDS = REGISTRY.register(Histogram(
+    "worker_mongo_batch_write_seconds", "insert_many 배치 하나의 저장 시간", ["collection"],
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10),
+))
+ROWS_TOTAL = REGISTRY.register(Counter(
+    "worker_import_rows_total", "처리한 CSV 행 수 (rate()로 rows/sec)",
+))
+DOCUMENTS_TOTAL = REGISTRY.register(Counter(
+    "worker_import_documents_total", "ImFiles에 저장한 문서 수",
+))
+DUPLICATES_TOTAL = REGISTRY.register(Counter(
+    "worker_import_duplicate_documents_total", "재시도된 배치에서 이미 저장되어 있어 건너뛴 문서 수",
+))
+DUPLICATE_ARTICLES_TOTAL = REGISTRY.register(Counter(
+    "worker_duplicate_articles_total", "태깅 전에 중복으로 판별되어 명사를 재사용한 기사 수 (kind: exact/near/reused)", ["kind"],
+))
+ROWS_PER_SECOND = REGISTRY.register(Gauge(
+    "worker_import_rows_per_second", "마지막으로 끝난 파일(샤드)의 처리 속도",
+))
+ERRORS_TOTAL = REGISTRY.register(Counter(
+    "worker_errors_total", "종류별 오류 수 (tagging, file_not_found, file, shard, lease_lost, mongo_connection, "
+    "mongo_write, noun_cache, fatal, job, warmup)", ["kind"],
+))
+NOUN_CACHE_TOTAL = REGISTRY.register(Counter(
+    "worker_noun_cache_lookups_total", "명사 캐시 조회 결과", ["result"],
+))
+REBUILD_JOBS_TOTAL = REGISTRY.register(Counter(
+    "worker_rebuild_jobs_total", "종료된 Rebuild 작업 수", ["state"],
+))
+REBUILD_JOB_SECONDS = REGISTRY.register(Histogram(
+    "worker_rebuild_job_seconds", "Rebuild 작업 하나의 전체 소요 시간",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+))
+REBUILD_IN_PROGRESS = REGISTRY.register(Gauge(
+    "worker_rebuild_in_progress", "실행 중인 Rebuild 작업 수",
+))
+WORKER_READY = REGISTRY.register(Gauge(
+    "worker_ready", "서버 예열이 끝나 요청을 처리할 수 있으면 1 (GET /healthz와 같은 상태)",
+))
+PROCESS_RSS = REGISTRY.register(Gauge(
+    "worker_process_resident_memory_bytes", "워커 프로세스의 RSS", function=process_rss_bytes,
+))
+PROCESS_CPU = REGISTRY.register(Counter(
+    "worker_process_cpu_seconds_total", "워커 프로세스가 사용한 CPU 시간 (user + system)", function=_cpu_seconds,
+))
+
+
+def record_error(kind: str, amount: int = 1):
+    if amount:
+        ERRORS_TOTAL.inc(amount, kind=kind)
+
+
+@contextmanager
+def stage_timer(stage: str, stats: dict = None):
+    """
+    스테이지 하나의 실행 시간을 재어 히스토그램에 기록하고, stats를 넘기면 stats[f"{stage}_seconds"]에도 더합니다.
+    stats 갱신은 잠금 없이 더하므로, 스레드마다(파이프라인 스테이지마다) 자기 stats 딕셔너리를 넘겨야 합니다.
+    사용: with stage_timer("read", stats): df = next(reader, None)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if stats is not None:
+            stats[f"{stage}_seconds"] += elapsed
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,131 @@
+# data_processor/noun_cache.py
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from .constants import (
+    WORKER_NAME, EXCLUDE_NOUNS,
+    NOUN_CACHE_PATH, NOUN_CACHE_MAX_ENTRIES,
+)
+from .metrics import record_error
+
+# SQLite 한 쿼리에 넣는 키 개수 (바인딩 변수 제한 999 이하)
+_LOOKUP_BATCH = 500
+
+
+def cache_salt(tagger_version: str) -> str:
+    """제외 목록과 태거 버전이 바뀌면 기존 캐시 항목이 자동으로 무효화되도록 키에 섞을 값을 만듭니다."""
+    exclude = ','.join(sorted(EXCLUDE_NOUNS))
+    return hashlib.sha256(f"{tagger_version}|{exclude}".encode('utf-8')).hexdigest()[:16]
+
+
+class NounCache:
+    """
+    (제목 + 본문) 해시 → 추출된 명사 리스트를 저장하는 디스크 캐시입니다.
+    키에는 EXCLUDE_NOUNS와 태거 버전이 포함되며, max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, tagger_version: str, path: str = NOUN_CACHE_PATH,
+                 max_entries: int = NOUN_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.salt = cache_salt(tagger_version)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS nouns ("
+            " key TEXT PRIMARY KEY, nouns TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS nouns_last_used ON nouns (last_used)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM nouns").fetchone()[0]
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.salt}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[int, List[str]]:
+        """texts 중 캐시에 있는 항목을 {인덱스: 명사 리스트}로 반환하고 사용 시각을 갱신합니다."""
+        keys = [self.key(text) for text in texts]
+        found: Dict[str, List[str]] = {}
+
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), _LOOKUP_BATCH):
+                batch = unique_keys[i:i + _LOOKUP_BATCH]
+                placeholders = ','.join('?' * len(batch))
+                for key, nouns in self._conn.execute(
+                        f"SELECT key, nouns FROM nouns WHERE key IN ({placeholders})", batch):
+                    found[key] = json.loads(nouns)
+
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE nouns SET last_used = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+
+        results = {i: found[key] for i, key in enumerate(keys) if key in found}
+        self.hits += len(results)
+        self.misses += len(texts) - len(results)
+        return results
+
+    def put_many(self, items: Iterable[Tuple[str, List[str]]]):
+        """(텍스트, 명사 리스트) 쌍을 저장하고, 최대 항목 수를 넘으면 오래된 항목을 제거합니다."""
+        now = time.time()
+        rows = [(self.key(text), json.dumps(nouns, ensure_ascii=False), now) for text, nouns in items]
+        if not rows:
+            return
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO nouns (key, nouns, last_used) VALUES (?, ?, ?)", rows)
+            self._entries += self._conn.total_changes - before
+
+            excess = self._entries - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM nouns WHERE key IN (SELECT key FROM nouns ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._entries -= excess
+                self.evictions += excess
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_noun_cache(tagger_version: str) -> Optional[NounCache]:
+    """캐시를 엽니다. 파일을 만들 수 없는 환경이면 캐시 없이 진행하도록 None을 반환합니다."""
+    try:
+        return NounCache(tagger_version)
+    except Exception as e:
+        print(f"[{WORKER_NAME}] ⚠️ 명사 캐시를 열 수 없어 캐시 없이 진행합니다: {e}", file=sys.stderr)
+        record_error("noun_cache")
+        return None
@@ -0,0 +1,152 @@
+# data_processor/parallel.py
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Tuple
+import os
+import sys
+import time
+
+from .constants import (
+    WORKER_NAME,
+    NOUN_EXTRACT_MODE, NOUN_EXTRACT_WORKERS, NOUN_EXTRACT_CHUNK_SIZE,
+)
+
+
+# ----------------------------------------------------------------------
+# 워커 프로세스에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 정의)
+# ----------------------------------------------------------------------
+
+def _extract_chunk(extract_func: Callable, chunk_index: int, texts: List[str],
+                   batch: bool = False) -> Tuple[int, list, float, int, str]:
+    """
+    하나의 청크를 태깅하고 (청크 번호, 결과, 소요 시간, PID, 첫 오류 메시지)를 반환합니다.
+    batch=True이면 extract_func에 청크 전체를 한 번에 넘기고, 실패하면 기사 단위로 다시 처리해 오류를 격리합니다.
+    태깅에 실패한 기사는 결과가 None입니다.
+    """
+    start = time.perf_counter()
+    if batch:
+        try:
+            results = extract_func(texts)
+            return chunk_index, results, time.perf_counter() - start, os.getpid(), None
+        except Exception:
+            extract_func = _SingleTextAdapter(extract_func)
+
+    results = []
+    first_error = None
+    for text in texts:
+        try:
+            results.append(extract_func(text))
+        except Exception as e:
+            results.append(None)
+            first_error = first_error or str(e)
+    return chunk_index, results, time.perf_counter() - start, os.getpid(), first_error
+
+
+class _SingleTextAdapter:
+    """일괄 추출 함수를 기사 하나씩 호출하는 함수로 감쌉니다."""
+
+    def __init__(self, batch_func: Callable):
+        self.batch_func = batch_func
+
+    def __call__(self, text):
+        return self.batch_func([text])[0]
+
+
+# ----------------------------------------------------------------------
+# 고유 명사 추출 엔진
+# ----------------------------------------------------------------------
+
+class NounExtractionEngine:
+    """
+    기사 텍스트 목록을 청크로 나누어 고유 명사를 추출합니다.
+    'process' 모드는 프로세스 풀로 병렬 처리하고, 'serial' 모드(또는 워커 1개)는 현재 프로세스에서 순차 처리합니다.
+    결과는 항상 입력 순서를 유지합니다. cache(NounCache)를 넘기면 캐시에 없는 기사만 태깅합니다.
+    batch=True이면 extract_func는 텍스트 리스트를 받아 명사 리스트 목록을 돌려주는 일괄 함수입니다.
+    """
+
+    def __init__(self, extract_func: Callable, mode: str = NOUN_EXTRACT_MODE,
+                 workers: int = NOUN_EXTRACT_WORKERS, chunk_size: int = NOUN_EXTRACT_CHUNK_SIZE,
+                 cache=None, batch: bool = False):
+        self.extract_func = extract_func
+        self.batch = batch
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.mode = 'serial' if mode != 'process' or self.workers == 1 else 'process'
+        self._pool = None
+
+    def __enter__(self):
+        if self.mode == 'process':
+            try:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            except Exception as e:
+                # 프로세스 생성이 불가능한 환경에서는 순차 경로로 대체
+                print(f"[{WORKER_NAME}] ⚠️ 프로세스 풀 생성 실패, 순차 처리로 전환: {e}", file=sys.stderr)
+                self.mode = 'serial'
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def describe(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.mode == 'process' else 1,
+            "chunk_size": self.chunk_size,
+        }
+
+    def extract(self, texts: List[str]) -> Tuple[List[List[str]], List[dict]]:
+        """
+        texts와 같은 순서의 명사 리스트와, 청크별 처리 통계(행 수, 소요 시간, 처리 속도, PID)를 반환합니다.
+        캐시에 있는 기사는 태깅하지 않으며, 청크 통계는 실제로 태깅한 기사만 집계합니다.
+        """
+        cached = self.cache.get_many(texts) if self.cache is not None else {}
+        missing = [i for i in range(len(texts)) if i not in cached]
+        tagged, chunk_stats = self._tag([texts[i] for i in missing])
+
+        if self.cache is not None:
+            # 태깅에 실패한(None) 기사는 캐시에 남기지 않습니다.
+            self.cache.put_many((texts[i], nouns) for i, nouns in zip(missing, tagged) if nouns is not None)
+
+        results: List[List[str]] = [None] * len(texts)
+        for i, nouns in cached.items():
+            results[i] = nouns
+        for i, nouns in zip(missing, tagged):
+            results[i] = nouns if nouns is not None else []
+        return results, chunk_stats
+
+    def _tag(self, texts: List[str]) -> Tuple[list, List[dict]]:
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+
+        if self.mode == 'process' and self._pool is not None and len(chunks) > 1:
+            outputs = self._pool.map(
+                _extract_chunk,
+                [self.extract_func] * len(chunks), range(len(chunks)), chunks, [self.batch] * len(chunks),
+            )
+        else:
+            outputs = (_extract_chunk(self.extract_func, i, chunk, self.batch) for i, chunk in enumerate(chunks))
+
+        results = []
+        chunk_stats: List[dict] = []
+        # map()은 제출 순서대로 결과를 돌려주므로 행 순서가 보존됩니다.
+        for chunk_index, chunk_results, elapsed, pid, first_error in outputs:
+            errors = sum(1 for nouns in chunk_results if nouns is None)
+            if errors:
+                print(f"ERROR: 태깅 청크 {chunk_index}에서 {errors}건 처리 중 오류 발생: {first_error}")
+            results.extend(chunk_results)
+            chunk_stats.append({
+                "chunk": chunk_index,
+                "rows": len(chunk_results),
+                "errors": errors,
+                "seconds": round(elapsed, 4),
+                "rows_per_sec": round(len(chunk_results) / elapsed, 1) if elapsed > 0 else None,
+                "pid": pid,
+            })
+
+        return results, chunk_stats
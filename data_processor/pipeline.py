@@ -0,0 +1,254 @@
+# data_processor/pipeline.py
+
+from queue import Empty, Full, Queue
+from typing import Callable, Iterable, Iterator, List, Optional
+import threading
+import time
+
+from .constants import IMPORT_PIPELINE_QUEUE_DEPTH
+
+# 스테이지 이름
+STAGE_READ = 'read'
+STAGE_TAG = 'tag'
+STAGE_WRITE = 'write'
+
+_END = object()             # 상류 스테이지가 끝났음을 알리는 표식
+_POLL_INTERVAL = 0.1        # 다른 스테이지의 실패를 확인하는 주기 (초)
+
+
+class _StageStats:
+    """스테이지 하나의 작업(busy) 시간, 입력 대기(idle) 시간, 하류가 가득 차서 막힌(blocked) 시간."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.idle = 0.0
+        self.blocked = 0.0
+
+    def to_dict(self, elapsed: float) -> dict:
+        return {
+            "items": self.items,
+            "busy_seconds": round(self.busy, 4),
+            "idle_seconds": round(self.idle, 4),
+            "blocked_seconds": round(self.blocked, 4),
+            "utilization": round(self.busy / elapsed, 4) if elapsed > 0 else None,
+        }
+
+
+class _BoundedQueue:
+    """
+    크기 제한 큐와 깊이 샘플. 가득 차면 put이 기다리므로 상류 스테이지가 하류보다 앞서 메모리를 쌓지 않습니다.
+    다른 스테이지가 실패하면(stop 이벤트) 대기를 멈춥니다.
+    """
+
+    def __init__(self, name: str, depth: int, stop: threading.Event):
+        self.name = name
+        self.depth = depth
+        self._queue = Queue(maxsize=depth)
+        self._stop = stop
+        self._samples = 0
+        self._depth_total = 0
+        self._depth_max = 0
+
+    def put(self, item, stats: _StageStats):
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                break
+            except Full:
+                continue
+        stats.blocked += time.perf_counter() - started
+        depth = self._queue.qsize()
+        self._samples += 1
+        self._depth_total += depth
+        self._depth_max = max(self._depth_max, depth)
+
+    def get(self, stats: _StageStats):
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return self._queue.get(timeout=_POLL_INTERVAL)
+                except Empty:
+                    continue
+            return _END
+        finally:
+            stats.idle += time.perf_counter() - started
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.depth,
+            "max_depth": self._depth_max,
+            "avg_depth": round(self._depth_total / self._samples, 2) if self._samples else 0.0,
+        }
+
+
+class StagedPipeline:
+    """
+    읽기 → 태깅 → 쓰기 3단계를 겹쳐 실행합니다.
+      - 읽기 스레드: produce 이터레이터에서 항목을 꺼내 태깅 큐에 넣음 (CSV 파싱, 문서 필드 계산)
+      - 태깅(호출 스레드): process(항목)이 돌려준 쓰기 배치들을 쓰기 큐에 넣음 (프로세스 풀 태깅은 GIL을 잡지 않음)
+      - 쓰기 스레드: consume(배치)로 DB에 저장 (네트워크 왕복 동안 다음 청크 태깅이 진행됨)
+    큐는 depth 크기로 제한되어 가장 느린 스테이지 속도에 맞춰집니다(backpressure).
+    depth가 0이면 세 단계를 호출 스레드에서 차례로 실행합니다. (비교용)
+    """
+
+    def __init__(self, depth: int = IMPORT_PIPELINE_QUEUE_DEPTH):
+        self.depth = max(0, depth)
+        self.stats = {name: _StageStats(name) for name in (STAGE_READ, STAGE_TAG, STAGE_WRITE)}
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._queues: List[_BoundedQueue] = []
+        self._elapsed = 0.0
+
+    def _fail(self, error: BaseException):
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def run(self, produce: Iterator, process: Callable[[object], Iterable[list]],
+            consume: Callable[[list], None], finish: Callable[[], Iterable[list]] = None):
+        """
+        produce가 끝날 때까지 세 스테이지를 실행합니다. finish()는 마지막에 남은 쓰기 배치를 돌려줍니다.
+        어느 스테이지에서든 예외가 나면 나머지 스테이지를 멈추고 그 예외를 다시 발생시킵니다.
+        """
+        started = time.perf_counter()
+        try:
+            if self.depth == 0:
+                self._run_serial(produce, process, consume, finish)
+            else:
+                self._run_overlapped(produce, process, consume, finish)
+        finally:
+            self._elapsed = time.perf_counter() - started
+        if self._error is not None:
+            raise self._error
+
+    def _timed_next(self, produce: Iterator):
+        read = self.stats[STAGE_READ]
+        started = time.perf_counter()
+        item = next(produce, _END)
+        read.busy += time.perf_counter() - started
+        if item is not _END:
+            read.items += 1
+        return item
+
+    def _timed_call(self, stage: str, func: Callable, *args):
+        stats = self.stats[stage]
+        started = time.perf_counter()
+        result = func(*args)
+        stats.busy += time.perf_counter() - started
+        stats.items += 1
+        return result
+
+    def _run_serial(self, produce, process, consume, finish):
+        try:
+            while True:
+                item = self._timed_next(produce)
+                if item is _END:
+                    break
+                for batch in self._timed_call(STAGE_TAG, process, item):
+                    self._timed_call(STAGE_WRITE, consume, batch)
+            for batch in (finish() if finish else ()):
+                self._timed_call(STAGE_WRITE, consume, batch)
+        except BaseException as e:
+            self._fail(e)
+
+    def _run_overlapped(self, produce, process, consume, finish):
+        to_tag = _BoundedQueue("read_to_tag", self.depth, self._stop)
+        to_write = _BoundedQueue("tag_to_write", self.depth, self._stop)
+        self._queues = [to_tag, to_write]
+
+        def reader():
+            try:
+                while not self._stop.is_set():
+                    item = self._timed_next(produce)
+                    if item is _END:
+                        break
+                    to_tag.put(item, self.stats[STAGE_READ])
+            except BaseException as e:
+                self._fail(e)
+            finally:
+                to_tag.put(_END, self.stats[STAGE_READ])
+
+        def writer():
+            try:
+                while True:
+                    batch = to_write.get(self.stats[STAGE_WRITE])
+                    if batch is _END:
+                        break
+                    self._timed_call(STAGE_WRITE, consume, batch)
+            except BaseException as e:
+                self._fail(e)
+
+        threads = [threading.Thread(target=reader, name="import-reader", daemon=True),
+                   threading.Thread(target=writer, name="import-writer", daemon=True)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = to_tag.get(self.stats[STAGE_TAG])
+                if item is _END:
+                    break
+                for batch in self._timed_call(STAGE_TAG, process, item):
+                    to_write.put(batch, self.stats[STAGE_TAG])
+            if not self._stop.is_set():
+                for batch in (finish() if finish else ()):
+                    to_write.put(batch, self.stats[STAGE_TAG])
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            to_write.put(_END, self.stats[STAGE_TAG])
+            for thread in threads:
+                thread.join()
+
+    def describe(self) -> dict:
+        """스테이지별 사용률과 큐 깊이, 사용률이 가장 높은 스테이지(병목)를 반환합니다."""
+        stages = {name: stats.to_dict(self._elapsed) for name, stats in self.stats.items()}
+        return {
+            "overlapped": self.depth > 0,
+            "seconds": round(self._elapsed, 4),
+            "stages": stages,
+            "queues": {queue.name: queue.to_dict() for queue in self._queues},
+            "bottleneck": max(stages, key=lambda name: stages[name]["busy_seconds"]),
+        }
+
+
+def merge_pipeline_stats(descriptions: Iterable[Optional[dict]]) -> Optional[dict]:
+    """
+    여러 파일(샤드)의 describe() 결과를 합칩니다. 시간과 항목 수는 더하고, 큐 깊이는 최대값과 평균의 평균을 씁니다.
+    합친 결과를 다시 합쳐도 같은 형식이므로 샤드가 끝날 때마다 누적할 수 있습니다.
+    """
+    descriptions = [d for d in descriptions if d]
+    if not descriptions:
+        return None
+
+    seconds = sum(d["seconds"] for d in descriptions)
+    stages = {}
+    for name in (STAGE_READ, STAGE_TAG, STAGE_WRITE):
+        merged = {key: sum(d["stages"][name][key] for d in descriptions)
+                  for key in ("items", "busy_seconds", "idle_seconds", "blocked_seconds")}
+        merged = {key: round(value, 4) for key, value in merged.items()}
+        merged["utilization"] = round(merged["busy_seconds"] / seconds, 4) if seconds > 0 else None
+        stages[name] = merged
+
+    queues = {}
+    for d in descriptions:
+        for name, queue in d["queues"].items():
+            queues.setdefault(name, []).append(queue)
+    return {
+        "overlapped": any(d["overlapped"] for d in descriptions),
+        "seconds": round(seconds, 4),
+        "stages": stages,
+        "queues": {
+            name: {
+                "capacity": max(q["capacity"] for q in samples),
+                "max_depth": max(q["max_depth"] for q in samples),
+                "avg_depth": round(sum(q["avg_depth"] for q in samples) / len(samples), 2),
+            }
+            for name, samples in queues.items()
+        },
+        "bottleneck": max(stages, key=lambda name: stages[name]["busy_seconds"]),
+    }
@@ -0,0 +1,378 @@
+# data_processor/shards.py
+#
+# 공용 샤드 큐: 입력 CSV를 레코드 경계에서 자른 바이트 범위 샤드로 나누고,
+# 워커들이 Mongo 컬렉션(ImportShards)에서 find_one_and_update로 샤드를 원자적으로 임대(lease)하여 처리합니다.
+# 임대가 만료된 샤드(중단된 워커)는 다른 워커가 마지막 체크포인트부터 이어서 처리하며,
+# 마지막 샤드를 끝낸 워커가 파일 회차 교체를 마무리합니다.
+
+from typing import Iterator, List, Optional, Tuple
+import io
+import os
+import time
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from .manifest import check_file_unchanged, new_generation, replace_previous_generations
+from .constants import (
+    WORKER_NAME, DB_FIELD_GENERATION,
+    IMPORT_SHARD_BYTES, IMPORT_SHARD_LEASE_SEC, IMPORT_SHARD_MAX_ATTEMPTS,
+)
+
+# 큐 문서 종류
+KIND_PLAN = 'plan'    # 파일 하나의 현재 샤드 계획 (_id: "plan:<파일명>")
+KIND_SHARD = 'shard'  # 샤드 하나 (_id: "<generation>:<순번>")
+
+# 계획 상태
+PLAN_ACTIVE = 'active'
+PLAN_COMPLETED = 'completed'
+
+# 샤드 상태
+SHARD_PENDING = 'pending'
+SHARD_LEASED = 'leased'
+SHARD_DONE = 'done'
+SHARD_FAILED = 'failed'
+
+
+class LeaseLostError(Exception):
+    """임대가 만료되어 다른 워커가 샤드를 가져간 경우. 이미 저장한 배치는 같은 _id로 다시 저장되므로 그대로 둡니다."""
+
+
+# ----------------------------------------------------------------------
+# 레코드 경계 탐색 (따옴표 안의 줄바꿈은 경계가 아님)
+# ----------------------------------------------------------------------
+
+def record_boundaries(handle) -> Iterator[int]:
+    """
+    CSV 레코드가 끝나는 바이트 오프셋을 차례로 반환합니다.
+    줄마다 큰따옴표 개수의 홀짝으로 따옴표 안인지 추적합니다. (이스케이프된 ""는 짝수라 영향 없음)
+    utf-8/cp949 모두 '"'와 '\\n' 바이트가 멀티바이트 문자 안에 나타나지 않으므로 디코딩 없이 셀 수 있습니다.
+    """
+    offset = handle.tell()
+    in_quotes = False
+    for line in handle:
+        offset += len(line)
+        if line.count(b'"') % 2:
+            in_quotes = not in_quotes
+        if not in_quotes:
+            yield offset
+
+
+def plan_byte_ranges(file_path: str, target_bytes: int = IMPORT_SHARD_BYTES) -> Tuple[int, List[Tuple[int, int]]]:
+    """(헤더 끝 오프셋, [(시작, 끝), ...])을 반환합니다. 각 범위는 target_bytes 이상이 되는 첫 레코드 경계에서 끝납니다."""
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as handle:
+        boundaries = record_boundaries(handle)
+        header_end = next(boundaries, size)
+        ranges = []
+        start = header_end
+        for end in boundaries:
+            if end - start >= target_bytes:
+                ranges.append((start, end))
+                start = end
+    if start < size:
+        ranges.append((start, size))
+    return header_end, ranges
+
+
+def open_shard(file_path: str, header_end: int, start: int, end: int) -> io.BytesIO:
+    """헤더 줄과 샤드 바이트 범위를 이어 붙인 CSV 스트림을 반환합니다. (메모리 사용량은 샤드 크기로 제한)"""
+    with open(file_path, 'rb') as handle:
+        header = handle.read(header_end)
+        handle.seek(start)
+        body = handle.read(end - start)
+    return io.BytesIO(header + body)
+
+
+# ----------------------------------------------------------------------
+# 샤드 계획
+# ----------------------------------------------------------------------
+
+def _plan_id(source_file: str) -> str:
+    return f"plan:{source_file}"
+
+
+def ensure_queue_indexes(queue, collections=()):
+    queue.create_index([("kind", 1), ("state", 1), ("index", 1)])
+    queue.create_index([("kind", 1), ("source_file", 1), (DB_FIELD_GENERATION, 1)])
+    # 샤드를 다시 시도할 때 그 샤드의 부분 집계 문서를 지우는 데 사용
+    for collection in collections:
+        collection.create_index([("shard_id", 1)], sparse=True)
+
+
+def _is_orphaned_plan(queue, plan: dict) -> bool:
+    """
+    계획 문서를 저장한 뒤 샤드를 올리기 전에 워커가 중단된 계획인지 확인합니다.
+    샤드를 올리는 중인 워커와 겹치지 않도록, 계획을 세운 지 임대 시간 이상 지난 경우만 해당합니다.
+    """
+    return (plan.get("shard_count", 0) > 0 and
+            plan.get("planned_at", 0) < time.time() - IMPORT_SHARD_LEASE_SEC and
+            queue.count_documents({"kind": KIND_SHARD, "source_file": plan["source_file"],
+                                   DB_FIELD_GENERATION: plan[DB_FIELD_GENERATION]}) == 0)
+
+
+def _reset_failed_shards(queue, plan: dict, requested_at: float) -> int:
+    """
+    요청 시각 이전에 failed로 남은 샤드를 대기 상태로 돌리고 시도 횟수를 초기화합니다. (체크포인트는 유지)
+    마지막 시도의 임대가 요청 이전에 만료된 샤드(워커가 중단되어 failed로 표시되지 못함)도 함께 돌립니다.
+    이번 요청에서 다시 실패한 샤드는 failed_at이 요청 이후이므로 다른 워커가 같은 요청으로 또 돌리지 않습니다.
+    """
+    result = queue.update_many(
+        {"kind": KIND_SHARD, "source_file": plan["source_file"], DB_FIELD_GENERATION: plan[DB_FIELD_GENERATION],
+         "$or": [
+             {"state": SHARD_FAILED, "failed_at": {"$lt": requested_at}},
+             {"state": SHARD_FAILED, "failed_at": {"$exists": False}},
+             {"state": SHARD_LEASED, "attempt": {"$gte": IMPORT_SHARD_MAX_ATTEMPTS},
+              "lease_expires_at": {"$lt": requested_at}},
+         ]},
+        {"$set": {"state": SHARD_PENDING, "attempt": 0, "owner": None, "lease_expires_at": None},
+         "$inc": {"reset_count": 1}},
+    )
+    return result.modified_count
+
+
+def _sync_plan_progress(queue, source_file: str, generation: str) -> Optional[dict]:
+    """
+    완료된 샤드를 다시 세어 계획의 done_count/document_count에 반영하고 갱신된 계획 문서를 반환합니다.
+    $max로만 올리므로 여러 워커가 동시에 호출해도 실제 완료 샤드 수를 넘거나 줄어들지 않습니다.
+    """
+    done = list(queue.find({"kind": KIND_SHARD, "source_file": source_file, DB_FIELD_GENERATION: generation,
+                            "state": SHARD_DONE}, {"documents": 1}))
+    return queue.find_one_and_update(
+        {"_id": _plan_id(source_file), DB_FIELD_GENERATION: generation},
+        {"$max": {"done_count": len(done), "document_count": sum(shard.get("documents", 0) for shard in done)}},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def ensure_file_plan(queue, file_path: str, encoding_detector, force: bool = False,
+                     requested_at: float = None, target_bytes: int = IMPORT_SHARD_BYTES,
+                     collections=()) -> Tuple[dict, str]:
+    """
+    파일의 샤드 계획을 확인하고 (계획 문서, 상태)를 반환합니다.
+      - 'skipped': 같은 내용으로 이미 적재가 끝났고 force가 아니거나, 요청 이후 다른 워커가 강제 재적재를 끝낸 경우
+      - 'joined' : 다른 워커가 세운 진행 중인 계획에 참여
+      - 'planned': 이 워커가 새 회차 계획을 세우고 샤드를 큐에 올림
+    여러 워커가 동시에 호출해도 계획 문서의 회차 비교 후 교체로 한 워커만 새 계획을 세웁니다.
+    진행 중인 계획에 참여할 때는 요청 이전에 최대 시도 횟수를 넘겨 failed로 남은 샤드를 다시 대기 상태로 돌리고,
+    완료된 샤드를 다시 세어 모든 샤드가 끝났는데 마무리되지 못한 계획은 collections로 마무리합니다.
+    샤드를 올리기 전에 중단된 계획(샤드가 하나도 없음)이나, force인데 요청 이전에 세워진 진행 중인 계획은 새 회차로 다시 세웁니다.
+    """
+    source_file = os.path.basename(file_path)
+    requested_at = requested_at or time.time()
+    plan = queue.find_one({"_id": _plan_id(source_file)})
+    unchanged, fingerprint = check_file_unchanged(plan, file_path)
+
+    if plan and unchanged:
+        if plan["state"] != PLAN_COMPLETED:
+            if force and plan.get("planned_at", 0) < requested_at:
+                print(f"[{WORKER_NAME}] 🔁 진행 중인 계획을 강제 재적재로 다시 세웁니다: {source_file}")
+            elif not _is_orphaned_plan(queue, plan):
+                reset = _reset_failed_shards(queue, plan, requested_at)
+                if reset:
+                    print(f"[{WORKER_NAME}] ♻️ 실패한 샤드 {reset}개를 다시 대기 상태로: {source_file}")
+                plan = _sync_plan_progress(queue, source_file, plan[DB_FIELD_GENERATION]) or plan
+                if collections and plan["state"] != PLAN_COMPLETED and plan["done_count"] >= plan["shard_count"]:
+                    # 마지막 샤드를 끝낸 워커가 마무리 전에 중단된 경우
+                    finalize_file(queue, plan, collections)
+                    print(f"[{WORKER_NAME}] ✅ 중단된 파일 마무리 완료 (모든 샤드): {source_file}")
+                    plan = queue.find_one({"_id": plan["_id"]}) or plan
+                return plan, 'joined'
+            else:
+                print(f"[{WORKER_NAME}] ⚠️ 샤드 없이 중단된 계획을 다시 세웁니다: {source_file}")
+        elif not force or plan.get("completed_at", 0) >= requested_at:
+            return plan, 'skipped'
+
+    if fingerprint.get("sha256") is None:
+        _, fingerprint = check_file_unchanged(None, file_path)
+
+    generation = new_generation()
+    header_end, ranges = plan_byte_ranges(file_path, target_bytes)
+    new_plan = {
+        "_id": _plan_id(source_file),
+        "kind": KIND_PLAN,
+        "source_file": source_file,
+        "size": fingerprint["size"],
+        "mtime": fingerprint["mtime"],
+        "sha256": fingerprint["sha256"],
+        "encoding": encoding_detector(file_path),
+        "header_end": header_end,
+        DB_FIELD_GENERATION: generation,
+        "state": PLAN_ACTIVE,
+        "shard_count": len(ranges),
+        "done_count": 0,
+        "document_count": 0,
+        "planned_by": WORKER_NAME,
+        "planned_at": time.time(),
+        # 재적재가 끝날 때까지 마스터는 이전에 완료된 회차를 계속 읽습니다.
+        "published_generation": plan.get("published_generation") if plan else None,
+    }
+
+    try:
+        if plan is None:
+            queue.insert_one(new_plan)
+        elif queue.replace_one({"_id": plan["_id"], DB_FIELD_GENERATION: plan[DB_FIELD_GENERATION]},
+                               new_plan).matched_count == 0:
+            raise DuplicateKeyError("plan replaced by another worker")
+    except DuplicateKeyError:
+        # 다른 워커가 먼저 새 계획을 세웠으므로 그 계획에 참여합니다.
+        return queue.find_one({"_id": _plan_id(source_file)}), 'joined'
+
+    # 이전 회차에서 남은 샤드는 더 이상 가져가지 않도록 지웁니다.
+    queue.delete_many({"kind": KIND_SHARD, "source_file": source_file, DB_FIELD_GENERATION: {"$ne": generation}})
+    if ranges:
+        queue.insert_many([
+            {
+                "_id": f"{generation}:{index:05d}",
+                "kind": KIND_SHARD,
+                "source_file": source_file,
+                DB_FIELD_GENERATION: generation,
+                "index": index,
+                "start": start,
+                "end": end,
+                "state": SHARD_PENDING,
+                "attempt": 0,
+                "rows_committed": 0,
+                "batch_id": 0,
+                "owner": None,
+                "lease_expires_at": None,
+            }
+            for index, (start, end) in enumerate(ranges)
+        ], ordered=False)
+    else:
+        # 헤더만 있는 파일은 바로 완료 처리합니다.
+        queue.update_one({"_id": new_plan["_id"]}, {"$set": {"state": PLAN_COMPLETED, "completed_at": time.time(),
+                                                            "published_generation": generation}})
+        new_plan.update(state=PLAN_COMPLETED, published_generation=generation)
+    print(f"[{WORKER_NAME}] 🗂️ 샤드 계획 생성: {source_file} ({len(ranges)}개 샤드)")
+    return new_plan, 'planned'
+
+
+# ----------------------------------------------------------------------
+# 임대 (claim / renew / complete / release)
+# ----------------------------------------------------------------------
+
+def claim_shard(queue, source_files: List[str], exclude: List[str] = (),
+                lease_seconds: float = IMPORT_SHARD_LEASE_SEC) -> Optional[dict]:
+    """
+    대기 중이거나 임대가 만료된 샤드 하나를 원자적으로 가져옵니다. 없으면 None.
+    마지막 시도의 임대가 만료된 샤드는 더 가져가지 않으므로 failed로 표시해 다음 Rebuild 요청에서 다시 돌리게 합니다.
+    """
+    now = time.time()
+    queue.update_many(
+        {"kind": KIND_SHARD, "source_file": {"$in": list(source_files)}, "state": SHARD_LEASED,
+         "attempt": {"$gte": IMPORT_SHARD_MAX_ATTEMPTS}, "lease_expires_at": {"$lt": now}},
+        {"$set": {"state": SHARD_FAILED, "owner": None, "lease_expires_at": None,
+                  "last_error": "lease expired", "failed_at": now}},
+    )
+    return queue.find_one_and_update(
+        {
+            "kind": KIND_SHARD,
+            "source_file": {"$in": list(source_files)},
+            "_id": {"$nin": list(exclude)},
+            "attempt": {"$lt": IMPORT_SHARD_MAX_ATTEMPTS},
+            "$or": [
+                {"state": SHARD_PENDING},
+                {"state": SHARD_LEASED, "lease_expires_at": {"$lt": now}},
+            ],
+        },
+        {
+            "$set": {"state": SHARD_LEASED, "owner": WORKER_NAME, "leased_at": now,
+                     "lease_expires_at": now + lease_seconds},
+            "$inc": {"attempt": 1},
+        },
+        sort=[("index", 1), ("source_file", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _lease_query(shard: dict) -> dict:
+    return {"_id": shard["_id"], "state": SHARD_LEASED, "owner": WORKER_NAME, "attempt": shard["attempt"]}
+
+
+def renew_lease(queue, shard: dict, lease_seconds: float = IMPORT_SHARD_LEASE_SEC):
+    """처리 중인 샤드의 임대를 연장합니다. 이미 다른 워커가 가져갔으면 LeaseLostError."""
+    result = queue.update_one(_lease_query(shard), {"$set": {"lease_expires_at": time.time() + lease_seconds}})
+    if result.matched_count == 0:
+        raise LeaseLostError(shard["_id"])
+
+
+def checkpoint_shard(queue, shard: dict, rows_committed: int, batch_id: int, documents: int,
+                     lease_seconds: float = IMPORT_SHARD_LEASE_SEC):
+    """
+    배치가 저장될 때마다 샤드 안의 커밋 행과 배치 번호를 기록하고 임대도 함께 연장합니다.
+    임대가 만료되어 샤드를 가져간 다음 워커는 이 행부터 이어서 처리합니다.
+    """
+    result = queue.update_one(_lease_query(shard), {"$set": {
+        "rows_committed": rows_committed, "batch_id": batch_id, "documents": documents,
+        "lease_expires_at": time.time() + lease_seconds,
+    }})
+    if result.matched_count == 0:
+        raise LeaseLostError(shard["_id"])
+
+
+def complete_shard(queue, shard: dict, rows: int, documents: int) -> dict:
+    """샤드를 완료로 표시하고, 갱신된 계획 문서를 반환합니다. (done_count == shard_count이면 파일 완료)"""
+    result = queue.update_one(_lease_query(shard), {"$set": {
+        "state": SHARD_DONE, "rows_committed": rows, "documents": documents, "finished_at": time.time(),
+    }})
+    if result.matched_count == 0:
+        raise LeaseLostError(shard["_id"])
+    return _sync_plan_progress(queue, shard["source_file"], shard[DB_FIELD_GENERATION])
+
+
+def release_shard(queue, shard: dict, error: str):
+    """
+    실패한 샤드를 다른 워커가 다시 시도할 수 있도록 돌려놓습니다. 시도 횟수를 넘기면 failed로 남기며,
+    failed 샤드는 다음 Rebuild 요청의 ensure_file_plan이 다시 대기 상태로 돌립니다.
+    """
+    state = SHARD_FAILED if shard["attempt"] >= IMPORT_SHARD_MAX_ATTEMPTS else SHARD_PENDING
+    queue.update_one(_lease_query(shard), {"$set": {
+        "state": state, "owner": None, "lease_expires_at": None, "last_error": error,
+        "failed_at": time.time() if state == SHARD_FAILED else None,
+    }})
+
+
+def yield_shard(queue, shard: dict):
+    """
+    취소/예산 초과로 멈춘 샤드를 대기 상태로 돌려놓습니다. 실패가 아니므로 시도 횟수를 되돌리며,
+    체크포인트(rows_committed)는 남아 있어 다음에 가져가는 워커가 이어서 처리합니다.
+    """
+    queue.update_one(_lease_query(shard), {
+        "$set": {"state": SHARD_PENDING, "owner": None, "lease_expires_at": None},
+        "$inc": {"attempt": -1},
+    })
+
+
+def finalize_file(queue, plan: dict, collections) -> int:
+    """
+    마지막 샤드를 끝낸 워커가 호출합니다. 계획을 완료로 표시하며 새 회차를 공개(published_generation)한 뒤,
+    어느 워커가 적재했든 이전 회차 문서를 지웁니다. 지우기 전에 중단되어도 마스터는 공개된 회차만 읽습니다.
+    """
+    generation = plan[DB_FIELD_GENERATION]
+    queue.update_one({"_id": plan["_id"], DB_FIELD_GENERATION: generation},
+                     {"$set": {"state": PLAN_COMPLETED, "completed_at": time.time(), "completed_by": WORKER_NAME,
+                               "published_generation": generation}})
+    return sum(replace_previous_generations(collection, plan["source_file"], generation, worker_name=None)
+               for collection in collections)
+
+
+def remaining_shards(queue, source_files: List[str]) -> List[dict]:
+    """완료되지 않은 샤드 목록 (다른 워커에 다시 나눠 줄 남은 작업)."""
+    shards = queue.find({"kind": KIND_SHARD, "source_file": {"$in": list(source_files)}, "state": {"$ne": SHARD_DONE}},
+                        {"source_file": 1, "index": 1, "state": 1, "owner": 1, "rows_committed": 1})
+    return [
+        {"shard": shard["_id"], "source_file": shard["source_file"], "index": shard["index"],
+         "state": shard["state"], "owner": shard.get("owner"), "rows_committed": shard.get("rows_committed", 0)}
+        for shard in sorted(shards, key=lambda shard: (shard["source_file"], shard["index"]))
+    ]
+
+
+def queue_status(queue, source_files: List[str]) -> dict:
+    """파일별 샤드 상태 개수 (예: {"2017.csv": {"done": 12, "leased": 2}})"""
+    status = {}
+    for shard in queue.find({"kind": KIND_SHARD, "source_file": {"$in": list(source_files)}},
+                            {"source_file": 1, "state": 1}):
+        counts = status.setdefault(shard["source_file"], {})
+        counts[shard["state"]] = counts.get(shard["state"], 0) + 1
+    return status
@@ -0,0 +1,193 @@
+# data_processor/taggers.py
+
+from importlib import metadata
+from typing import Dict, Iterable, List, Set, Tuple
+import re
+
+import pandas as pd
+
+from .constants import EXCLUDE_NOUNS, NOUN_TAGGER_BACKEND
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def _normalize(text) -> str:
+    if text is None or (not isinstance(text, str) and pd.isna(text)):
+        return ''
+    return str(text).replace('\n', ' ')
+
+
+def filter_proper_nouns(tagged: Iterable[Tuple[str, str]]) -> List[str]:
+    """NNP/NNPS 태그된 단어 중 제외 목록을 거르고, 길이 1 또는 숫자인 단어를 제거하여 소문자로 반환합니다."""
+    return [
+        word.lower()
+        for word, tag in tagged
+        if tag in ('NNP', 'NNPS') and
+           word.lower() not in EXCLUDE_NOUNS and
+           len(word) > 1 and not word.isdigit()
+    ]
+
+
+def _is_candidate(token: str, sentence_initial: bool, lowercase_seen: Set[str]) -> bool:
+    """
+    대문자 표기 규칙상 고유 명사가 될 수 있는 토큰인지 판단합니다.
+    문장 첫 단어는 대문자로 시작해도 같은 기사 안에서 소문자로 쓰인 적이 있으면(예: 'The') 후보에서 제외합니다.
+    """
+    lowered = token.lower()
+    return (token[:1].isupper() and len(token) > 1 and not token.isdigit() and
+            lowered not in EXCLUDE_NOUNS and
+            (not sentence_initial or lowered not in lowercase_seen))
+
+
+# ----------------------------------------------------------------------
+# 태거 백엔드
+# ----------------------------------------------------------------------
+
+class NounTagger:
+    """
+    고유 명사 추출기 기본 클래스입니다.
+    모델은 warm_up()에서 한 번만 읽어 들이고, extract_batch()는 입력과 같은 순서의 명사 리스트를 반환합니다.
+    """
+
+    name = 'base'
+    revision = 1  # 추출 규칙이 바뀌면 올려서 명사 캐시를 무효화합니다.
+
+    def __init__(self):
+        self._ready = False
+
+    @property
+    def version(self) -> str:
+        return f"{self.name}-{self.revision}/textblob-{_package_version('textblob')}/nltk-{_package_version('nltk')}"
+
+    def warm_up(self):
+        if not self._ready:
+            self._load()
+            self._ready = True
+
+    def _load(self):
+        pass
+
+    def extract(self, text) -> List[str]:
+        return self.extract_batch([text])[0]
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        raise NotImplementedError
+
+
+class TextBlobTagger(NounTagger):
+    """기존 방식: 기사마다 TextBlob을 만들고 blob.tags를 순회합니다. (비교 기준)"""
+
+    name = 'textblob'
+
+    def _load(self):
+        from textblob import TextBlob
+        self._text_blob = TextBlob
+        TextBlob("Warm up the tagger.").tags
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        self.warm_up()
+        return [filter_proper_nouns(self._text_blob(text).tags) if text else []
+                for text in map(_normalize, texts)]
+
+
+class PerceptronTagger(NounTagger):
+    """
+    TextBlob 기본 태거(NLTKTagger)와 같은 토크나이저/퍼셉트론 모델을 미리 한 번만 읽어 두고 재사용합니다.
+    TextBlob.tags처럼 기사를 sent_tokenize로 나눈 뒤 문장마다 태깅하되(문장 사이에서 문맥이 초기화됨),
+    TextBlob/Sentence/Word 객체 생성 없이 여러 기사의 문장을 tag_sents로 한 번에 태깅합니다.
+    textblob 백엔드와의 결과 비교는 NLTK 데이터가 있는 환경의 테스트와 benchmarks taggers로 확인합니다.
+    """
+
+    name = 'perceptron'
+
+    def _load(self):
+        import nltk
+        from nltk.tag.perceptron import PerceptronTagger as NLTKPerceptronTagger
+        self._tagger = NLTKPerceptronTagger()
+        self._sent_tokenize = nltk.tokenize.sent_tokenize
+        self._word_tokenize = nltk.tokenize.word_tokenize
+        self._tagger.tag_sents([self._word_tokenize(s) for s in self._sent_tokenize("Warm up. Done.")])
+
+    def _select_sentences(self, sentences: List[List[str]]) -> List[List[str]]:
+        return sentences
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        self.warm_up()
+        sentence_counts = []
+        sentences = []
+        for text in map(_normalize, texts):
+            selected = self._select_sentences(
+                [self._word_tokenize(sentence) for sentence in self._sent_tokenize(text)]
+            ) if text else []
+            sentence_counts.append(len(selected))
+            sentences.extend(selected)
+
+        tagged = self._tagger.tag_sents(sentences)
+
+        results = []
+        start = 0
+        for count in sentence_counts:
+            results.append(filter_proper_nouns(pair for sentence in tagged[start:start + count] for pair in sentence))
+            start += count
+        return results
+
+
+class PrefilterTagger(PerceptronTagger):
+    """
+    퍼셉트론 태거 앞에 대문자 표기 휴리스틱을 두어, 고유 명사 후보 토큰이 하나도 없는 문장은 태깅하지 않습니다.
+    """
+
+    name = 'prefilter'
+
+    def _select_sentences(self, sentences: List[List[str]]) -> List[List[str]]:
+        lowercase_seen = {token for sentence in sentences for token in sentence if token.islower()}
+        return [
+            sentence for sentence in sentences
+            if any(_is_candidate(token, i == 0, lowercase_seen) for i, token in enumerate(sentence))
+        ]
+
+
+class HeuristicTagger(NounTagger):
+    """
+    품사 태깅 없이 대문자 표기 규칙만으로 고유 명사를 추정합니다. NLTK 데이터가 필요 없고 가장 빠르지만 정확도는 낮습니다.
+    """
+
+    name = 'heuristic'
+    _SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+    _TOKEN = re.compile(r"[^\W\d_][\w\-]*")
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        results = []
+        for text in map(_normalize, texts):
+            sentences = [self._TOKEN.findall(sentence) for sentence in self._SENTENCE_SPLIT.split(text)]
+            lowercase_seen = {token for sentence in sentences for token in sentence if token.islower()}
+            results.append([
+                token.lower()
+                for sentence in sentences
+                for i, token in enumerate(sentence)
+                if _is_candidate(token, i == 0, lowercase_seen)
+            ])
+        return results
+
+
+TAGGER_BACKENDS = {
+    tagger.name: tagger for tagger in (TextBlobTagger, PerceptronTagger, PrefilterTagger, HeuristicTagger)
+}
+
+# 프로세스마다 백엔드별로 하나씩만 만들어 재사용합니다. (fork 전에 warm_up하면 자식 프로세스도 공유)
+_instances: Dict[str, NounTagger] = {}
+
+
+def get_tagger(backend: str = None) -> NounTagger:
+    """NOUN_TAGGER_BACKEND(또는 지정한 백엔드)의 프로세스 전역 태거 인스턴스를 반환합니다."""
+    backend = backend or NOUN_TAGGER_BACKEND
+    if backend not in TAGGER_BACKENDS:
+        raise ValueError(f"알 수 없는 태거 백엔드: {backend} (사용 가능: {', '.join(TAGGER_BACKENDS)})")
+    if backend not in _instances:
+        _instances[backend] = TAGGER_BACKENDS[backend]()
+    return _instances[backend]
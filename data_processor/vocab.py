@@ -0,0 +1,159 @@
+# data_processor/vocab.py
+
+from collections import Counter
+from typing import Dict, Iterable, List
+import threading
+
+import numpy as np
+from bson import Binary
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+
+from .constants import (
+    DB_FIELD_NOUNS, DB_FIELD_NOUN_ENCODING,
+    NOUN_STORAGE_MODE,
+)
+
+# 명사 저장 형식
+STORAGE_LIST = 'list'       # ["london", "google", "london"] (기존 형식, 마스터 호환)
+STORAGE_PAIRS = 'pairs'     # [[명사 ID, 빈도], ...]
+STORAGE_PACKED = 'packed'   # (명사 ID, 빈도) uint32 리틀 엔디언 쌍을 이어 붙인 바이너리
+STORAGE_MODES = (STORAGE_LIST, STORAGE_PAIRS, STORAGE_PACKED)
+
+# ID 할당 카운터 문서. 명사 문서의 _id(문자열)와 겹치지 않도록 정수 _id를 씁니다.
+_COUNTER_ID = 0
+_PACKED_DTYPE = np.dtype('<u4')
+DUPLICATE_KEY_ERROR = 11000
+
+
+class NounVocab:
+    """
+    워커들이 함께 쓰는 명사 사전 (NounVocab 컬렉션: {_id: 명사, id: 정수 ID}).
+    처음 보는 명사는 카운터를 한 번에 $inc 하여 ID 구간을 받아 일괄 등록합니다.
+    다른 워커가 같은 명사를 먼저 등록했으면(중복 키) 그 ID를 다시 읽어 쓰므로, 명사마다 ID는 하나뿐입니다. (받은 구간의 빈 번호는 버림)
+    조회한 ID는 프로세스 안에 보관하므로 같은 명사는 DB를 다시 조회하지 않습니다.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.allocated = 0
+        self._ids: Dict[str, int] = {}
+        self._nouns: Dict[int, str] = {}
+        self._indexed = False
+        self._lock = threading.Lock()
+
+    def _remember(self, documents: Iterable[dict]):
+        for document in documents:
+            self._ids[document["_id"]] = document["id"]
+            self._nouns[document["id"]] = document["_id"]
+
+    def ids_for(self, nouns: Iterable[str]) -> Dict[str, int]:
+        """명사 → ID 딕셔너리를 반환합니다. 사전에 없는 명사는 새 ID를 할당합니다."""
+        with self._lock:
+            wanted = list(dict.fromkeys(nouns))
+            missing = [noun for noun in wanted if noun not in self._ids]
+            if missing:
+                self._remember(self.collection.find({"_id": {"$in": missing}}, {"id": 1}))
+                missing = [noun for noun in missing if noun not in self._ids]
+            if missing:
+                self._allocate(missing)
+            return {noun: self._ids[noun] for noun in wanted}
+
+    def _allocate(self, nouns: List[str]):
+        if not self._indexed:
+            self.collection.create_index([("id", 1)], unique=True, sparse=True)
+            self._indexed = True
+
+        counter = self.collection.find_one_and_update(
+            {"_id": _COUNTER_ID}, {"$inc": {"next_id": len(nouns)}},
+            upsert=True, return_document=ReturnDocument.AFTER,
+        )
+        first_id = counter["next_id"] - len(nouns) + 1
+        documents = [{"_id": noun, "id": first_id + offset} for offset, noun in enumerate(nouns)]
+        conflicts = []
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            conflicts = [documents[error["index"]]["_id"] for error in errors]
+
+        conflicted = set(conflicts)
+        self._remember(document for document in documents if document["_id"] not in conflicted)
+        self.allocated += len(documents) - len(conflicts)
+        if conflicts:
+            self._remember(self.collection.find({"_id": {"$in": conflicts}}, {"id": 1}))
+
+    def nouns_for(self, ids: Iterable[int]) -> Dict[int, str]:
+        """ID → 명사 딕셔너리를 반환합니다. 사전에 없는 ID는 빠집니다."""
+        with self._lock:
+            wanted = list(dict.fromkeys(int(noun_id) for noun_id in ids))
+            missing = [noun_id for noun_id in wanted if noun_id not in self._nouns]
+            if missing:
+                self._remember(self.collection.find({"id": {"$in": missing}}, {"id": 1}))
+            return {noun_id: self._nouns[noun_id] for noun_id in wanted if noun_id in self._nouns}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+def _noun_pairs(document: dict) -> List[tuple]:
+    encoding = document.get(DB_FIELD_NOUN_ENCODING)
+    value = document.get(DB_FIELD_NOUNS) or []
+    if encoding == STORAGE_PACKED:
+        return [tuple(pair) for pair in np.frombuffer(bytes(value), dtype=_PACKED_DTYPE).reshape(-1, 2).tolist()]
+    return [tuple(pair) for pair in value]
+
+
+class NounCodec:
+    """ImFiles 문서의 nouns 필드를 저장 형식(NOUN_STORAGE_MODE)에 맞게 인코딩/디코딩합니다."""
+
+    def __init__(self, vocab_collection, mode: str = NOUN_STORAGE_MODE):
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"알 수 없는 명사 저장 형식: {mode} (사용 가능: {', '.join(STORAGE_MODES)})")
+        self.mode = mode
+        self.vocab = NounVocab(vocab_collection)
+
+    def encode_documents(self, documents: List[dict]):
+        """문서의 명사 목록을 (ID, 빈도) 쌍으로 바꿉니다. 'list' 형식이면 그대로 둡니다. (문서를 직접 수정)"""
+        if self.mode == STORAGE_LIST or not documents:
+            return
+        ids = self.vocab.ids_for(noun for document in documents for noun in document[DB_FIELD_NOUNS])
+        for document in documents:
+            pairs = [[ids[noun], count] for noun, count in Counter(document[DB_FIELD_NOUNS]).items()]
+            if self.mode == STORAGE_PACKED:
+                document[DB_FIELD_NOUNS] = Binary(np.asarray(pairs, dtype=_PACKED_DTYPE).tobytes())
+            else:
+                document[DB_FIELD_NOUNS] = pairs
+            document[DB_FIELD_NOUN_ENCODING] = self.mode
+
+    def decode_documents(self, documents: List[dict]) -> List[dict]:
+        """decode_documents(documents, vocab)과 같습니다. (이 코덱의 사전 캐시 사용)"""
+        return decode_documents(documents, self.vocab)
+
+    def describe(self) -> dict:
+        return {"mode": self.mode, "vocab_size": len(self.vocab), "allocated": self.vocab.allocated}
+
+
+def decode_documents(documents: List[dict], vocab: NounVocab) -> List[dict]:
+    """
+    인코딩된 문서들의 nouns를 명사 문자열 목록으로 되돌립니다. (사전 조회는 한 번, 문서를 직접 수정)
+    같은 명사는 빈도만큼 반복되며 연달아 나옵니다. (원래 기사 안의 등장 순서는 보존하지 않음)
+    인코딩되지 않은 문서는 그대로 둡니다.
+    """
+    encoded = [(document, _noun_pairs(document)) for document in documents
+               if document.get(DB_FIELD_NOUN_ENCODING) in (STORAGE_PAIRS, STORAGE_PACKED)]
+    if not encoded:
+        return documents
+    nouns = vocab.nouns_for(noun_id for _, pairs in encoded for noun_id, _ in pairs)
+    for document, pairs in encoded:
+        document[DB_FIELD_NOUNS] = [nouns[noun_id] for noun_id, count in pairs if noun_id in nouns
+                                    for _ in range(count)]
+        document.pop(DB_FIELD_NOUN_ENCODING, None)
+    return documents
+
+
+def decode_nouns(document: dict, vocab: NounVocab) -> List[str]:
+    """문서 하나의 명사 문자열 목록. 문서는 바꾸지 않습니다."""
+    return decode_documents([dict(document)], vocab)[0].get(DB_FIELD_NOUNS) or []
@@ -0,0 +1,34 @@
+# gunicorn.conf.py
+#
+# 운영 서빙 설정입니다. 실행: gunicorn worker_project.wsgi:application (현재 디렉터리의 이 파일을 자동으로 읽음)
+# 각 워커 프로세스는 post_worker_init 훅에서 태거와 Mongo 커넥션 풀을 예열하고(worker_app/warmup.py), GET /healthz로 준비 상태를 알립니다.
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('WORKER_PORT', '8001')}"
+
+# Rebuild 작업 목록(/jobs)과 중복 요청 판단은 프로세스 메모리에 있으므로 기본은 프로세스 1개입니다.
+# 프로세스를 늘리면 요청마다 다른 프로세스의 작업 목록을 보게 되므로, 병렬 처리는 스레드 수로 조절합니다.
+workers = int(os.environ.get('WEB_WORKERS', '1'))
+worker_class = 'gthread'
+# /healthz, /metrics, /jobs 조회가 {"wait": true} Rebuild 요청과 함께 처리되도록 여유 있게 둡니다.
+threads = int(os.environ.get('WEB_THREADS', '8'))
+
+# gthread 워커는 요청 처리와 별도로 마스터에 생존 신호를 보내므로, 오래 걸리는 Rebuild 요청이 timeout에 걸리지 않습니다.
+timeout = int(os.environ.get('WEB_TIMEOUT', '120'))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+# 예열은 각 프로세스에서 합니다. (preload하면 예열 스레드와 Mongo 클라이언트가 fork 이후 쓸 수 없게 됨)
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('WEB_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    # 앱을 읽은 뒤 워커 프로세스마다 예열을 시작합니다.
+    # (AppConfig.ready에서는 서버 프로세스와 django.setup()만 호출하는 스크립트를 구분할 수 없어 여기서 명시적으로 시작)
+    from worker_app.warmup import start_warmup
+    start_warmup()
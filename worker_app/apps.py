@@ -0,0 +1,15 @@
+# worker_app/apps.py
+
+from django.apps import AppConfig
+import sys
+
+
+class WorkerAppConfig(AppConfig):
+    name = 'worker_app'
+
+    def ready(self):
+        # runserver 서버 프로세스이면 태거와 Mongo 커넥션 풀을 백그라운드에서 예열합니다. (GET /healthz로 상태 확인)
+        # gunicorn은 gunicorn.conf.py의 post_worker_init 훅에서 예열합니다.
+        from .warmup import should_warm_up, start_warmup
+        if should_warm_up(sys.argv):
+            start_warmup()
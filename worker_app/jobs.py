@@ -0,0 +1,196 @@
+# worker_app/jobs.py
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+import sys
+import threading
+import time
+import uuid
+
+from data_processor.cancellation import CancelToken
+from data_processor.constants import WORKER_NAME, REBUILD_JOB_HISTORY
+from data_processor.importer import process_worker_files
+from data_processor.metrics import record_error, REBUILD_JOBS_TOTAL, REBUILD_JOB_SECONDS, REBUILD_IN_PROGRESS
+
+# 작업 상태
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+STOPPED = "STOPPED"   # 취소 또는 시간/행 예산으로 멈춤 (report["stopped"]에 부분 결과)
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class RebuildJob:
+    """
+    백그라운드에서 실행되는 Rebuild 작업 하나의 상태와 파일별 진행 상황을 보관합니다.
+    importer의 progress 콜백으로 갱신되고, snapshot()으로 처리 속도와 남은 시간을 계산합니다.
+    options의 max_seconds/max_rows는 CancelToken의 예산이 되며, cancel()로 다음 청크 경계에서 멈추게 할 수 있습니다.
+    """
+
+    def __init__(self, options: dict):
+        self.id = uuid.uuid4().hex
+        self.options = options
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.report = {}
+        self.error = None
+        self.files = OrderedDict()
+        self.cancel_token = CancelToken(options.get("max_seconds"), options.get("max_rows"))
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    # importer.process_worker_files의 progress 콜백
+    def progress(self, source_file: str, **fields):
+        with self._lock:
+            self.files.setdefault(source_file, {"state": "pending", "rows": 0, "documents": 0,
+                                                "bytes_read": 0, "bytes_total": 0}).update(fields)
+
+    def cancel(self):
+        """실행 중이면 다음 청크 경계에서, 대기 중이면 시작하자마자 멈춥니다. (처리한 행까지는 커밋)"""
+        self.cancel_token.cancel()
+        print(f"[{WORKER_NAME}] ⏹️ Rebuild 작업 취소 요청: {self.id}")
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            files = {name: dict(info) for name, info in self.files.items()}
+        # report는 importer가 실행 중에 채우므로 작업이 끝난 뒤에만 포함합니다.
+        report = self.report if self.state not in ACTIVE_STATES else None
+
+        now = self.finished_at or time.time()
+        elapsed = now - self.started_at if self.started_at else 0.0
+        rows = sum(info["rows"] for info in files.values())
+
+        # 건너뛴 파일은 남은 작업량에서 제외하고, 읽은 바이트 비율로 남은 시간을 추정합니다.
+        remaining = [info for info in files.values() if info["state"] not in ("skipped", "failed")]
+        bytes_total = sum(info["bytes_total"] for info in remaining)
+        bytes_read = sum(info["bytes_total"] if info["state"] == "completed" else info["bytes_read"]
+                         for info in remaining)
+        eta = None
+        if self.state == RUNNING and bytes_read and bytes_total and elapsed > 0:
+            eta = round((bytes_total - bytes_read) / (bytes_read / elapsed), 1)
+
+        return {
+            "job_id": self.id,
+            "worker_name": WORKER_NAME,
+            "state": self.state,
+            "options": self.options,
+            "created_at": _iso(self.created_at),
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "processing_time": round(elapsed, 3),
+            "rows": rows,
+            "rows_per_sec": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "progress": round(bytes_read / bytes_total, 4) if bytes_total else None,
+            "eta_seconds": eta,
+            "files": files,
+            "cancel_requested": self.cancel_token.cancelled,
+            "stop_reason": (report or {}).get("stopped", {}).get("reason"),
+            "error": self.error,
+            "report": report,
+        }
+
+    def _run(self, runner: Callable):
+        self.state = RUNNING
+        self.started_at = time.time()
+        REBUILD_IN_PROGRESS.inc()
+        print(f"[{WORKER_NAME}] ⚙️ Rebuild 작업 시작: {self.id}")
+        try:
+            success = runner(self.report, force=self.options.get("force", False), progress=self.progress,
+                             cancel=self.cancel_token)
+            if self.report.get("stopped"):
+                self.state = STOPPED
+            else:
+                self.state = COMPLETED if success else FAILED
+            if not success:
+                self.error = "Data rebuild failed. Check worker logs."
+        except Exception as e:
+            print(f"[{WORKER_NAME}] ❌ Rebuild 작업 치명적 오류 ({self.id}): {e}", file=sys.stderr)
+            record_error("job")
+            self.state = FAILED
+            self.error = str(e)
+        finally:
+            self.finished_at = time.time()
+            REBUILD_IN_PROGRESS.dec()
+            REBUILD_JOBS_TOTAL.inc(state=self.state)
+            REBUILD_JOB_SECONDS.observe(self.finished_at - self.started_at)
+            self._done.set()
+            print(f"[{WORKER_NAME}] 🏁 Rebuild 작업 종료: {self.id} ({self.state}, "
+                  f"{self.finished_at - self.started_at:.1f}s)")
+
+
+# ----------------------------------------------------------------------
+# 작업 관리 (프로세스 전역, import는 한 번에 하나만 실행)
+# ----------------------------------------------------------------------
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rebuild")
+_jobs: "OrderedDict[str, RebuildJob]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+def submit_rebuild(options: dict, runner: Callable = process_worker_files) -> Tuple[RebuildJob, bool]:
+    """
+    Rebuild 작업을 백그라운드 실행기에 등록하고 (작업, 새로 만들었는지)를 반환합니다.
+    이미 대기 중이거나 실행 중인 작업이 있으면 새 작업을 만들지 않고 그 작업을 돌려줍니다.
+    """
+    with _jobs_lock:
+        for job in _jobs.values():
+            if job.state in ACTIVE_STATES:
+                return job, False
+
+        job = RebuildJob(options)
+        _jobs[job.id] = job
+        _trim_history()
+        _executor.submit(job._run, runner)
+        return job, True
+
+
+def _trim_history():
+    finished = [job_id for job_id, job in _jobs.items() if job.state not in ACTIVE_STATES]
+    for job_id in finished[:max(0, len(_jobs) - REBUILD_JOB_HISTORY)]:
+        del _jobs[job_id]
+
+
+def get_job(job_id: str) -> Optional[RebuildJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def active_job() -> Optional[RebuildJob]:
+    """대기 중이거나 실행 중인 작업. (없으면 None)"""
+    with _jobs_lock:
+        return next((job for job in _jobs.values() if job.state in ACTIVE_STATES), None)
+
+
+def cancel_rebuild(job_id: str = None) -> Optional[RebuildJob]:
+    """
+    작업(job_id가 없으면 대기 중이거나 실행 중인 작업)에 취소를 요청하고 그 작업을 반환합니다. (없으면 None)
+    이미 끝난 작업은 그대로 돌려주므로 호출한 쪽에서 state로 확인합니다.
+    """
+    with _jobs_lock:
+        if job_id:
+            job = _jobs.get(job_id)
+        else:
+            job = next((job for job in _jobs.values() if job.state in ACTIVE_STATES), None)
+    if job is not None and job.state in ACTIVE_STATES:
+        job.cancel()
+    return job
+
+
+def list_jobs() -> list:
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    return [job.snapshot() for job in reversed(jobs)]
@@ -1,14 +1,58 @@
 # worker_app/tests.py
 
 import os
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, timezone
+import threading
+from unittest import mock
+import pandas as pd
 from django.test import TestCase
 from django.conf import settings
 from django.urls import reverse
 
 # 기존 로직을 임포트합니다.
-from data_processor.db_connector import get_mongodb_client
-from data_processor.importer import process_worker_files
+from data_processor import db_connector
+from data_processor.db_connector import get_mongodb_client, close_mongodb_client, shutdown_mongodb_client
+from data_processor.importer import (
+    process_worker_files, detect_csv_encoding, build_document_columns, assemble_documents,
+)
 from data_processor.constants import WORKER_NAME
+from data_processor.parallel import NounExtractionEngine
+from data_processor.pipeline import StagedPipeline
+from data_processor.noun_cache import NounCache
+from data_processor.manifest import check_file_unchanged
+from data_processor.aggregates import NounAggregator, merge_noun_summaries, top_nouns
+from data_processor.taggers import get_tagger, filter_proper_nouns
+from data_processor.memory_store import InMemoryClient
+from data_processor.benchmarks import write_synthetic_csv, synthetic_rows
+from data_processor.constants import (
+    DB_NAME, RECORD_NOUNS_COLLECTION, NOUN_SUMMARY_COLLECTION, IMPORT_CHECKPOINT_COLLECTION,
+    NOUN_VOCAB_COLLECTION, DB_FIELD_NOUNS, IMPORT_SHARD_COLLECTION, IMPORT_SHARD_MAX_ATTEMPTS,
+)
+from data_processor.columnar import open_columnar_cache, build_columnar_cache
+from data_processor.vocab import NounVocab, decode_documents, decode_nouns
+from data_processor.metrics import Histogram, ROWS_TOTAL, ERRORS_TOTAL
+from data_processor.shards import (
+    LeaseLostError, plan_byte_ranges, open_shard, ensure_file_plan, claim_shard, complete_shard, release_shard,
+)
+from data_processor.cancellation import CancelToken, STOP_CANCELLED, STOP_ROW_BUDGET
+from worker_app.jobs import COMPLETED, STOPPED, submit_rebuild
+from worker_app.warmup import READY, DEGRADED, run_warmup, should_warm_up
+
+
+def _upper_words(text):
+    """테스트용 추출 함수: 대문자로 시작하는 단어를 소문자로 반환합니다. (프로세스 풀에서 pickle 가능)"""
+    return [word.lower() for word in text.split() if word[:1].isupper()]
+
+
+def _upper_words_batch(texts):
+    """테스트용 일괄 추출 함수: 'BAD'가 들어간 기사가 있으면 청크 전체가 실패합니다."""
+    if any('BAD' in text for text in texts):
+        raise ValueError("bad article")
+    return [_upper_words(text) for text in texts]
 
 
 class WorkerServerConnectivityTests(TestCase):
@@ -77,4 +121,992 @@ class WorkerProcessingTests(TestCase):
 
         self.assertTrue(success,
                         f"❌ 오류: Importer 처리 로직 실패. {WORKER_NAME}의 로그를 확인하십시오.")
-        print(f"✅ Importer 처리 로직 성공: {WORKER_NAME}의 할당된 파일 처리가 완료되었습니다.")
\ No newline at end of file
+        print(f"✅ Importer 처리 로직 성공: {WORKER_NAME}의 할당된 파일 처리가 완료되었습니다.")
+
+
+class NounExtractionEngineTests(TestCase):
+    """
+    병렬 명사 추출 엔진이 순차 경로와 같은 결과를 같은 순서로 돌려주는지 테스트합니다.
+    """
+
+    def test_04_process_mode_preserves_row_order(self):
+        texts = [f"Article {i} mentions London and Google{i}" for i in range(25)]
+
+        with NounExtractionEngine(_upper_words, mode='serial') as serial_engine:
+            expected, _ = serial_engine.extract(texts)
+
+        with NounExtractionEngine(_upper_words, mode='process', workers=2, chunk_size=4) as engine:
+            results, chunk_stats = engine.extract(texts)
+
+        self.assertEqual(results, expected)
+        self.assertEqual(len(chunk_stats), 7)
+        self.assertEqual([c["chunk"] for c in chunk_stats], list(range(7)))
+        self.assertEqual(sum(c["rows"] for c in chunk_stats), len(texts))
+
+
+
+class StreamingImportTests(TestCase):
+    """
+    스트리밍 적재 단계(인코딩 감지, 컬럼 단위 문서 생성)를 테스트합니다.
+    """
+
+    def test_05_detect_csv_encoding(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            utf8_path = os.path.join(tmp, 'utf8.csv')
+            cp949_path = os.path.join(tmp, 'cp949.csv')
+            body = "title,text\n서울 뉴스,본문\n"
+            with open(utf8_path, 'w', encoding='utf-8') as f:
+                f.write(body)
+            with open(cp949_path, 'w', encoding='cp949') as f:
+                f.write(body)
+
+            self.assertEqual(detect_csv_encoding(utf8_path), 'utf-8')
+            # 블록 경계에서 멀티바이트 문자가 잘려도 utf-8로 잘못 판정하지 않아야 합니다.
+            self.assertEqual(detect_csv_encoding(cp949_path, block_size=3), 'cp949')
+
+
+    def test_06_columnar_document_builder(self):
+        df = pd.DataFrame({
+            'title': ['Apple news', None],
+            'text': ['Apple met Google.', 'No title here.'],
+            'timestamp': ['2015-04-01 17:12:20.801000+00:00', 'not a date'],
+            'tags': ["['Amazon', \"Editor's Pick\"]", None],
+            'url': ['https://example.com/a', 'https://example.com/b'],
+        })
+
+        columns = build_document_columns(df)
+
+        self.assertEqual(columns["full_texts"], ['Apple news Apple met Google.', ' No title here.'])
+        self.assertEqual(columns["tags"], [['amazon', 'editors pick'], []])
+        self.assertEqual(columns["dates"][0], datetime(2015, 4, 1, 17, 12, 20, 801000, tzinfo=timezone.utc))
+        self.assertIsNone(columns["dates"][1])
+        self.assertEqual(columns["invalid_dates"], 1)
+        self.assertEqual(columns["links"], ['https://example.com/a', 'https://example.com/b'])
+
+        documents = assemble_documents(columns, [['apple', 'google'], []], '2015.csv')
+        self.assertEqual(len(documents), 1)
+        self.assertEqual(documents[0]['nouns'], ['apple', 'google'])
+        self.assertEqual(documents[0]['source_file'], '2015.csv')
+
+
+
+class NounCacheTests(TestCase):
+    """
+    디스크 명사 캐시의 적중/미스 집계, 태거 버전별 무효화, 크기 제한을 테스트합니다.
+    """
+
+    def test_07_cache_hits_and_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'nouns.sqlite3')
+            texts = ["Apple met Google", "London calling", "Paris in Spring"]
+
+            cache = NounCache('test-tagger-1', path=path, max_entries=2)
+            with NounExtractionEngine(_upper_words, mode='serial', cache=cache) as engine:
+                first, _ = engine.extract(texts)
+                second, chunk_stats = engine.extract(texts[1:])
+
+            self.assertEqual(second, first[1:])
+            self.assertEqual(chunk_stats, [])  # 두 번째 호출은 전부 캐시 적중
+            self.assertEqual(cache.stats()["hits"], 2)
+            self.assertEqual(cache.stats()["evictions"], 1)
+            self.assertEqual(cache.stats()["entries"], 2)
+            cache.close()
+
+            # 태거 버전이 바뀌면 같은 텍스트라도 캐시를 사용하지 않습니다.
+            other = NounCache('test-tagger-2', path=path)
+            self.assertEqual(other.get_many(texts), {})
+            other.close()
+
+
+
+class ImportManifestTests(TestCase):
+    """
+    매니페스트 비교로 변경되지 않은 파일을 건너뛰는지 테스트합니다.
+    """
+
+    def test_08_manifest_change_detection(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, '2015.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("title,text\nA,B\n")
+
+            unchanged, fingerprint = check_file_unchanged(None, path)
+            self.assertFalse(unchanged)  # 매니페스트가 없으면 항상 적재
+
+            unchanged, _ = check_file_unchanged(fingerprint, path)
+            self.assertTrue(unchanged)
+
+            # 수정 시각만 바뀌고 내용이 같으면 해시 비교로 건너뜁니다.
+            os.utime(path, (fingerprint["mtime"] + 10, fingerprint["mtime"] + 10))
+            unchanged, touched = check_file_unchanged(fingerprint, path)
+            self.assertTrue(unchanged)
+            self.assertEqual(touched["sha256"], fingerprint["sha256"])
+
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("C,D\n")
+            unchanged, _ = check_file_unchanged(fingerprint, path)
+            self.assertFalse(unchanged)
+
+
+
+class RebuildJobTests(TestCase):
+    """
+    비동기 Rebuild 작업의 중복 실행 방지와 상태 조회 엔드포인트를 테스트합니다.
+    """
+
+    def test_09_concurrent_rebuilds_share_one_job(self):
+        release = threading.Event()
+
+        def runner(report, force=False, progress=None, cancel=None):
+            progress('2015.csv', state="running", rows=100, bytes_read=50, bytes_total=200)
+            release.wait(5)
+            progress('2015.csv', state="completed", rows=400)
+            report["rebuilt"] = ['2015.csv']
+            return True
+
+        job, created = submit_rebuild({"force": False}, runner=runner)
+        duplicate, duplicate_created = submit_rebuild({"force": True}, runner=runner)
+        self.assertTrue(created)
+        self.assertFalse(duplicate_created)
+        self.assertEqual(duplicate.id, job.id)
+
+        response = self.client.get(reverse('job_detail', args=[job.id]))
+        self.assertEqual(response.status_code, 200)
+
+        release.set()
+        self.assertTrue(job.wait(5))
+        snapshot = self.client.get(reverse('job_detail', args=[job.id])).json()
+        self.assertEqual(snapshot["state"], COMPLETED)
+        self.assertEqual(snapshot["rows"], 400)
+        self.assertEqual(snapshot["report"]["rebuilt"], ['2015.csv'])
+
+        self.assertIn(job.id, [j["job_id"] for j in self.client.get(reverse('job_list')).json()["jobs"]])
+        self.assertEqual(self.client.get(reverse('job_detail', args=['unknown'])).status_code, 404)
+
+
+
+class NounSummaryTests(TestCase):
+    """
+    워커 측 명사 빈도 부분 집계와 마스터용 병합 결과를 테스트합니다.
+    """
+
+    def test_10_partial_aggregates_merge_to_top_nouns(self):
+        aggregator = NounAggregator()
+        aggregator.add_documents([
+            {'Date': '2015-04-01 17:12:20+00:00', 'Tags': ['Tech'], 'nouns': ['apple', 'google', 'apple']},
+            {'Date': '2015-05-02 09:00:00+00:00', 'Tags': ['Tech', 'Tech'], 'nouns': ['london']},
+            {'Date': 'nan', 'Tags': [], 'nouns': ['paris']},
+        ])
+        documents = {(d['dimension'], d['key']): d for d in aggregator.to_documents('2015.csv', 'gen-1', nouns_per_key=2)}
+
+        self.assertEqual(documents[('file', '2015.csv')]['article_count'], 3)
+        self.assertEqual(documents[('month', '2015-04')]['nouns'], [['apple', 2], ['google', 1]])
+        self.assertEqual(documents[('year', '2015')]['article_count'], 2)
+        self.assertEqual(documents[('tag', 'Tech')]['article_count'], 2)
+        self.assertTrue(documents[('tag', 'Tech')]['truncated'])
+
+        other = NounAggregator()
+        other.add_documents([{'Date': '2016-01-01', 'Tags': [], 'nouns': ['london', 'london']}])
+        merged = merge_noun_summaries(
+            [d for d in aggregator.to_documents('2015.csv', 'gen-1') + other.to_documents('2016.csv', 'gen-1')
+             if d['dimension'] == 'file'],
+            top_n=2,
+        )
+        self.assertEqual(merged, [('london', 3), ('apple', 2)])
+
+
+
+class TaggerBackendTests(TestCase):
+    """
+    태거 백엔드 공통 필터, 대문자 휴리스틱 백엔드, 일괄 추출 실패 시 기사 단위 격리를 테스트합니다.
+    """
+
+    def test_11_tagger_backends_and_batch_fallback(self):
+        self.assertEqual(
+            filter_proper_nouns([('Mr', 'NNP'), ('London', 'NNP'), ('2015', 'NNP'), ('ran', 'VBD'), ('Koreans', 'NNPS')]),
+            ['london', 'koreans'],
+        )
+
+        heuristic = get_tagger('heuristic')
+        self.assertEqual(
+            heuristic.extract_batch(["The Apple event in London. The apple was red, the end. Google said.", None]),
+            [['apple', 'london', 'google'], []],
+        )
+
+        texts = ["Seoul and Busan", "BAD Article", "Tokyo"]
+        with NounExtractionEngine(_upper_words_batch, mode='serial', batch=True) as engine:
+            results, chunk_stats = engine.extract(texts)
+        self.assertEqual(results, [['seoul', 'busan'], [], ['tokyo']])
+        self.assertEqual(chunk_stats[0]["errors"], 1)
+
+
+class InMemoryPipelineTests(TestCase):
+    """
+    인메모리 Mongo 대체 구현으로 process_worker_files 전체 흐름(적재, 부분 집계, 변경 없는 파일 건너뛰기)을 테스트합니다.
+    """
+
+    def test_12_end_to_end_with_in_memory_client(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "synthetic.csv"), rows=120, seed=7)
+            client = InMemoryClient()
+
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options))
+            stats = report["files"]["synthetic.csv"]
+            self.assertEqual(stats["rows"], 120)
+            self.assertGreater(stats["extract_seconds"], 0)
+
+            db = client[DB_NAME]
+            self.assertEqual(db[RECORD_NOUNS_COLLECTION].count_documents({}), stats["documents"])
+            self.assertEqual(db[NOUN_SUMMARY_COLLECTION].count_documents({"dimension": "file"}), 1)
+            self.assertTrue(client.write_latencies())
+
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options))
+            self.assertEqual(report["skipped"], ["synthetic.csv"])
+
+
+class ShardQueueTests(TestCase):
+    """
+    레코드 경계 기준 바이트 범위 샤드 분할과 공용 큐의 임대 만료 후 재할당을 테스트합니다.
+    """
+
+    def test_13_shard_boundaries_and_lease_expiry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quoted.csv")
+            df = pd.DataFrame({
+                "title": [f"Title {i}" for i in range(40)],
+                "text": [f'Line one\nline "two", still {i}' for i in range(40)],
+            })
+            df.to_csv(path, index=False)
+
+            # 따옴표 안의 줄바꿈에서 자르지 않으므로 샤드를 이어 붙이면 원본과 같아야 함
+            header_end, ranges = plan_byte_ranges(path, target_bytes=200)
+            self.assertGreater(len(ranges), 1)
+            parts = pd.concat([pd.read_csv(open_shard(path, header_end, start, end)) for start, end in ranges],
+                              ignore_index=True)
+            pd.testing.assert_frame_equal(parts, pd.read_csv(path))
+
+            queue = InMemoryClient()[DB_NAME]["ImportShards"]
+            plan, status = ensure_file_plan(queue, path, detect_csv_encoding, target_bytes=200)
+            self.assertEqual(status, 'planned')
+            self.assertEqual(ensure_file_plan(queue, path, detect_csv_encoding)[1], 'joined')
+
+            # 임대 시간이 0이면 바로 만료되어 다음 claim이 같은 샤드를 다시 가져감
+            first = claim_shard(queue, ["quoted.csv"], lease_seconds=0)
+            second = claim_shard(queue, ["quoted.csv"])
+            self.assertEqual((first["_id"], second["attempt"]), (second["_id"], 2))
+            with self.assertRaises(LeaseLostError):
+                complete_shard(queue, first, rows=1, documents=1)
+            self.assertEqual(complete_shard(queue, second, rows=1, documents=1)["done_count"], 1)
+
+
+class StagedPipelineTests(TestCase):
+    """
+    읽기 → 태깅 → 쓰기 스테이지가 겹쳐 실행되어도 배치 순서가 유지되고, 한 스테이지의 오류가 호출자에게 전달되는지 테스트합니다.
+    """
+
+    def test_14_overlapped_stages_keep_order_and_propagate_errors(self):
+        written = []
+        pipeline = StagedPipeline(depth=1)
+        pipeline.run(iter(range(10)), lambda item: [[item, item * 10]], written.append, lambda: [["tail"]])
+        self.assertEqual(written, [[i, i * 10] for i in range(10)] + [["tail"]])
+
+        stats = pipeline.describe()
+        self.assertTrue(stats["overlapped"])
+        self.assertEqual(stats["stages"]["write"]["items"], 11)
+        self.assertLessEqual(stats["queues"]["read_to_tag"]["max_depth"], 1)
+
+        def failing_write(batch):
+            raise RuntimeError("write failed")
+
+        with self.assertRaisesMessage(RuntimeError, "write failed"):
+            StagedPipeline(depth=2).run(iter(range(100)), lambda item: [[item]], failing_write)
+
+
+class CheckpointResumeTests(TestCase):
+    """
+    배치 저장 도중 중단된 적재가 다음 실행에서 체크포인트부터 이어지고, 다시 저장된 배치가 중복되지 않는지 테스트합니다.
+    """
+
+    def test_15_interrupted_import_resumes_without_duplicates(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "resume.csv"), rows=1200, seed=3)
+
+            clean = InMemoryClient()
+            self.assertTrue(process_worker_files({}, files=[path], client=clean, extract_options=options,
+                                                 assignment='static'))
+            expected = clean[DB_NAME][RECORD_NOUNS_COLLECTION].count_documents({})
+
+            client = InMemoryClient()
+            collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            insert_many = collection.insert_many
+            calls = []
+
+            def flaky_insert_many(documents, **kwargs):
+                # 두 번째 배치는 일부만 저장된 뒤 연결이 끊긴 것처럼 실패
+                calls.append(len(documents))
+                if len(calls) == 2:
+                    insert_many(documents[:100], **kwargs)
+                    raise ConnectionError("connection reset")
+                return insert_many(documents, **kwargs)
+
+            collection.insert_many = flaky_insert_many
+            self.assertFalse(process_worker_files({}, files=[path], client=client, extract_options=options,
+                                                  assignment='static'))
+            checkpoint = client[DB_NAME][IMPORT_CHECKPOINT_COLLECTION].find_one({})
+            self.assertGreater(checkpoint["rows_committed"], 0)
+            self.assertEqual(checkpoint["batch_id"], 1)
+
+            collection.insert_many = insert_many
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options,
+                                                 assignment='static'))
+            stats = report["files"]["resume.csv"]
+            self.assertEqual(stats["resumed_from_row"], checkpoint["rows_committed"])
+            self.assertEqual(stats["rows"], 1200 - checkpoint["rows_committed"])
+            self.assertEqual(collection.count_documents({}), expected)
+            self.assertEqual(stats["documents"], expected)
+            self.assertIsNone(client[DB_NAME][IMPORT_CHECKPOINT_COLLECTION].find_one({}))
+
+            summary = client[DB_NAME][NOUN_SUMMARY_COLLECTION].find_one({"dimension": "file"})
+            clean_summary = clean[DB_NAME][NOUN_SUMMARY_COLLECTION].find_one({"dimension": "file"})
+            self.assertEqual(summary["article_count"], expected)
+            self.assertEqual(summary["nouns"], clean_summary["nouns"])
+
+
+class MetricsEndpointTests(TestCase):
+    """
+    적재 중 기록한 지표(처리 행 수, 스테이지/배치 저장 시간, 오류 수, RSS)가 /metrics에 Prometheus 텍스트 형식으로 노출되는지 테스트합니다.
+    """
+
+    def test_16_metrics_endpoint_exposes_import_metrics(self):
+        histogram = Histogram("test_seconds", "테스트", ["stage"], buckets=(0.1, 1))
+        histogram.observe(0.05, count=3, stage="read")
+        histogram.observe(5, stage="read")
+        rendered = histogram.render()
+        self.assertIn('test_seconds_bucket{stage="read",le="0.1"} 3.0', rendered)
+        self.assertIn('test_seconds_bucket{stage="read",le="+Inf"} 4.0', rendered)
+        self.assertIn('test_seconds_count{stage="read"} 4.0', rendered)
+
+        rows_before = ROWS_TOTAL.value()
+        errors_before = ERRORS_TOTAL.value(kind="file_not_found")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "metrics.csv"), rows=50, seed=5)
+            process_worker_files({}, files=[path, os.path.join(tmp, "missing.csv")], client=InMemoryClient(),
+                                 extract_options={"mode": "serial", "tagger": "heuristic", "cache": False,
+                                                  "columnar_cache": False},
+                                 assignment='static')
+        self.assertEqual(ROWS_TOTAL.value() - rows_before, 50)
+        self.assertEqual(ERRORS_TOTAL.value(kind="file_not_found") - errors_before, 1)
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        for line in ('# TYPE worker_import_stage_seconds histogram',
+                     'worker_import_stage_seconds_count{stage="extract"}',
+                     'worker_tagging_article_seconds_bucket{le="+Inf"}',
+                     f'worker_mongo_batch_write_seconds_count{{collection="{RECORD_NOUNS_COLLECTION}"}}',
+                     'worker_errors_total{kind="file_not_found"}',
+                     'worker_process_resident_memory_bytes ',
+                     '# TYPE worker_process_cpu_seconds_total counter'):
+            self.assertIn(line, body)
+
+
+class CompactNounStorageTests(TestCase):
+    """
+    명사 사전(ID 할당)과 'pairs'/'packed' 저장 형식으로 적재한 문서를 디코딩하면 기존 문자열 목록과 같은 명사 빈도가 나오는지 테스트합니다.
+    """
+
+    def test_17_encoded_nouns_decode_to_original_counts(self):
+        db = InMemoryClient()[DB_NAME]
+        vocab = NounVocab(db[NOUN_VOCAB_COLLECTION])
+        ids = vocab.ids_for(["london", "google", "london"])
+        self.assertEqual(sorted(ids.values()), [1, 2])
+        # 다른 워커(새 사전 인스턴스)도 같은 ID를 받고, 새 명사만 다음 번호를 받음
+        other = NounVocab(db[NOUN_VOCAB_COLLECTION]).ids_for(["google", "seoul"])
+        self.assertEqual((other["google"], other["seoul"]), (ids["google"], 3))
+        self.assertEqual(decode_nouns({DB_FIELD_NOUNS: [[3, 2], [1, 1]], "noun_encoding": "pairs"}, vocab),
+                         ["seoul", "seoul", "london"])
+
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "compact.csv"), rows=80, seed=11)
+            plain = InMemoryClient()
+            self.assertTrue(process_worker_files({}, files=[path], client=plain, extract_options=options))
+            expected = {doc["_id"].split(":")[-1]: Counter(doc[DB_FIELD_NOUNS])
+                        for doc in plain[DB_NAME][RECORD_NOUNS_COLLECTION].find({})}
+
+            for mode in ("pairs", "packed"):
+                client = InMemoryClient()
+                report = {}
+                self.assertTrue(process_worker_files(report, files=[path], client=client,
+                                                     extract_options=dict(options, noun_storage=mode)))
+                self.assertEqual(report["noun_storage"]["mode"], mode)
+                documents = client[DB_NAME][RECORD_NOUNS_COLLECTION].find({})
+                self.assertTrue(all(doc["noun_encoding"] == mode for doc in documents))
+
+                decoded = decode_documents(documents, NounVocab(client[DB_NAME][NOUN_VOCAB_COLLECTION]))
+                self.assertEqual({doc["_id"].split(":")[-1]: Counter(doc[DB_FIELD_NOUNS]) for doc in decoded},
+                                 expected)
+                # 부분 집계는 인코딩 전 문자열 명사로 계산됨
+                self.assertEqual(
+                    client[DB_NAME][NOUN_SUMMARY_COLLECTION].find_one({"dimension": "file"})["nouns"],
+                    plain[DB_NAME][NOUN_SUMMARY_COLLECTION].find_one({"dimension": "file"})["nouns"],
+                )
+
+
+class IndexBuildTests(TestCase):
+    """
+    조회용 인덱스(Date, Tags)가 IMPORT_INDEX_BUILD='after'일 때 적재 후에 만들어지고, 관리용 인덱스는 적재 전에 만들어지는지 테스트합니다.
+    """
+
+    def test_18_query_indexes_are_built_after_bulk_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "indexed.csv"), rows=30, seed=2)
+            client = InMemoryClient()
+            records = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            index_counts = []
+            insert_many = records.insert_many
+
+            def recording_insert_many(documents, **kwargs):
+                index_counts.append(len(records.indexes))
+                return insert_many(documents, **kwargs)
+
+            records.insert_many = recording_insert_many
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, assignment='static',
+                                                 extract_options={"mode": "serial", "tagger": "heuristic",
+                                                                  "cache": False, "columnar_cache": False,
+                                                                  "index_build": "after"}))
+
+        names = [kwargs.get("name") for _, kwargs in records.indexes]
+        self.assertEqual(index_counts, [1])  # 저장 중에는 관리용 인덱스만 있음
+        self.assertEqual(names, ["worker_file_generation", "date", "tags_date"])
+        self.assertIn(f"{RECORD_NOUNS_COLLECTION}.tags_date", report["indexes"]["indexes"])
+        document = records.find_one({})
+        self.assertIsInstance(document["Date"], datetime)
+        self.assertTrue(all(tag == tag.lower() for tag in document["Tags"]))
+
+
+class ColumnarCacheTests(TestCase):
+    """
+    열 단위 입력 캐시가 CSV와 같은 값을 돌려주고, 샤드 바이트 범위를 행 범위로 바꾸며, 파일 내용이 바뀌면 다시 만들어지는지 테스트합니다.
+    """
+
+    def test_19_columnar_cache_matches_csv_and_invalidates_on_change(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = os.path.join(tmp, "columnar")
+            path = write_synthetic_csv(os.path.join(tmp, "cached.csv"), rows=60, seed=4)
+            sha = check_file_unchanged(None, path)[1]["sha256"]
+
+            cache = open_columnar_cache(path, sha, detect_csv_encoding, cache_dir=cache_dir)
+            self.assertEqual((cache.rows, cache.encoding), (60, 'utf-8'))
+            expected = build_document_columns(pd.read_csv(path))
+            actual = build_document_columns(pd.concat(list(cache.open(0, cache.rows, chunksize=25))))
+            self.assertEqual(actual, expected)
+
+            # 샤드 바이트 범위 → 행 범위 (여러 줄 본문이 있어도 CSV로 읽은 행 수와 같아야 함)
+            header_end, ranges = plan_byte_ranges(path, target_bytes=2000)
+            row_ranges = [cache.rows_for({"start": start, "end": end}) for start, end in ranges]
+            self.assertEqual([end - start for start, end in row_ranges],
+                             [len(pd.read_csv(open_shard(path, header_end, start, end))) for start, end in ranges])
+
+            plain, cached = InMemoryClient(), InMemoryClient()
+            self.assertTrue(process_worker_files({}, files=[path], client=plain, assignment='static',
+                                                 extract_options=dict(options, columnar_cache=False)))
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=cached, assignment='static',
+                                                 extract_options=dict(options, columnar_cache=cache_dir)))
+            self.assertEqual(report["files"]["cached.csv"]["input"], "columnar")
+            def stored(client):
+                return sorted((doc["_id"].split(":")[-1], doc["Heading"], doc["nouns"])
+                              for doc in client[DB_NAME][RECORD_NOUNS_COLLECTION].find({}))
+            self.assertEqual(stored(cached), stored(plain))
+
+            # 내용이 바뀌면 새 캐시를 만들고 이전 캐시는 지움
+            write_synthetic_csv(path, rows=10, seed=5)
+            new_sha = check_file_unchanged(None, path)[1]["sha256"]
+            self.assertEqual(open_columnar_cache(path, new_sha, detect_csv_encoding, cache_dir=cache_dir).rows, 10)
+            self.assertEqual(os.listdir(cache_dir), [f"cached.csv-{new_sha[:16]}"])
+
+
+class WarmupHealthTests(TestCase):
+    """
+    서버 프로세스에서만 예열하고, /healthz가 예열 결과(준비/실패)와 실행 중인 Rebuild 작업을 Mongo나 import를 기다리지 않고 반환하는지 테스트합니다.
+    """
+
+    def test_20_healthz_reports_warmup_and_active_rebuild(self):
+        # gunicorn은 post_worker_init 훅에서 직접 예열하므로 AppConfig.ready에서는 runserver만 예열
+        self.assertFalse(should_warm_up(["/usr/local/bin/gunicorn", "worker_project.wsgi:application"]))
+        self.assertFalse(should_warm_up(["/usr/local/bin/pytest"]))
+        self.assertFalse(should_warm_up(["-c"]))
+        self.assertFalse(should_warm_up(["manage.py", "test"]))
+        self.assertFalse(should_warm_up(["manage.py", "runserver"]))  # 자동 재시작 감시 프로세스
+        self.assertTrue(should_warm_up(["manage.py", "runserver", "--noreload"]))
+
+        self.assertEqual(run_warmup(backend="unknown", connect_mongo=False)["status"], DEGRADED)
+        response = self.client.get(reverse('healthz'))
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["warmup"]["steps"]["tagger"]["ok"])
+
+        state = run_warmup(backend="heuristic", connect_mongo=False)
+        self.assertEqual(state["status"], READY)
+        self.assertEqual(state["steps"]["tagger"]["backend"], "heuristic")
+
+        release = threading.Event()
+
+        def runner(report, force=False, progress=None, cancel=None):
+            release.wait(5)
+            return True
+
+        job, _ = submit_rebuild({}, runner=runner)
+        try:
+            response = self.client.get(reverse('healthz'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()["rebuild"]["job_id"], job.id)
+        finally:
+            release.set()
+        self.assertTrue(job.wait(5))
+        self.assertIsNone(self.client.get(reverse('healthz')).json()["rebuild"])
+
+
+class DuplicateArticleTests(TestCase):
+    """
+    다시 실린 기사(같은 파일/다른 파일, 거의 같은 본문)를 태깅 전에 찾아 명사를 재사용하고, 같은 파일 안의 원본에 연결하거나
+    저장하지 않으며, 다른 파일과 함께 적재하거나 중단 후 이어서 적재해도 결과가 같은지 테스트합니다.
+    """
+
+    def test_21_duplicate_articles_reuse_nouns_and_link_or_skip(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        originals = synthetic_rows(30, seed=6)
+        long_rows = originals[originals["text"].str.split().str.len() >= 40].head(3)
+        near = long_rows.assign(text=long_rows["text"] + " Reuters")
+        first = pd.concat([originals, originals.head(10), near], ignore_index=True)
+        second = pd.concat([originals.head(5), synthetic_rows(5, seed=7)], ignore_index=True)
+
+        def run(dedup, action, paths):
+            client, report = InMemoryClient(), {}
+            self.assertTrue(process_worker_files(report, files=paths, client=client, assignment='static',
+                                                 extract_options=dict(options, dedup=dedup, dedup_action=action)))
+            return report, {doc["_id"]: doc for doc in client[DB_NAME][RECORD_NOUNS_COLLECTION].find({})}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, "first.csv"), os.path.join(tmp, "second.csv")]
+            first.to_csv(paths[0], index=False)
+            second.to_csv(paths[1], index=False)
+            _, plain = run("off", "link", paths)
+
+            report, linked = run("exact", "link", paths)
+            stats = report["files"]["first.csv"]
+            self.assertEqual((stats["duplicates"], stats["near_duplicates"]), (10, 0))
+            self.assertEqual(report["files"]["second.csv"]["duplicates"], 5)
+            # 중복 기사는 태깅하지 않음
+            self.assertEqual(sum(chunk["rows"] for chunk in stats["chunks"]), len(first) - 10)
+            def nouns_by_row(documents):
+                return {(doc["source_file"], key.split(":")[-1]): doc["nouns"] for key, doc in documents.items()}
+            self.assertEqual(nouns_by_row(linked), nouns_by_row(plain))
+            # 다른 파일의 같은 기사(second.csv의 5건)는 명사만 재사용하고 연결하지 않음
+            duplicates = [doc for doc in linked.values() if "duplicate_of" in doc]
+            self.assertEqual(len(duplicates), 10)
+            for doc in duplicates:
+                original = linked[doc["duplicate_of"]]
+                self.assertEqual((original["content_hash"], original["source_file"]),
+                                 (doc["content_hash"], doc["source_file"]))
+                self.assertNotIn("duplicate_of", original)
+
+            # 한 파일의 결과는 함께 적재한(또는 건너뛴) 다른 파일과 무관
+            def file_documents(documents, source_file):
+                return {key.split(":")[-1]: (doc["nouns"], doc.get("duplicate_of", "").split(":")[-1])
+                        for key, doc in documents.items() if doc["source_file"] == source_file}
+            _, alone = run("exact", "link", paths[1:])
+            self.assertEqual(file_documents(alone, "second.csv"), file_documents(linked, "second.csv"))
+
+            report, near_linked = run("near", "link", paths)
+            self.assertEqual(report["files"]["first.csv"]["near_duplicates"], 3)
+            self.assertEqual(report["dedup"]["near"], 3)
+
+            # 같은 파일 안의 중복만 저장하지 않음 (다른 파일의 같은 기사는 원본으로 저장)
+            report, skipped = run("exact", "skip", paths)
+            self.assertEqual(report["files"]["first.csv"]["skipped_duplicates"], 10)
+            self.assertEqual(report["files"]["second.csv"]["skipped_duplicates"], 0)
+            self.assertEqual(len(skipped), len(linked) - 10)
+            self.assertEqual(sum(1 for doc in skipped.values() if "duplicate_of" in doc), 0)
+
+            # 체크포인트 이후의 중복 행도 이어서 적재할 때 같은 원본으로 판별
+            resume_path = os.path.join(tmp, "resume.csv")
+            many = synthetic_rows(1200, seed=8)
+            pd.concat([many, many.head(300)], ignore_index=True).to_csv(resume_path, index=False)
+            _, expected = run("exact", "skip", [resume_path])
+
+            client = InMemoryClient()
+            collection = client[DB_NAME][RECORD_NOUNS_COLLECTION]
+            insert_many = collection.insert_many
+            calls = []
+
+            def flaky_insert_many(documents, **kwargs):
+                calls.append(len(documents))
+                if len(calls) == 2:
+                    raise ConnectionError("connection reset")
+                return insert_many(documents, **kwargs)
+
+            collection.insert_many = flaky_insert_many
+            resume_options = dict(options, dedup="exact", dedup_action="skip")
+            self.assertFalse(process_worker_files({}, files=[resume_path], client=client, assignment='static',
+                                                  extract_options=resume_options))
+            collection.insert_many = insert_many
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[resume_path], client=client, assignment='static',
+                                                 extract_options=resume_options))
+            self.assertGreater(report["files"]["resume.csv"]["resumed_from_row"], 0)
+            self.assertEqual(sorted(doc["_id"].split(":")[-1] for doc in collection.find({})),
+                             sorted(key.split(":")[-1] for key in expected))
+
+
+class CancellableRebuildTests(TestCase):
+    """
+    행 예산/취소로 멈춘 Rebuild가 처리한 행까지 커밋하고 부분 결과(남은 파일/샤드)를 돌려주며,
+    다음 실행이 이어서 적재하면 한 번에 적재한 결과와 같은지 테스트합니다.
+    """
+
+    def test_22_budgeted_rebuild_stops_with_partial_result_and_resumes(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [write_synthetic_csv(os.path.join(tmp, "first.csv"), rows=2500, seed=9),
+                     write_synthetic_csv(os.path.join(tmp, "second.csv"), rows=300, seed=10)]
+
+            def documents(client):
+                return sorted((doc["source_file"], doc["_id"].split(":")[-1], tuple(doc["nouns"]))
+                              for doc in client[DB_NAME][RECORD_NOUNS_COLLECTION].find({}))
+
+            for assignment in ('static', 'shared'):
+                clean = InMemoryClient()
+                self.assertTrue(process_worker_files({}, files=paths, client=clean, extract_options=options,
+                                                     assignment=assignment))
+
+                # 청크(1000행) 단위로 예산을 확인하므로 첫 청크까지만 커밋하고 멈춤
+                client, report = InMemoryClient(), {}
+                process_worker_files(report, files=paths, client=client, extract_options=options,
+                                     assignment=assignment, cancel=CancelToken(max_rows=1000))
+                stopped = report["stopped"]
+                self.assertEqual((stopped["reason"], stopped["rows_completed"]), (STOP_ROW_BUDGET, 1000))
+                self.assertEqual(stopped["files_completed"], [])
+                self.assertEqual(client[DB_NAME][RECORD_NOUNS_COLLECTION].count_documents({}), 1000)
+                if assignment == 'static':
+                    self.assertEqual(stopped["files_partial"], {"first.csv": 1000})
+                    self.assertEqual(stopped["remaining_files"], ["second.csv"])
+                    self.assertEqual(client[DB_NAME][IMPORT_CHECKPOINT_COLLECTION].count_documents({}), 1)
+                else:
+                    # 멈춘 샤드는 시도 횟수를 되돌려 대기 상태로 돌아감
+                    remaining = {shard["source_file"]: shard for shard in stopped["remaining_shards"]}
+                    self.assertEqual((remaining["first.csv"]["state"], remaining["first.csv"]["rows_committed"]),
+                                     ("pending", 1000))
+                    self.assertEqual(remaining["second.csv"]["rows_committed"], 0)
+                    shard = client[DB_NAME]["ImportShards"].find_one({"_id": remaining["first.csv"]["shard"]})
+                    self.assertEqual(shard["attempt"], 0)
+
+                report = {}
+                self.assertTrue(process_worker_files(report, files=paths, client=client, extract_options=options,
+                                                     assignment=assignment, cancel=CancelToken()))
+                self.assertNotIn("stopped", report)
+                self.assertEqual(sorted(report["rebuilt"]), ["first.csv", "second.csv"])
+                self.assertEqual(documents(client), documents(clean))
+
+
+class RebuildCancelTests(TestCase):
+    """
+    POST /rebuild/cancel이 실행 중인 작업을 멈추고(STOPPED), 작업이 없거나 이미 끝났으면 404/409를 반환하는지 테스트합니다.
+    """
+
+    def test_23_cancel_endpoint_stops_running_job(self):
+        self.assertEqual(self.client.post(reverse('rebuild_cancel')).status_code, 404)
+        self.assertEqual(self.client.post(reverse('rebuild'), data='{"max_rows": "many"}',
+                                          content_type='application/json').status_code, 400)
+
+        started = threading.Event()
+
+        def runner(report, force=False, progress=None, cancel=None):
+            started.set()
+            while not cancel.stopped:
+                threading.Event().wait(0.01)
+            report["stopped"] = {"reason": cancel.stop_reason(), "remaining_files": ["2017.csv"]}
+            return True
+
+        job, _ = submit_rebuild({"max_seconds": 5}, runner=runner)
+        self.assertTrue(started.wait(5))
+        response = self.client.post(reverse('rebuild_cancel'), data={"job_id": job.id},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(job.wait(5))
+
+        snapshot = self.client.get(reverse('job_detail', args=[job.id])).json()
+        self.assertEqual((snapshot["state"], snapshot["stop_reason"]), (STOPPED, STOP_CANCELLED))
+        self.assertEqual(snapshot["report"]["stopped"]["remaining_files"], ["2017.csv"])
+        self.assertEqual(self.client.post(reverse('rebuild_cancel'), data={"job_id": job.id},
+                                          content_type='application/json').status_code, 409)
+
+
+class SharedMongoClientTests(TestCase):
+    """
+    한 프로세스 안에서는 MongoClient 하나를 재사용하고(ping은 간격마다 한 번), PID가 바뀌거나 fork한 자식 프로세스에서는
+    부모의 클라이언트를 버리고 새로 만드는지 테스트합니다. (실제 서버 대신 가짜 MongoClient 사용)
+    """
+
+    def setUp(self):
+        shutdown_mongodb_client()
+        self.addCleanup(shutdown_mongodb_client)
+
+    def test_24_client_is_reused_per_process_and_reset_after_fork(self):
+        created = []
+
+        class FakeClient:
+            def __init__(self, uri, **options):
+                self.pings = 0
+                self.closed = False
+                self.admin = mock.Mock(command=self._ping)
+                created.append(self)
+
+            def _ping(self, name):
+                self.pings += 1
+                return {"ok": 1}
+
+            def close(self):
+                self.closed = True
+
+        with mock.patch.object(db_connector, 'MongoClient', FakeClient):
+            client = get_mongodb_client()
+            self.assertIs(get_mongodb_client(), client)
+            self.assertEqual((len(created), client.pings), (1, 1))
+            close_mongodb_client(client)  # 공유 클라이언트는 닫지 않음
+            self.assertFalse(client.closed)
+
+            # 다른 프로세스에서 만든 클라이언트(PID 불일치)는 재사용하지 않음
+            db_connector._client_pid = -1
+            self.assertIsNot(get_mongodb_client(), client)
+            self.assertEqual(len(created), 2)
+
+            if hasattr(os, 'fork'):
+                # register_at_fork 훅: 자식 프로세스는 부모의 클라이언트 참조를 버림
+                read_fd, write_fd = os.pipe()
+                pid = os.fork()
+                if pid == 0:
+                    try:
+                        os.write(write_fd, b'1' if db_connector._client is None else b'0')
+                    finally:
+                        os._exit(0)
+                os.close(write_fd)
+                with os.fdopen(read_fd, 'rb') as pipe:
+                    self.assertEqual(pipe.read(), b'1')
+                os.waitpid(pid, 0)
+                self.assertIs(db_connector._client, created[1])
+
+            db_connector._reset_after_fork()
+            client = get_mongodb_client()
+            self.assertEqual(len(created), 3)
+            self.assertIs(client, created[2])
+
+
+class PerceptronTaggerParityTests(TestCase):
+    """
+    perceptron 백엔드가 여러 문장으로 된 기사에서 textblob 백엔드와 같은 고유 명사를 추출하는지 테스트합니다.
+    (NLTK 코퍼스가 없는 환경에서는 건너뜀)
+    """
+
+    def test_25_perceptron_matches_textblob_on_multi_sentence_articles(self):
+        textblob, perceptron = get_tagger('textblob'), get_tagger('perceptron')
+        try:
+            textblob.warm_up()
+            perceptron.warm_up()
+        except Exception as e:
+            self.skipTest(f"NLTK 데이터 없음: {e}")
+
+        texts = [
+            "Apple opened a store in London. Analysts said Tim Cook visited. The store was busy.",
+            "Seoul hosted the summit! Did Moon Jae-in attend? Reports from Busan and Tokyo said yes.\nMarket opened.",
+            "U.S. officials met Mr. Smith in Washington. Congress adjourned. Senator Warren objected.",
+            "",
+            None,
+        ]
+        expected = [textblob.extract(text) for text in texts]
+        self.assertEqual(perceptron.extract_batch(texts), expected)
+        self.assertTrue(any(expected))
+
+
+class StuckShardPlanTests(TestCase):
+    """
+    최대 시도 횟수를 넘겨 failed로 남은 샤드와, 샤드를 올리기 전에 중단된 계획이 다음 Rebuild에서 다시 처리되는지 테스트합니다.
+    """
+
+    def test_26_failed_shards_and_orphaned_plans_recover_on_next_rebuild(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "stuck.csv"), rows=300, seed=11)
+
+            client = InMemoryClient()
+            queue = client[DB_NAME][IMPORT_SHARD_COLLECTION]
+            ensure_file_plan(queue, path, detect_csv_encoding)
+            for _ in range(IMPORT_SHARD_MAX_ATTEMPTS):
+                release_shard(queue, claim_shard(queue, ["stuck.csv"]), "boom")
+            self.assertIsNone(claim_shard(queue, ["stuck.csv"]))
+
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options,
+                                                 assignment='shared', force=True))
+            self.assertEqual(report["rebuilt"], ["stuck.csv"])
+            self.assertEqual(client[DB_NAME][RECORD_NOUNS_COLLECTION].count_documents({}), 300)
+
+            # 계획 문서만 저장되고 샤드는 올라가지 않은 채 중단된 경우
+            client = InMemoryClient()
+            queue = client[DB_NAME][IMPORT_SHARD_COLLECTION]
+            plan, _ = ensure_file_plan(queue, path, detect_csv_encoding)
+            queue.delete_many({"kind": "shard"})
+            queue.update_one({"_id": plan["_id"]}, {"$set": {"planned_at": 0}})
+
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options,
+                                                 assignment='shared'))
+            self.assertEqual(report["rebuilt"], ["stuck.csv"])
+            self.assertEqual(client[DB_NAME][RECORD_NOUNS_COLLECTION].count_documents({}), 300)
+
+
+class WarmupTriggerTests(TestCase):
+    """
+    django.setup()만 호출하는 프로세스(스크립트, 다른 테스트 러너 등)는 태거를 예열하거나 Mongo에 연결하지 않는지 테스트합니다.
+    """
+
+    def test_27_plain_django_setup_does_not_warm_up(self):
+        script = (
+            "import django, sys\n"
+            "django.setup()\n"
+            "from worker_app import warmup\n"
+            "from data_processor import db_connector\n"
+            "print(warmup._thread is None, warmup.readiness()['status'], db_connector._client is None)\n"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='worker_project.settings', WORKER_WARMUP='1')
+        result = subprocess.run([sys.executable, "-c", script], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split()[-3:], ["True", "starting", "True"])
+
+
+class PublishedGenerationTests(TestCase):
+    """
+    재적재 중 새 회차와 이전 회차 문서가 함께 남아 있어도, 마스터용 집계가 공개된 회차만 읽어 파일을 두 번 세지 않는지 테스트합니다.
+    """
+
+    def test_28_top_nouns_reads_only_published_generation_during_rebuild(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "published.csv"), rows=200, seed=5)
+
+            for assignment in ('static', 'shared'):
+                client = InMemoryClient()
+                db = client[DB_NAME]
+                self.assertTrue(process_worker_files({}, files=[path], client=client, extract_options=options,
+                                                     assignment=assignment))
+                expected = top_nouns(db, 'file')
+                self.assertTrue(expected)
+
+                if assignment == 'shared':
+                    # 강제 재적재로 새 계획이 세워져도, 끝날 때까지는 이전 회차가 공개된 상태로 남습니다.
+                    plan, status = ensure_file_plan(db[IMPORT_SHARD_COLLECTION], path, detect_csv_encoding,
+                                                    force=True)
+                    self.assertEqual(status, 'planned')
+                    self.assertNotEqual(plan["published_generation"], plan["import_generation"])
+
+                # 이전 회차를 지우기 전의 상태: 같은 파일의 새 회차 부분 집계가 함께 저장되어 있음
+                summaries = db[NOUN_SUMMARY_COLLECTION]
+                summaries.insert_many([dict(doc, _id=f"next:{index}", import_generation="next")
+                                       for index, doc in enumerate(summaries.find({}))])
+                self.assertEqual(top_nouns(db, 'file'), expected)
+
+
+class StuckShardQueueTests(TestCase):
+    """
+    마지막 시도의 임대가 만료된 샤드, 모든 샤드를 끝낸 뒤 마무리 전에 중단된 계획, 강제 재적재 시 진행 중인 계획을 테스트합니다.
+    """
+
+    def test_29_expired_final_lease_and_unfinalized_plan_recover(self):
+        options = {"mode": "serial", "tagger": "heuristic", "cache": False, "columnar_cache": False}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "lease.csv"), rows=300, seed=13)
+
+            # 워커가 시도할 때마다 임대를 잡은 채 중단되어, 마지막 시도의 임대까지 만료된 경우
+            client = InMemoryClient()
+            queue = client[DB_NAME][IMPORT_SHARD_COLLECTION]
+            ensure_file_plan(queue, path, detect_csv_encoding)
+            for _ in range(IMPORT_SHARD_MAX_ATTEMPTS):
+                self.assertIsNotNone(claim_shard(queue, ["lease.csv"], lease_seconds=-1))
+            self.assertIsNone(claim_shard(queue, ["lease.csv"]))
+            self.assertEqual(queue.find_one({"kind": "shard"})["state"], "failed")
+
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options,
+                                                 assignment='shared'))
+            self.assertEqual(report["rebuilt"], ["lease.csv"])
+            self.assertEqual(client[DB_NAME][RECORD_NOUNS_COLLECTION].count_documents({}), 300)
+
+            # 샤드를 완료로 표시한 뒤 계획 갱신/마무리 전에 중단된 경우
+            client = InMemoryClient()
+            queue = client[DB_NAME][IMPORT_SHARD_COLLECTION]
+            with mock.patch('data_processor.importer.finalize_file', side_effect=RuntimeError("killed")):
+                self.assertFalse(process_worker_files({}, files=[path], client=client, extract_options=options,
+                                                      assignment='shared'))
+            plan = queue.find_one({"kind": "plan"})
+            self.assertEqual(plan["state"], "active")
+            queue.update_one({"_id": plan["_id"]}, {"$set": {"done_count": 0, "document_count": 0}})
+
+            report = {}
+            self.assertTrue(process_worker_files(report, files=[path], client=client, extract_options=options,
+                                                 assignment='shared'))
+            self.assertEqual(report["rebuilt"], ["lease.csv"])
+            plan = queue.find_one({"kind": "plan"})
+            self.assertEqual((plan["state"], plan["done_count"], plan["document_count"]), ("completed", 1, 300))
+            self.assertEqual(plan["published_generation"], plan["import_generation"])
+
+            # 강제 재적재는 요청 이전에 세워진 진행 중인 계획을 새 회차로 다시 세웁니다.
+            queue = InMemoryClient()[DB_NAME][IMPORT_SHARD_COLLECTION]
+            plan, _ = ensure_file_plan(queue, path, detect_csv_encoding)
+            self.assertEqual(ensure_file_plan(queue, path, detect_csv_encoding)[1], 'joined')
+            replanned, status = ensure_file_plan(queue, path, detect_csv_encoding, force=True,
+                                                 requested_at=plan["planned_at"] + 1)
+            self.assertEqual(status, 'planned')
+            self.assertNotEqual(replanned["import_generation"], plan["import_generation"])
+
+
+class SharedColumnarCacheTests(TestCase):
+    """
+    여러 워커가 같은 열 단위 캐시 디렉터리를 공유할 때, 늦게 끝난 빌드가 먼저 공개된 캐시를 쓰고
+    다른 워커가 만드는 중인 임시 디렉터리는 지우지 않는지 테스트합니다.
+    """
+
+    def test_30_concurrent_builders_share_published_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_synthetic_csv(os.path.join(tmp, "shared.csv"), rows=120, seed=3)
+            cache_dir = os.path.join(tmp, "columnar")
+            first = open_columnar_cache(path, "a" * 64, detect_csv_encoding, cache_dir=cache_dir)
+            self.assertEqual(first.rows, 120)
+
+            # 같은 캐시를 뒤늦게 다 만든 워커는 공개된 캐시를 그대로 쓰고 자기 임시 디렉터리를 지웁니다.
+            with open(os.path.join(first.path, "meta.json"), encoding='utf-8') as f:
+                published = f.read()
+            second = build_columnar_cache(path, "a" * 64, first.encoding, first.path)
+            self.assertEqual(second.rows, 120)
+            with open(os.path.join(first.path, "meta.json"), encoding='utf-8') as f:
+                self.assertEqual(f.read(), published)
+            self.assertEqual(os.listdir(cache_dir), [os.path.basename(first.path)])
+
+            # 내용이 바뀌어 새 캐시를 만들 때: 이전 캐시와 오래된 임시 디렉터리만 지우고, 만드는 중인 임시 디렉터리는 남깁니다.
+            building = os.path.join(cache_dir, "shared.csv-bbbb.tmp-live")
+            abandoned = os.path.join(cache_dir, "shared.csv-cccc.tmp-dead")
+            os.makedirs(building)
+            os.makedirs(abandoned)
+            os.utime(abandoned, (0, 0))
+            third = open_columnar_cache(path, "d" * 64, detect_csv_encoding, cache_dir=cache_dir)
+            self.assertEqual(sorted(os.listdir(cache_dir)),
+                             sorted([os.path.basename(third.path), os.path.basename(building)]))
+
@@ -6,4 +6,13 @@ from . import views
 urlpatterns = [
     # 마스터 서버의 master_connector.py에서 호출하는 엔드포인트와 일치해야 합니다.
     path('rebuild', views.handle_rebuild_request, name='rebuild'),
+    # 실행 중인 Rebuild 취소 (처리한 행까지 커밋하고 부분 결과 반환)
+    path('rebuild/cancel', views.cancel_rebuild_request, name='rebuild_cancel'),
+    # 비동기 Rebuild 작업 상태 조회
+    path('jobs', views.job_list, name='job_list'),
+    path('jobs/<str:job_id>', views.job_detail, name='job_detail'),
+    # Prometheus 스크레이프 엔드포인트
+    path('metrics', views.metrics, name='metrics'),
+    # 준비 상태 확인 (예열 완료 여부)
+    path('healthz', views.healthz, name='healthz'),
 ]
\ No newline at end of file
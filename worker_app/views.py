@@ -1,61 +1,157 @@
 # worker_app/views.py (수정)
 
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET, require_POST
 from django.views.decorators.csrf import csrf_exempt
-from data_processor.constants import WORKER_NAME
-from data_processor.importer import process_worker_files  # <-- 이 함수만 사용
-import time  # 시간 측정을 위해 추가
+from data_processor.constants import WORKER_NAME, REBUILD_MAX_SECONDS, REBUILD_MAX_ROWS
+from data_processor.metrics import render_metrics
+from .jobs import COMPLETED, STOPPED, ACTIVE_STATES, submit_rebuild, cancel_rebuild, get_job, list_jobs, active_job
+from .warmup import READY, readiness
+import json
 import sys
 
 
-# 🌟🌟🌟 run_processing_and_notify 함수와 notify_master_of_completion 함수는 주석 처리하거나 제거합니다. 🌟🌟🌟
-# 🌟 (더 이상 백그라운드 프로세스와 별도 알림 로직이 필요 없음) 🌟
+def _read_json_body(request) -> dict:
+    """요청 본문(JSON)을 딕셔너리로 읽습니다. 본문이 없거나 형식이 잘못되면 빈 딕셔너리를 반환합니다."""
+    try:
+        body = json.loads(request.body or b'{}')
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def _read_budget(body: dict) -> dict:
+    """
+    본문의 max_seconds/max_rows를 읽습니다. 없으면 REBUILD_MAX_SECONDS/REBUILD_MAX_ROWS이며, 0 또는 null이면 제한이 없습니다.
+    숫자가 아니거나 음수이면 ValueError입니다.
+    """
+    max_seconds = float(body.get("max_seconds", REBUILD_MAX_SECONDS) or 0)
+    max_rows = body.get("max_rows", REBUILD_MAX_ROWS) or 0
+    if isinstance(max_rows, bool) or int(max_rows) != max_rows:
+        raise ValueError("max_rows must be an integer")
+    max_rows = int(max_rows)
+    if max_seconds < 0 or max_rows < 0:
+        raise ValueError("max_seconds/max_rows must not be negative")
+    return {"max_seconds": max_seconds or None, "max_rows": max_rows or None}
+
 
 @csrf_exempt
 @require_POST
 def handle_rebuild_request(request):
     """
-    Master의 요청을 받고, 작업을 동기적으로 실행 후, 완료 시점에 최종 응답을 반환합니다.
+    Master의 요청을 받아 Rebuild 작업을 백그라운드에 등록하고, 작업 ID를 즉시 반환합니다. (202 Accepted)
+    진행 상황은 GET /jobs/<job_id>로 조회합니다. 이미 실행 중인 작업이 있으면 새 작업을 만들지 않고 그 작업 ID를 돌려줍니다.
+
+    본문 옵션:
+      - {"force": true}: 변경되지 않은 파일도 다시 적재
+      - {"wait": true}: 작업이 끝날 때까지 기다렸다가 최종 결과를 반환 (이전 동기 방식과 호환)
+      - {"max_seconds": 600, "max_rows": 100000}: 시간/행 예산. 넘으면 처리한 행까지 커밋하고 STOPPED로 끝나며,
+        report["stopped"]에 부분 결과(완료한 파일/행, 남은 파일/샤드)를 남깁니다. (이미 실행 중인 작업에는 적용되지 않음)
     """
     print(f"[{WORKER_NAME}] 📩 Rebuild 요청 수신.")
-    start_time = time.time()  # 요청 처리 시작 시간 측정
-
-    success = False
-    message = ""
-
+    body = _read_json_body(request)
     try:
-        # 🌟 1. 핵심 데이터 처리 함수를 현재 스레드에서 실행 (Blocking) 🌟
-        print(f"[{WORKER_NAME}] ⚙️ 데이터 전처리 작업 동기적 실행 시작...")
-        success = process_worker_files()
-
-        end_time = time.time()
-        processing_time = end_time - start_time
-
-        if success:
-            message = f"Data rebuild completed successfully. Worker: {WORKER_NAME}"
-            # 2. 작업 완료 후 200 OK 응답 반환
-            return JsonResponse({
-                "status": "COMPLETED",
-                "worker_name": WORKER_NAME,
-                "message": message,
-                "processing_time": processing_time,  # 총 처리 시간을 포함하여 마스터에게 전달
-            }, status=200)
-        else:
-            message = f"Data rebuild failed. Check worker logs. Worker: {WORKER_NAME}"
-            return JsonResponse({
-                "status": "FAILED",
-                "worker_name": WORKER_NAME,
-                "message": message,
-                "processing_time": processing_time,
-            }, status=500)  # 작업 실패 시 500 에러 반환
+        budget = _read_budget(body)
+    except (TypeError, ValueError) as e:
+        return JsonResponse({"status": "BAD_REQUEST", "message": str(e)}, status=400)
 
+    try:
+        job, created = submit_rebuild({"force": bool(body.get("force", False)), **budget})
     except Exception as e:
-        end_time = time.time()
-        processing_time = end_time - start_time
         print(f"[{WORKER_NAME}] ❌ 치명적 오류 발생: {e}", file=sys.stderr)
         return JsonResponse({
             "status": "CRITICAL_ERROR",
             "message": str(e),
-            "processing_time": processing_time,
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+    if not created:
+        print(f"[{WORKER_NAME}] 🔁 이미 실행 중인 작업이 있어 해당 작업을 반환합니다: {job.id}")
+
+    if body.get("wait"):
+        job.wait()
+        snapshot = job.snapshot()
+        report = snapshot["report"] or {}
+        return JsonResponse({
+            "status": snapshot["state"],
+            "job_id": job.id,
+            "worker_name": WORKER_NAME,
+            "message": f"Data rebuild {snapshot['state'].lower()}. Worker: {WORKER_NAME}",
+            "processing_time": snapshot["processing_time"],
+            "skipped_files": report.get("skipped", []),
+            "rebuilt_files": report.get("rebuilt", []),
+            "pipeline": report.get("pipeline"),
+            "stopped": report.get("stopped"),
+            "report": report,
+        }, status=200 if snapshot["state"] in (COMPLETED, STOPPED) else 500)
+
+    return JsonResponse({
+        "status": "ACCEPTED",
+        "job_id": job.id,
+        "worker_name": WORKER_NAME,
+        "deduplicated": not created,
+        "state": job.state,
+        "status_url": f"/jobs/{job.id}",
+    }, status=202)
+
+
+@csrf_exempt
+@require_POST
+def cancel_rebuild_request(request):
+    """
+    실행 중인 Rebuild 작업을 취소합니다. (본문 {"job_id": ...}가 없으면 현재 작업)
+    작업은 다음 청크 경계에서 처리한 행까지 커밋하고 STOPPED로 끝나며, 부분 결과는 GET /jobs/<job_id>의 report["stopped"]로 확인합니다.
+    취소할 작업이 없으면 404, 이미 끝난 작업이면 409입니다.
+    """
+    body = _read_json_body(request)
+    job = cancel_rebuild(body.get("job_id"))
+    if job is None:
+        return JsonResponse({"status": "NOT_FOUND", "job_id": body.get("job_id")}, status=404)
+    if job.state not in ACTIVE_STATES:
+        return JsonResponse({"status": "ALREADY_FINISHED", "job_id": job.id, "state": job.state}, status=409)
+    return JsonResponse({
+        "status": "CANCELLING",
+        "job_id": job.id,
+        "worker_name": WORKER_NAME,
+        "state": job.state,
+        "status_url": f"/jobs/{job.id}",
+    }, status=202)
+
+
+@require_GET
+def job_detail(request, job_id):
+    """Rebuild 작업 하나의 상태, 파일별 진행 상황, 처리 속도(rows/sec), 남은 시간(ETA)을 반환합니다."""
+    job = get_job(job_id)
+    if job is None:
+        return JsonResponse({"status": "NOT_FOUND", "job_id": job_id}, status=404)
+    return JsonResponse(job.snapshot())
+
+
+@require_GET
+def job_list(request):
+    """최근 Rebuild 작업 목록을 최신순으로 반환합니다."""
+    return JsonResponse({"worker_name": WORKER_NAME, "jobs": list_jobs()})
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus 텍스트 형식의 워커 지표. 스테이지별 처리 시간, 기사별 태깅 시간, 배치 저장 시간 히스토그램과
+    처리 행 수(rate()로 rows/sec), 종류별 오류 수, 프로세스 RSS를 노출합니다.
+    """
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@require_GET
+def healthz(request):
+    """
+    준비 상태 확인 (로드밸런서/docker healthcheck용). 예열이 끝났으면 200, 예열 중이거나 태거를 읽지 못했으면 503입니다.
+    프로세스 메모리만 읽으므로 Mongo가 느리거나 Rebuild가 실행 중이어도 바로 응답합니다.
+    """
+    state = readiness()
+    job = active_job()
+    return JsonResponse({
+        "status": state["status"],
+        "worker_name": WORKER_NAME,
+        "warmup": state,
+        "rebuild": {"job_id": job.id, "state": job.state} if job else None,
+    }, status=200 if state["status"] == READY else 503)
@@ -0,0 +1,130 @@
+# worker_app/warmup.py
+#
+# 서버 프로세스 시작 시 예열과 준비 상태(GET /healthz)입니다.
+# 예열은 백그라운드 스레드에서 태거(모델/코퍼스)를 읽고 Mongo 커넥션 풀을 미리 열어, 배포 후 첫 Rebuild가 모델 로딩을 기다리지 않게 합니다.
+# 준비 상태는 프로세스 메모리에만 있으므로 /healthz는 Mongo나 실행 중인 import를 기다리지 않습니다.
+
+from typing import Callable
+import os
+import sys
+import threading
+import time
+
+from data_processor.constants import WORKER_NAME, WORKER_WARMUP
+from data_processor.db_connector import get_mongodb_client
+from data_processor.metrics import record_error, WORKER_READY
+from data_processor.taggers import get_tagger
+
+# 준비 상태
+STARTING = "starting"   # 예열 중 (또는 아직 시작하지 않음)
+READY = "ready"         # 요청을 처리할 수 있음
+DEGRADED = "degraded"   # 태거를 읽지 못함 (Rebuild가 실패하므로 트래픽에서 제외)
+
+# 예열하는 서버 실행 방식. 그 밖의 관리 명령(test, migrate, shell 등)에서는 예열하지 않습니다.
+_SERVING_COMMANDS = ("runserver",)
+
+_state = {
+    "status": STARTING,
+    "started_at": None,
+    "finished_at": None,
+    "steps": {},
+    "skipped": None,
+}
+_state_lock = threading.Lock()
+_thread = None
+
+
+def _run_step(name: str, step: Callable[[], dict]) -> bool:
+    started = time.perf_counter()
+    try:
+        result = {"ok": True, **(step() or {})}
+    except Exception as e:
+        record_error("warmup")
+        print(f"[{WORKER_NAME}] ⚠️ 예열 실패 ({name}): {e}", file=sys.stderr)
+        result = {"ok": False, "error": str(e)}
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    with _state_lock:
+        _state["steps"][name] = result
+    return result["ok"]
+
+
+def _warm_tagger(backend: str = None) -> dict:
+    tagger = get_tagger(backend)
+    tagger.warm_up()
+    return {"backend": tagger.name}
+
+
+def _warm_mongo() -> dict:
+    # 연결할 수 없어도 준비 상태는 유지합니다. (Mongo가 복구되면 Rebuild 시점에 다시 연결)
+    if get_mongodb_client() is None:
+        raise ConnectionError("MongoDB에 연결할 수 없습니다.")
+    return {}
+
+
+def run_warmup(backend: str = None, connect_mongo: bool = True) -> dict:
+    """
+    예열을 현재 스레드에서 실행하고 준비 상태를 반환합니다.
+    태거를 읽지 못하면 DEGRADED, 그 밖에는 READY입니다. (Mongo 연결 실패는 steps에만 기록)
+    """
+    with _state_lock:
+        _state.update(status=STARTING, started_at=time.time(), finished_at=None, steps={}, skipped=None)
+    WORKER_READY.set(0)
+    print(f"[{WORKER_NAME}] 🔥 예열 시작 (pid={os.getpid()})")
+
+    tagger_ok = _run_step("tagger", lambda: _warm_tagger(backend))
+    if connect_mongo:
+        _run_step("mongo", _warm_mongo)
+
+    with _state_lock:
+        _state.update(status=READY if tagger_ok else DEGRADED, finished_at=time.time())
+        WORKER_READY.set(1 if tagger_ok else 0)
+        elapsed = _state["finished_at"] - _state["started_at"]
+    print(f"[{WORKER_NAME}] ✅ 예열 완료: {_state['status']} ({elapsed:.2f}s)")
+    return readiness()
+
+
+def mark_ready(reason: str):
+    """예열 없이 준비 상태로 표시합니다. (WORKER_WARMUP=0)"""
+    with _state_lock:
+        _state.update(status=READY, started_at=time.time(), finished_at=time.time(), steps={}, skipped=reason)
+    WORKER_READY.set(1)
+
+
+def should_warm_up(argv: list) -> bool:
+    """
+    WorkerAppConfig.ready()에서 예열할지 판단합니다. manage.py runserver의 실제 서버 프로세스만 해당하며,
+    자동 재시작을 감시하는 부모 프로세스는 건너뜁니다. (RUN_MAIN=true 또는 --noreload)
+    gunicorn은 gunicorn.conf.py의 post_worker_init 훅에서 start_warmup()을 직접 호출하고,
+    그 밖의 프로세스(테스트, 관리 명령, django.setup()을 호출하는 스크립트 등)는 예열하지 않습니다.
+    """
+    if not argv or os.path.basename(argv[0]) != 'manage.py':
+        return False
+    if len(argv) < 2 or argv[1] not in _SERVING_COMMANDS:
+        return False
+    return '--noreload' in argv or os.environ.get('RUN_MAIN') == 'true'
+
+
+def start_warmup() -> bool:
+    """
+    예열 스레드를 한 번만 시작하고 True를 반환합니다. gunicorn 워커 프로세스(post_worker_init 훅)와
+    runserver 서버 프로세스(WorkerAppConfig.ready)에서 호출합니다.
+    예열 중에도 요청은 받으며, Rebuild 요청은 태거를 직접 읽으므로 예열이 끝나기를 기다리지 않습니다.
+    """
+    global _thread
+    if not WORKER_WARMUP:
+        mark_ready("WORKER_WARMUP=0")
+        return False
+    with _state_lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=run_warmup, name="warmup", daemon=True)
+    _thread.start()
+    return True
+
+
+def readiness() -> dict:
+    """준비 상태 스냅샷. (메모리만 읽음)"""
+    with _state_lock:
+        snapshot = {**_state, "steps": {name: dict(step) for name, step in _state["steps"].items()}}
+    snapshot["pid"] = os.getpid()
+    return snapshot
@@ -7,7 +7,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-dummy-key-for-worker'
 
-DEBUG = True # ⚠️ 운영 환경에서는 False로 설정해야 합니다.
+# 운영(gunicorn) 컨테이너는 DJANGO_DEBUG=0으로 실행합니다. (docker-compose.yml)
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = ['*'] # 모든 호스트 허용 (Docker 환경에서는 필수)
 